@@ -0,0 +1,7 @@
+"""
+Benchmarks de throughput das etapas do pipeline RPCM
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.run --escalas 100 1000 --saida baseline.json
+    python -m benchmarks.run --escalas 100 --comparar baseline.json
+"""
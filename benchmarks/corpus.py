@@ -0,0 +1,128 @@
+"""
+Geração de corpora sintéticos para os benchmarks
+
+Todas as funções são determinísticas (semente fixa) para que execuções
+diferentes meçam exatamente as mesmas entradas.
+"""
+
+from pathlib import Path
+import csv
+import random
+import shutil
+
+PROJETO_ROOT = Path(__file__).parent.parent
+TEMPLATE_PADRAO = PROJETO_ROOT / "templates" / "template_rpcm.docx"
+
+NUMERO_INICIAL = 400000
+
+_PALAVRAS = [
+    'Esteira', 'Tubulação', 'PVC', 'DN400', 'Serra', 'Termas', 'Registro',
+    'Válvula', 'Conexão', 'Escavação', 'Reaterro', 'Concreto', 'Armado',
+    'Assentamento', 'Rede', 'Coletora', 'Ramal', 'Predial', 'Poço', 'Visita'
+]
+_UNIDADES = ['m', 'un', 'kg', 'm²', 'm³', 'GB', 'vb']
+
+
+def numeros_preco(escala: int) -> list:
+    """Números de preço sequenciais usados por todos os corpora"""
+    return [str(NUMERO_INICIAL + i) for i in range(escala)]
+
+
+def linhas_rpcm(escala: int) -> list:
+    """Linhas sintéticas no formato da planilha de importação"""
+    rnd = random.Random(escala)
+    return [
+        {
+            'Descrição': ' '.join(rnd.choices(_PALAVRAS, k=6)) + f' {i}',
+            'Unidade': rnd.choice(_UNIDADES),
+            'Nº Preço': numero
+        }
+        for i, numero in enumerate(numeros_preco(escala))
+    ]
+
+
+def gerar_template(pasta: Path) -> Path:
+    """Copia o template padrão do projeto para a pasta do corpus"""
+    destino = Path(pasta) / "template_rpcm.docx"
+    shutil.copy2(TEMPLATE_PADRAO, destino)
+    return destino
+
+
+def gerar_planilha_csv(pasta: Path, escala: int) -> Path:
+    """Planilha .csv com as colunas Descrição/Unidade/Nº Preço"""
+    destino = Path(pasta) / f"rpcm_{escala}.csv"
+    with open(destino, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Descrição', 'Unidade', 'Nº Preço'])
+        writer.writeheader()
+        writer.writerows(linhas_rpcm(escala))
+    return destino
+
+
+def gerar_planilha_xlsx(pasta: Path, escala: int) -> Path:
+    """Planilha .xlsx com as colunas Descrição/Unidade/Nº Preço (códigos numéricos)"""
+    from openpyxl import Workbook
+
+    destino = Path(pasta) / f"rpcm_{escala}.xlsx"
+    workbook = Workbook(write_only=True)
+    planilha = workbook.create_sheet()
+    planilha.append(['Descrição', 'Unidade', 'Nº Preço'])
+    for linha in linhas_rpcm(escala):
+        # Códigos gravados como número, como nas planilhas reais
+        planilha.append([linha['Descrição'], linha['Unidade'], int(linha['Nº Preço'])])
+    workbook.save(destino)
+    return destino
+
+
+def gerar_mapeamento_csv(pasta: Path, escala: int) -> Path:
+    """Planilha CodSAP → CodServico cobrindo metade dos números da biblioteca"""
+    destino = Path(pasta) / f"mapeamento_{escala}.csv"
+    with open(destino, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['CodServico', 'CodSAP'])
+        for numero in numeros_preco(escala)[::2]:
+            writer.writerow([str(int(numero) + 500000), numero])
+    return destino
+
+
+def gerar_biblioteca_docx(pasta: Path, escala: int, template: Path) -> Path:
+    """Biblioteca de DOCX RPCM, um por número de preço (motor rápido)"""
+    from src.core.document_generator import BatchDocumentGenerator, MOTOR_RAPIDO
+
+    destino = Path(pasta) / f"biblioteca_{escala}"
+    destino.mkdir(exist_ok=True)
+
+    batch = BatchDocumentGenerator(str(template), motor=MOTOR_RAPIDO)
+    for _ in batch.gerar_iter(linhas_rpcm(escala), str(destino)):
+        pass
+    return destino
+
+
+def gerar_pasta_pdfs(pasta: Path, escala: int) -> Path:
+    """Pasta banco com PDFs mínimos nomeados pelo número de preço"""
+    destino = Path(pasta) / f"pdfs_{escala}"
+    destino.mkdir(exist_ok=True)
+
+    conteudo = (
+        b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+        b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\n"
+        b"trailer<</Root 1 0 R>>\n%%EOF\n"
+    ) + b"0" * 4096
+
+    for numero in numeros_preco(escala):
+        (destino / f"{numero}_RPCM.pdf").write_bytes(conteudo)
+    return destino
+
+
+def html_word(indice: int) -> str:
+    """Trecho HTML no estilo do que o Word coloca na área de transferência"""
+    return (
+        f'<p class="MsoNormal" style="margin:0cm;mso-line-height-rule:exactly">'
+        f'<b><span style="font-family:Arial;mso-bidi-font-family:Arial">Item {indice}</span></b>'
+        f'<o:p></o:p></p>'
+        f'<p class="MsoListParagraph" style="text-align:justify">'
+        f'<span style="color:#1F497D;font-size:10pt">Descrição do serviço {indice} '
+        f'com <i>itálico</i> e <u>sublinhado</u></span></p>'
+        f'<ul><li>Medição por metro</li><li>Inclui material</li></ul>'
+        f'<table class="MsoTableGrid"><tr><td>Código</td><td>{NUMERO_INICIAL + indice}</td></tr>'
+        f'<tr><td>Unidade</td><td>m</td></tr></table>'
+    )
@@ -0,0 +1,287 @@
+"""
+Executa os benchmarks do pipeline e grava/compara um baseline JSON
+
+Cada etapa roda em um processo novo, de modo que o pico de memória (RSS)
+medido é o da etapa e não o acumulado da execução. A preparação de entradas
+que a etapa altera (ex: cópia da biblioteca DOCX) fica fora do tempo medido.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.run --escalas 100 1000 10000 --saida baseline.json
+    python -m benchmarks.run --escalas 100 --comparar baseline.json --tolerancia 0.2
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import logging
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks import corpus
+
+try:
+    import resource
+    RESOURCE_DISPONIVEL = True
+except ImportError:
+    RESOURCE_DISPONIVEL = False
+
+try:
+    import psutil
+    PSUTIL_DISPONIVEL = True
+except ImportError:
+    PSUTIL_DISPONIVEL = False
+
+
+ESCALAS_PADRAO = [100]
+
+# Etapas mais rápidas que isso são dominadas por ruído de medição e não
+# entram na comparação de throughput
+TEMPO_MINIMO_COMPARACAO = 0.1
+
+
+def pico_rss_mb():
+    """Pico de memória residente do processo atual em MB (None se indisponível)"""
+    if RESOURCE_DISPONIVEL:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta em KB, macOS em bytes
+        return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+    if PSUTIL_DISPONIVEL:
+        memoria = psutil.Process().memory_info()
+        return getattr(memoria, 'peak_wset', memoria.rss) / (1024 * 1024)
+    return None
+
+
+# ===== ETAPAS =====
+# Cada etapa recebe (entradas, pasta_trabalho) e devolve uma função sem
+# argumentos que executa a operação medida e retorna o número de itens.
+
+def _etapa_gerar(motor):
+    def preparar(entradas, trabalho):
+        from src.core.document_generator import BatchDocumentGenerator
+
+        batch = BatchDocumentGenerator(entradas['template'], motor=motor)
+        batch.adicionar_lote(corpus.linhas_rpcm(entradas['escala']))
+        saida = trabalho / "saida"
+
+        def executar():
+            resultados = batch.gerar_todos(str(saida))
+            return resultados['sucesso']
+        return executar
+    return preparar
+
+
+def _etapa_importar_planilha(entradas, trabalho):
+    from src.core.document_generator import BatchDocumentGenerator
+
+    batch = BatchDocumentGenerator(entradas['template'])
+
+    def executar():
+        return batch.importar_excel(str(entradas['planilha_xlsx']))
+    return executar
+
+
+def _etapa_limpar_html(entradas, trabalho):
+    from src.converters.word_html_cleaner import WordHTMLCleaner
+
+    trechos = [corpus.html_word(i) for i in range(entradas['escala'])]
+
+    def executar():
+        for trecho in trechos:
+            WordHTMLCleaner.clean(trecho)
+        return len(trechos)
+    return executar
+
+
+def _etapa_html_para_docx(entradas, trabalho):
+    from src.converters.html_to_docx import HTMLtoDOCXConverter
+
+    trechos = [corpus.html_word(i) for i in range(entradas['escala'])]
+
+    def executar():
+        for trecho in trechos:
+            HTMLtoDOCXConverter().convert(trecho)
+        return len(trechos)
+    return executar
+
+
+def _etapa_substituir_numeros(entradas, trabalho):
+    from src.core.number_replacer import carregar_mapeamento_planilha, processar_pasta
+
+    pasta = trabalho / "biblioteca"
+    shutil.copytree(entradas['biblioteca'], pasta)
+    mapeamento = carregar_mapeamento_planilha(str(entradas['mapeamento']))
+
+    def executar():
+        return processar_pasta(pasta, mapeamento)['total']
+    return executar
+
+
+def _etapa_organizar_copia(entradas, trabalho):
+    from src.core.lot_organizer import copiar_lote
+
+    numeros = corpus.numeros_preco(entradas['escala'])[::2]
+
+    def executar():
+        return copiar_lote(entradas['pdfs'], trabalho / "lote", numeros)['copiados']
+    return executar
+
+
+def _etapa_organizar_verificacao(entradas, trabalho):
+    from src.core.lot_organizer import verificar_lote
+
+    numeros = corpus.numeros_preco(entradas['escala'])
+
+    def executar():
+        return verificar_lote(entradas['pdfs'], numeros)['total_arquivos']
+    return executar
+
+
+ETAPAS = {
+    'gerar_docxtpl': _etapa_gerar('docxtpl'),
+    'gerar_rapido': _etapa_gerar('rapido'),
+    'importar_planilha': _etapa_importar_planilha,
+    'limpar_html': _etapa_limpar_html,
+    'html_para_docx': _etapa_html_para_docx,
+    'substituir_numeros': _etapa_substituir_numeros,
+    'organizar_copia': _etapa_organizar_copia,
+    'organizar_verificacao': _etapa_organizar_verificacao,
+}
+
+
+def _executar_etapa(nome: str, entradas: dict) -> dict:
+    """Roda uma etapa (em processo isolado) e retorna suas métricas"""
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory(prefix=f"bench_{nome}_") as pasta:
+        executar = ETAPAS[nome](entradas, Path(pasta))
+
+        inicio = time.perf_counter()
+        itens = executar()
+        segundos = time.perf_counter() - inicio
+
+    pico = pico_rss_mb()
+    return {
+        'itens': itens,
+        'segundos': round(segundos, 4),
+        'itens_por_segundo': round(itens / segundos, 2) if segundos > 0 else None,
+        'pico_rss_mb': round(pico, 1) if pico is not None else None
+    }
+
+
+def gerar_entradas(pasta: Path, escala: int) -> dict:
+    """Gera (fora da medição) todas as entradas sintéticas de uma escala"""
+    pasta.mkdir(parents=True, exist_ok=True)
+    template = corpus.gerar_template(pasta)
+
+    return {
+        'escala': escala,
+        'template': str(template),
+        'planilha_xlsx': corpus.gerar_planilha_xlsx(pasta, escala),
+        'mapeamento': corpus.gerar_mapeamento_csv(pasta, escala),
+        'biblioteca': corpus.gerar_biblioteca_docx(pasta, escala, template),
+        'pdfs': corpus.gerar_pasta_pdfs(pasta, escala),
+    }
+
+
+def executar_benchmarks(escalas: list, etapas: list) -> dict:
+    """Executa as etapas em cada escala e retorna o relatório completo"""
+    relatorio = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'resultados': {}
+    }
+
+    with tempfile.TemporaryDirectory(prefix="bench_corpus_") as pasta_corpus:
+        for escala in escalas:
+            print(f"Gerando corpus sintético ({escala})...")
+            entradas = gerar_entradas(Path(pasta_corpus) / str(escala), escala)
+
+            for nome in etapas:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    metricas = executor.submit(_executar_etapa, nome, entradas).result()
+
+                chave = f"{nome}@{escala}"
+                relatorio['resultados'][chave] = metricas
+                print(
+                    f"  {chave:<32} {metricas['itens_por_segundo'] or 0:>10.1f} itens/s"
+                    f"  {metricas['segundos']:>8.2f}s  pico {metricas['pico_rss_mb']} MB"
+                )
+
+    return relatorio
+
+
+def comparar(relatorio: dict, baseline: dict, tolerancia: float) -> list:
+    """
+    Compara o relatório com o baseline
+
+    Returns:
+        Lista de regressões (mensagens); vazia se tudo dentro da tolerância
+    """
+    regressoes = []
+    for chave, atual in relatorio['resultados'].items():
+        anterior = baseline.get('resultados', {}).get(chave)
+        if not anterior:
+            continue
+
+        medivel = max(anterior.get('segundos', 0), atual['segundos']) >= TEMPO_MINIMO_COMPARACAO
+        if medivel and anterior.get('itens_por_segundo') and atual.get('itens_por_segundo'):
+            limite = anterior['itens_por_segundo'] * (1 - tolerancia)
+            if atual['itens_por_segundo'] < limite:
+                regressoes.append(
+                    f"{chave}: {atual['itens_por_segundo']} itens/s "
+                    f"(baseline {anterior['itens_por_segundo']})"
+                )
+
+        if anterior.get('pico_rss_mb') and atual.get('pico_rss_mb'):
+            limite = anterior['pico_rss_mb'] * (1 + tolerancia)
+            if atual['pico_rss_mb'] > limite:
+                regressoes.append(
+                    f"{chave}: pico {atual['pico_rss_mb']} MB "
+                    f"(baseline {anterior['pico_rss_mb']} MB)"
+                )
+
+    return regressoes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[1])
+    parser.add_argument("--escalas", type=int, nargs="+", default=ESCALAS_PADRAO,
+                        help="Quantidade de itens por corpus (ex: 100 1000 10000)")
+    parser.add_argument("--etapas", nargs="+", choices=list(ETAPAS), default=list(ETAPAS),
+                        help="Etapas a executar (padrão: todas)")
+    parser.add_argument("--saida", help="Arquivo JSON onde gravar os resultados")
+    parser.add_argument("--comparar", help="Baseline JSON para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Variação aceita em relação ao baseline (padrão: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    relatorio = executar_benchmarks(args.escalas, args.etapas)
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=4, ensure_ascii=False)
+        print(f"Resultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressoes = comparar(relatorio, baseline, args.tolerancia)
+        if regressoes:
+            print("\nREGRESSÕES DETECTADAS:")
+            for regressao in regressoes:
+                print(f"  • {regressao}")
+            return 1
+        print("\nSem regressões em relação ao baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -52,6 +52,7 @@ python -m PyInstaller ^
     --workpath="temp" ^
     --specpath="." ^
     --add-data="..\templates;templates" ^
+    --add-data="..\src\core\libreoffice_auxiliar.py;src\core" ^
     --hidden-import="customtkinter" ^
     --hidden-import="tkinter" ^
     --hidden-import="docx" ^
@@ -0,0 +1,13 @@
+"""
+Execução headless: python -m src <comando>
+"""
+
+import multiprocessing
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    # Necessário para a geração paralela (ProcessPoolExecutor) no executável
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+Interface de linha de comando (sem interface gráfica)
+
+Uso:
+    python -m src generate PLANILHA -o PASTA_SAIDA [--template T] [--workers N]
+    python -m src convert ENTRADA [ENTRADA ...] -o PASTA_SAIDA [--workers N] [--blocos] [--incremental]
+    python -m src replace PASTA (--planilha P | --de NUM --para NUM | --desfazer)
+    python -m src organize --destino PASTA [--origem PASTA] (--numeros "1,2" | --arquivo-numeros F)
+
+Os módulos de cada comando são importados apenas quando o comando é
+executado; nada do pacote src.gui (customtkinter, pyperclip) é carregado.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def _comando_generate(args) -> int:
+    """Gera os documentos RPCM de uma planilha"""
+    from src.core.document_generator import BatchDocumentGenerator
+
+    batch = BatchDocumentGenerator(args.template, motor=args.motor)
+    importados = batch.importar_excel(args.planilha)
+    print(f"{importados} documentos importados de {args.planilha}")
+
+    if not importados:
+        return 1
+
+    resultados = batch.gerar_todos(
+        args.saida,
+        workers=args.workers,
+        incremental=args.incremental
+    )
+
+    print(
+        f"Sucesso: {resultados['sucesso']} | Erros: {resultados['erro']} | "
+        f"Ignorados: {resultados['ignorados']} | Total: {resultados['total']}"
+    )
+    for erro in resultados['erros']:
+        print(f"  • {erro['numero_preco']}: {erro['erro']}", file=sys.stderr)
+
+    return 1 if resultados['erro'] else 0
+
+
+def _comando_convert(args) -> int:
+    """Converte arquivos DOCX (ou pastas de DOCX) para PDF"""
+    from src.core.pdf_converter import DocxToPdfConverter
+
+    conversor = DocxToPdfConverter()
+    if not conversor.metodos_disponiveis:
+        print("Nenhum método de conversão disponível", file=sys.stderr)
+        return 1
+
+    arquivos_docx = []
+    for entrada in map(Path, args.entradas):
+        if entrada.is_dir():
+            arquivos_docx.extend(sorted(entrada.glob("*.[dD][oO][cC][xX]")))
+        else:
+            arquivos_docx.append(entrada)
+
+    if not arquivos_docx:
+        print("Nenhum arquivo DOCX encontrado", file=sys.stderr)
+        return 1
+
+    pasta_saida = Path(args.saida)
+    pasta_saida.mkdir(parents=True, exist_ok=True)
+
+    def log(mensagem, tipo="info"):
+        print(mensagem, file=sys.stderr if tipo == "erro" else sys.stdout)
+
+    def converter_lista(arquivos, saida, log, progresso=None):
+        if args.blocos:
+            return conversor.conversao_em_lote(arquivos, saida, log, progresso, workers=args.workers)
+        if args.workers > 1:
+            # Pool de processos LibreOffice (perfis separados); sem LibreOffice,
+            # pool de instâncias do Word
+            return conversor.conversao_paralela(arquivos, saida, log, progresso, workers=args.workers)
+        return conversor.conversao_sequencial(arquivos, saida, log, progresso)
+
+    if args.incremental:
+        convertidos, erros, metodos_usados, _, ignorados = conversor.conversao_incremental(
+            arquivos_docx, pasta_saida, log, converter_lista=converter_lista
+        )
+        print(f"Convertidos: {convertidos} | Ignorados (já atualizados): {ignorados} | Erros: {erros}")
+    else:
+        convertidos, erros, metodos_usados, _ = converter_lista(arquivos_docx, pasta_saida, log)
+        print(f"Convertidos: {convertidos} | Erros: {erros}")
+    for metodo, qtd in metodos_usados.items():
+        print(f"  • {metodo}: {qtd} arquivo(s)")
+
+    return 1 if erros else 0
+
+
+def _comando_replace(args) -> int:
+    """Substitui números nos DOCX de uma pasta"""
+    from src.core.number_replacer import (
+        carregar_mapeamento_planilha,
+        criar_diario,
+        desfazer_diario,
+        listar_diarios,
+        processar_pasta
+    )
+
+    if args.desfazer:
+        diarios = listar_diarios(Path(args.pasta))
+        if not diarios:
+            print("Nenhum lote para desfazer nesta pasta", file=sys.stderr)
+            return 1
+
+        resultado = desfazer_diario(diarios[0], forcar=args.forcar)
+        print(
+            f"Restaurados: {resultado['restaurados']} | "
+            f"Preservados: {len(resultado['ignorados'])} | Erros: {len(resultado['erros'])}"
+        )
+        for item in resultado['ignorados'] + resultado['erros']:
+            print(f"  • {item}", file=sys.stderr)
+        return 1 if resultado['erros'] else 0
+
+    if args.planilha:
+        mapeamento = carregar_mapeamento_planilha(args.planilha)
+    elif args.de and args.para:
+        mapeamento = [(args.de, args.para)]
+    else:
+        print("Informe --planilha ou --de/--para", file=sys.stderr)
+        return 2
+
+    if args.simular:
+        from src.core.number_replacer import previsualizar_pasta
+
+        previa = previsualizar_pasta(
+            Path(args.pasta), mapeamento, workers=args.workers, usar_indice=args.indice
+        )
+        print(
+            f"Com ocorrências: {len(previa['com_ocorrencias'])} | "
+            f"Desconsiderados: {len(previa['desconsiderados'])} | "
+            f"Erros: {len(previa['erros'])} | Total: {previa['total']}"
+        )
+        for nome in previa['com_ocorrencias']:
+            ocorrencias = previa['arquivos'][nome]['ocorrencias']
+            detalhes = "; ".join(
+                f"{numero}: " + ", ".join(f"{local}={qtd}" for local, qtd in sorted(locais.items()))
+                for numero, locais in sorted(ocorrencias.items())
+            )
+            print(f"  {nome} -> {detalhes}")
+        for erro in previa['erros']:
+            print(f"  • {erro}", file=sys.stderr)
+        return 1 if previa['erros'] else 0
+
+    relatorio = None
+    if args.relatorio:
+        from src.core.number_replacer import BatchReport
+
+        relatorio = BatchReport(Path(args.relatorio), formatos=tuple(args.formato_relatorio))
+
+    diario = criar_diario(Path(args.pasta))
+    try:
+        resultado = processar_pasta(
+            Path(args.pasta), mapeamento, workers=args.workers, usar_indice=args.indice,
+            diario=diario, relatorio=relatorio
+        )
+    finally:
+        if relatorio is not None:
+            relatorio.fechar()
+        # Diário vazio (nada alterado, ou falha antes da primeira alteração)
+        # não pode virar o "último lote" do --desfazer
+        if not any(diario.iterdir()):
+            diario.rmdir()
+
+    print(
+        f"Processados: {resultado['processados']} | "
+        f"Desconsiderados: {len(resultado['desconsiderados'])} | "
+        f"Erros: {len(resultado['erros'])} | Total: {resultado['total']}"
+    )
+    for erro in resultado['erros']:
+        print(f"  • {erro}", file=sys.stderr)
+    if relatorio is not None:
+        print(f"Relatório: {', '.join(str(caminho) for caminho in relatorio.caminhos.values())}")
+
+    return 1 if resultado['erros'] else 0
+
+
+def _comando_organize(args) -> int:
+    """Copia os PDFs de um lote (ou apenas verifica a pasta do lote)"""
+    from src.core.lot_organizer import parse_lista_numeros, verificar_lote, copiar_lote
+
+    if args.arquivo_numeros:
+        texto = Path(args.arquivo_numeros).read_text(encoding='utf-8')
+    else:
+        texto = args.numeros or ''
+
+    numeros = parse_lista_numeros(texto)
+    if not numeros:
+        print("Nenhum número informado", file=sys.stderr)
+        return 2
+
+    if not args.verificar:
+        if not args.origem:
+            print("Informe --origem para copiar o lote", file=sys.stderr)
+            return 2
+
+        resultado = copiar_lote(Path(args.origem), Path(args.destino), numeros)
+        print(
+            f"Arquivos copiados: {resultado['copiados']} | "
+            f"Números copiados: {len(resultado['numeros_copiados'])}"
+        )
+        if resultado['nao_encontrados']:
+            print(f"Não encontrados: {', '.join(resultado['nao_encontrados'])}")
+        for erro in resultado['erros']:
+            print(f"  • {erro}", file=sys.stderr)
+        return 1 if resultado['erros'] else 0
+
+    verificacao = verificar_lote(Path(args.destino), numeros)
+    print(
+        f"Arquivos no lote: {verificacao['total_arquivos']} | "
+        f"Conformes: {len(verificacao['conformes'])} | "
+        f"Ausentes: {len(verificacao['ausentes'])} | "
+        f"Excedentes: {len(verificacao['excedentes'])}"
+    )
+    if verificacao['ausentes']:
+        print(f"Ausentes: {', '.join(verificacao['ausentes'])}")
+    if verificacao['excedentes']:
+        print(f"Excedentes: {', '.join(verificacao['excedentes'])}")
+    for numero, arquivos in verificacao['repetidos'].items():
+        print(f"Repetido {numero}: {', '.join(arquivos)}")
+
+    return 1 if verificacao['ausentes'] else 0
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria o parser de argumentos com os subcomandos"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Automações RPCM sem interface gráfica"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Exibe logs detalhados")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    # generate
+    p_generate = subparsers.add_parser("generate", help="Gera documentos RPCM de uma planilha")
+    p_generate.add_argument("planilha", help="Planilha .xlsx/.xls/.csv (Descrição, Unidade, Nº Preço)")
+    p_generate.add_argument("-o", "--saida", required=True, help="Pasta de saída")
+    p_generate.add_argument("--template", help="Template .docx (padrão: templates/template_rpcm.docx)")
+    p_generate.add_argument("--workers", type=int, default=1, help="Processos paralelos")
+    p_generate.add_argument(
+        "--motor", choices=["docxtpl", "rapido"], default="docxtpl",
+        help="Motor de renderização"
+    )
+    p_generate.add_argument(
+        "--incremental", action="store_true",
+        help="Pula documentos já gerados com o mesmo template e dados"
+    )
+    p_generate.set_defaults(func=_comando_generate)
+
+    # convert
+    p_convert = subparsers.add_parser("convert", help="Converte DOCX para PDF")
+    p_convert.add_argument("entradas", nargs="+", help="Arquivos .docx ou pastas")
+    p_convert.add_argument("-o", "--saida", required=True, help="Pasta de saída dos PDFs")
+    p_convert.add_argument(
+        "--workers", type=int, default=1,
+        help="Conversões simultâneas (processos LibreOffice do pool)"
+    )
+    p_convert.add_argument(
+        "--blocos", action="store_true",
+        help="Converte em blocos, com uma chamada ao LibreOffice por bloco"
+    )
+    p_convert.add_argument(
+        "--incremental", action="store_true",
+        help="Converte apenas DOCX novos ou alterados desde a última conversão"
+    )
+    p_convert.set_defaults(func=_comando_convert)
+
+    # replace
+    p_replace = subparsers.add_parser("replace", help="Substitui números em DOCX de uma pasta")
+    p_replace.add_argument("pasta", help="Pasta com os arquivos .docx")
+    p_replace.add_argument("--planilha", help="Planilha com colunas CodSAP e CodServico")
+    p_replace.add_argument("--de", help="Número a buscar (sem planilha)")
+    p_replace.add_argument("--para", help="Número substituto (sem planilha)")
+    p_replace.add_argument("--workers", type=int, default=1, help="Processos paralelos")
+    p_replace.add_argument(
+        "--indice", action="store_true",
+        help="Usa o índice de números da pasta (guardado na pasta de configuração) "
+             "para abrir só arquivos com os números"
+    )
+    p_replace.add_argument(
+        "--simular", action="store_true",
+        help="Apenas lista as ocorrências por arquivo/local, sem alterar nada"
+    )
+    p_replace.add_argument(
+        "--desfazer", action="store_true",
+        help="Desfaz o último lote de substituição da pasta"
+    )
+    p_replace.add_argument(
+        "--forcar", action="store_true",
+        help="Com --desfazer, restaura também arquivos editados depois do lote"
+    )
+    p_replace.add_argument(
+        "--relatorio",
+        help="Grava o relatório por arquivo durante o processamento (caminho sem extensão)"
+    )
+    p_replace.add_argument(
+        "--formato-relatorio", nargs="+", choices=["csv", "jsonl"], default=["csv", "jsonl"],
+        help="Formatos do relatório (padrão: csv jsonl)"
+    )
+    p_replace.set_defaults(func=_comando_replace)
+
+    # organize
+    p_organize = subparsers.add_parser("organize", help="Organiza/verifica PDFs de um lote")
+    p_organize.add_argument("--origem", help="Pasta banco com todos os PDFs")
+    p_organize.add_argument("--destino", required=True, help="Pasta do lote")
+    p_organize.add_argument("--numeros", help="Números separados por vírgula/espaço")
+    p_organize.add_argument("--arquivo-numeros", help="Arquivo texto com os números")
+    p_organize.add_argument(
+        "--verificar", action="store_true",
+        help="Apenas verifica a pasta do lote, sem copiar"
+    )
+    p_organize.set_defaults(func=_comando_organize)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Ponto de entrada da linha de comando"""
+    args = criar_parser().parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        return args.func(args)
+    except Exception as e:
+        logger.debug("Erro na execução do comando", exc_info=True)
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
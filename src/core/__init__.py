@@ -5,7 +5,23 @@ Módulo core com geradores de documentos
 from .document_generator import (
     DocumentGenerator,
     BatchDocumentGenerator,
-    DocumentGenerationError
+    DocumentGenerationError,
+    CompiledTemplate,
+    FastTemplate,
+    TemplateNaoSuportadoError,
+    MOTOR_DOCXTPL,
+    MOTOR_RAPIDO,
+    obter_template_compilado
 )
 
-__all__ = ['DocumentGenerator', 'BatchDocumentGenerator', 'DocumentGenerationError']
+__all__ = [
+    'DocumentGenerator',
+    'BatchDocumentGenerator',
+    'DocumentGenerationError',
+    'CompiledTemplate',
+    'FastTemplate',
+    'TemplateNaoSuportadoError',
+    'MOTOR_DOCXTPL',
+    'MOTOR_RAPIDO',
+    'obter_template_compilado'
+]
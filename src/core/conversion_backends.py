@@ -0,0 +1,284 @@
+"""
+Backends de conversão DOCX → PDF e ordenação adaptativa do fallback
+
+Este módulo é responsável por:
+1. Definir a interface ConversionBackend (sondagem, conversão, capacidades
+   e segurança entre threads)
+2. Registrar, por backend e por tipo/tamanho de documento, a taxa de
+   sucesso e a latência das conversões
+3. Ordenar a cadeia de fallback pelo custo esperado de cada backend, de
+   modo que um motor que sempre falha em certo tipo de documento deixa de
+   ser tentado primeiro (e de cobrar o seu timeout)
+4. Persistir as estatísticas entre sessões
+"""
+
+from pathlib import Path
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Protocol, runtime_checkable
+
+from src.utils.config_manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_ESTATISTICAS = ConfigManager.CONFIG_FILE.parent / 'estatisticas_conversao.json'
+
+EXTENSOES_WORD = frozenset({'.docx', '.doc', '.docm', '.rtf'})
+
+# Faixas de tamanho usadas para agrupar documentos parecidos
+FAIXAS_TAMANHO = [(100 * 1024, 'pequeno'), (2 * 1024 * 1024, 'medio')]
+
+# Abaixo disso a categoria ainda não diz nada: vale o histórico geral do backend
+MINIMO_AMOSTRAS = 3
+
+# Backend sem histórico: latência presumida (s) antes da primeira medição
+LATENCIA_INICIAL = 5.0
+
+SALVAR_A_CADA = 50
+
+
+@runtime_checkable
+class ConversionBackend(Protocol):
+    """
+    Um motor de conversão DOCX → PDF
+
+    Atributos:
+        nome: Nome exibido e usado como chave das estatísticas
+        extensoes: Extensões de entrada aceitas (capacidades)
+        seguro_entre_threads: Pode converter de várias threads ao mesmo tempo
+    """
+
+    nome: str
+    extensoes: frozenset
+    seguro_entre_threads: bool
+
+    def disponivel(self) -> bool:
+        """Sondagem: o motor pode ser usado agora?"""
+        ...
+
+    def converter(self, arquivo_docx: Path, arquivo_pdf: Path) -> None:
+        """Converte um documento; exceção em caso de falha"""
+        ...
+
+
+class FunctionBackend:
+    """ConversionBackend montado a partir de uma função de conversão"""
+
+    def __init__(
+        self,
+        nome: str,
+        converter: callable,
+        disponivel=True,
+        seguro_entre_threads: bool = False,
+        extensoes: frozenset = EXTENSOES_WORD
+    ):
+        """
+        Args:
+            nome: Nome do backend
+            converter: Função (arquivo_docx, arquivo_pdf); retornar False ou
+                       lançar exceção indica falha
+            disponivel: bool ou função sem argumentos (sondagem)
+            seguro_entre_threads: Se a função pode ser chamada em paralelo
+            extensoes: Extensões de entrada aceitas
+        """
+        self.nome = nome
+        self._converter = converter
+        self._disponivel = disponivel
+        self.seguro_entre_threads = seguro_entre_threads
+        self.extensoes = frozenset(extensoes)
+
+    def disponivel(self) -> bool:
+        return bool(self._disponivel() if callable(self._disponivel) else self._disponivel)
+
+    def converter(self, arquivo_docx: Path, arquivo_pdf: Path) -> None:
+        if self._converter(arquivo_docx, arquivo_pdf) is False:
+            raise Exception("Conversão não concluída")
+
+    def __repr__(self) -> str:
+        return f"FunctionBackend({self.nome!r})"
+
+
+def categoria_documento(arquivo: Path) -> str:
+    """Categoria usada nas estatísticas: extensão + faixa de tamanho (ex: 'docx:medio')"""
+    arquivo = Path(arquivo)
+    extensao = arquivo.suffix.lower().lstrip('.') or 'sem_extensao'
+    try:
+        tamanho = arquivo.stat().st_size
+    except OSError:
+        tamanho = 0
+
+    for limite, faixa in FAIXAS_TAMANHO:
+        if tamanho < limite:
+            return f"{extensao}:{faixa}"
+    return f"{extensao}:grande"
+
+
+class BackendRegistry:
+    """
+    Estatísticas de conversão por backend e categoria de documento
+
+    Para cada (backend, categoria) guarda tentativas, sucessos e o tempo
+    total gasto (inclusive nas falhas, que também custam: um timeout de 60s
+    pesa como tal). O custo esperado de começar por um backend é a latência
+    média dividida pela taxa de sucesso, ambas suavizadas para que um
+    backend sem histórico tenha custo neutro; com custos iguais prevalece a
+    ordem informada pelo chamador.
+
+    Thread-safe: registrar_resultado() pode ser chamado de várias threads.
+    """
+
+    VERSAO = 1
+
+    def __init__(self, caminho: Optional[Path] = ARQUIVO_ESTATISTICAS):
+        """
+        Args:
+            caminho: Arquivo JSON das estatísticas (None = apenas em memória)
+        """
+        self.caminho = Path(caminho) if caminho else None
+        self._trava = threading.Lock()
+        # {backend: {categoria: [tentativas, sucessos, segundos]}}
+        self._estatisticas = {}
+        self._nao_salvos = 0
+        self._carregar()
+
+    def _carregar(self):
+        if self.caminho is None or not self.caminho.exists():
+            return
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            if dados.get('versao') == self.VERSAO:
+                self._estatisticas = dados.get('backends', {})
+        except (OSError, ValueError) as e:
+            # Estatísticas são só uma otimização: recomeça do zero
+            logger.warning(f"Estatísticas de conversão ignoradas: {str(e)}")
+
+    def salvar(self):
+        """Grava as estatísticas (escrita atômica; falhas apenas registradas no log)"""
+        if self.caminho is None:
+            return
+        with self._trava:
+            dados = {'versao': self.VERSAO, 'backends': self._estatisticas}
+            conteudo = json.dumps(dados, indent=2, ensure_ascii=False)
+            self._nao_salvos = 0
+
+        try:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=str(self.caminho.parent), suffix='.tmp')
+            with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+                f.write(conteudo)
+            os.replace(temporario, self.caminho)
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar as estatísticas de conversão: {str(e)}")
+
+    def registrar_resultado(self, nome: str, categoria: str, sucesso: bool, segundos: float):
+        """Contabiliza uma tentativa de conversão"""
+        with self._trava:
+            entrada = self._estatisticas.setdefault(nome, {}).setdefault(categoria, [0, 0, 0.0])
+            entrada[0] += 1
+            entrada[1] += 1 if sucesso else 0
+            entrada[2] += segundos
+            self._nao_salvos += 1
+            salvar = self._nao_salvos >= SALVAR_A_CADA
+
+        if salvar:
+            self.salvar()
+
+    def _amostras(self, nome: str, categoria: str) -> tuple:
+        """(tentativas, sucessos, segundos) da categoria, ou do backend todo se ela tem poucas amostras"""
+        por_categoria = self._estatisticas.get(nome, {})
+        entrada = por_categoria.get(categoria)
+        if entrada and entrada[0] >= MINIMO_AMOSTRAS:
+            return tuple(entrada)
+
+        tentativas = sum(item[0] for item in por_categoria.values())
+        sucessos = sum(item[1] for item in por_categoria.values())
+        segundos = sum(item[2] for item in por_categoria.values())
+        return tentativas, sucessos, segundos
+
+    def custo_esperado(self, nome: str, categoria: str) -> float:
+        """Segundos esperados até um PDF começando por este backend (menor é melhor)"""
+        with self._trava:
+            tentativas, sucessos, segundos = self._amostras(nome, categoria)
+
+        taxa_sucesso = (sucessos + 1) / (tentativas + 2)
+        latencia = (segundos + LATENCIA_INICIAL) / (tentativas + 1)
+        return latencia / taxa_sucesso
+
+    def ordenar(self, arquivo: Path, backends: list, exigir_seguro_entre_threads: bool = False) -> list:
+        """
+        Backends disponíveis e capazes de converter o arquivo, do menor para o
+        maior custo esperado na categoria do arquivo
+        """
+        categoria = categoria_documento(arquivo)
+        extensao = Path(arquivo).suffix.lower()
+
+        candidatos = [
+            backend for backend in backends
+            if extensao in backend.extensoes
+            and (backend.seguro_entre_threads or not exigir_seguro_entre_threads)
+            and backend.disponivel()
+        ]
+        # sorted é estável: sem histórico, vale a ordem recebida
+        return sorted(candidatos, key=lambda backend: self.custo_esperado(backend.nome, categoria))
+
+    def converter(
+        self,
+        arquivo_docx: Path,
+        arquivo_pdf: Path,
+        backends: list,
+        exigir_seguro_entre_threads: bool = False
+    ) -> str:
+        """
+        Converte tentando os backends na ordem adaptativa e registra cada tentativa
+
+        Returns:
+            Nome do backend que converteu
+
+        Raises:
+            Exception com o erro de cada backend tentado
+        """
+        categoria = categoria_documento(arquivo_docx)
+        erros_metodos = []
+
+        for backend in self.ordenar(arquivo_docx, backends, exigir_seguro_entre_threads):
+            inicio = time.perf_counter()
+            try:
+                backend.converter(arquivo_docx, arquivo_pdf)
+            except Exception as e:
+                self.registrar_resultado(backend.nome, categoria, False, time.perf_counter() - inicio)
+                erros_metodos.append(f"{backend.nome}: {str(e)}")
+                continue
+
+            self.registrar_resultado(backend.nome, categoria, True, time.perf_counter() - inicio)
+            return backend.nome
+
+        if not erros_metodos:
+            raise Exception("Nenhum método de conversão disponível!")
+
+        erros_completos = "\n      ".join(erros_metodos)
+        raise Exception(f"Todos os métodos falharam:\n      {erros_completos}")
+
+    def resumo(self) -> dict:
+        """
+        Totais por backend
+
+        Returns:
+            dict {backend: {'tentativas', 'taxa_sucesso', 'latencia_media'}}
+        """
+        with self._trava:
+            resumo = {}
+            for nome, por_categoria in self._estatisticas.items():
+                tentativas = sum(item[0] for item in por_categoria.values())
+                sucessos = sum(item[1] for item in por_categoria.values())
+                segundos = sum(item[2] for item in por_categoria.values())
+                resumo[nome] = {
+                    'tentativas': tentativas,
+                    'taxa_sucesso': sucessos / tentativas if tentativas else None,
+                    'latencia_media': segundos / tentativas if tentativas else None
+                }
+            return resumo
@@ -9,9 +9,21 @@ Este módulo é responsável por:
 
 from docxtpl import DocxTemplate
 from docx import Document
+from jinja2 import Environment
 from pathlib import Path
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from xml.sax.saxutils import escape as xml_escape
+import copy
+import hashlib
+import json
 import logging
-from typing import Optional
+import math
+import os
+import re
+import threading
+import zipfile
+from typing import Iterable, Iterator, Optional, Union
 
 from src.models.documento_rpcm import DocumentoRPCM
 
@@ -23,17 +35,408 @@ class DocumentGenerationError(Exception):
     pass
 
 
+# Propriedades do documento que o docxtpl renderiza (ver DocxTemplate.render_properties)
+_PROPRIEDADES_RENDERIZADAS = ['author', 'comments', 'identifier', 'language', 'subject', 'title']
+
+_CONTENT_TYPE_FOOTNOTES = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"
+)
+
+# Importação de planilhas (BatchDocumentGenerator.importar_excel)
+COLUNAS_IMPORTACAO = ['Descrição', 'Unidade', 'Nº Preço']
+TAMANHO_BLOCO_IMPORTACAO = 10000
+
+# Motores de renderização disponíveis no DocumentGenerator
+MOTOR_DOCXTPL = 'docxtpl'
+MOTOR_RAPIDO = 'rapido'
+
+# Partes do .docx onde o motor rápido substitui variáveis
+_PARTES_TEMPLATE_RAPIDO = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+# Partes que o docxtpl também renderiza, mas que o motor rápido não trata
+_PARTES_NAO_SUPORTADAS_RAPIDO = re.compile(r'^(word/footnotes\.xml|docProps/core\.xml)$')
+
+# {{ VAR }} com possíveis tags XML entre as chaves (o Word quebra o texto em runs)
+_REGEX_PLACEHOLDER = re.compile(r'\{(?:<[^>]*>)*\{(.*?)\}(?:<[^>]*>)*\}', re.DOTALL)
+
+# {% ... %} e {# ... #} - laços, condicionais e comentários Jinja
+_REGEX_BLOCO_JINJA = re.compile(r'\{(?:<[^>]*>)*[%#]')
+
+_REGEX_IDENTIFICADOR = re.compile(r'^\s*([A-Za-z_]\w*)\s*$')
+
+
+class _JinjaEnvironmentCompilado(Environment):
+    """
+    Environment Jinja que memoriza os templates compilados por texto-fonte
+
+    O docxtpl chama from_string() a cada render com o mesmo XML pré-processado;
+    compilar uma única vez elimina o custo dominante da renderização.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compilados = {}
+    
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        
+        template = self._compilados.get(source)
+        if template is None:
+            template = super().from_string(source)
+            self._compilados[source] = template
+        return template
+
+
+class CompiledTemplate:
+    """
+    Template RPCM carregado uma única vez e renderizado a partir de uma cópia limpa
+
+    Mantém em memória os bytes do .docx, o documento python-docx já parseado e
+    o estado original das partes que o docxtpl altera durante o render (corpo,
+    cabeçalhos/rodapés, notas de rodapé e propriedades). A cada documento esse
+    estado é restaurado, evitando descompactar e parsear o template novamente.
+    """
+    
+    def __init__(self, template_path: Path):
+        """
+        Args:
+            template_path: Caminho para o arquivo template .docx
+        """
+        self.template_path = Path(template_path)
+        self.mtime = self.template_path.stat().st_mtime
+        self._lock = threading.Lock()
+        self._jinja_env = _JinjaEnvironmentCompilado()
+        
+        self._blob = self.template_path.read_bytes()
+        self._docx = DocxTemplate(BytesIO(self._blob)).get_docx()
+        
+        # Estado original das partes alteradas pelo docxtpl
+        self._corpo_original = copy.deepcopy(self._docx._element.body)
+        self._partes_cabecalho_rodape = {
+            rel_key: rel._target
+            for rel_key, rel in self._docx._part.rels.items()
+            if rel.reltype in (DocxTemplate.HEADER_URI, DocxTemplate.FOOTER_URI)
+        }
+        self._blobs_footnotes = {
+            part: part.blob
+            for part in self._docx._part.package.parts
+            if part.content_type == _CONTENT_TYPE_FOOTNOTES
+        }
+        self._propriedades_originais = {
+            prop: getattr(self._docx.core_properties, prop)
+            for prop in _PROPRIEDADES_RENDERIZADAS
+        }
+        
+        logger.debug(f"Template compilado: {self.template_path}")
+    
+    def esta_atualizado(self) -> bool:
+        """Verifica se o arquivo do template não foi alterado desde a compilação"""
+        try:
+            return self.template_path.stat().st_mtime == self.mtime
+        except OSError:
+            return False
+    
+    def _restaurar_estado_original(self):
+        """Devolve o documento em memória ao estado do template original"""
+        raiz = self._docx._element
+        raiz.replace(raiz.body, copy.deepcopy(self._corpo_original))
+        
+        rels = self._docx._part.rels
+        for rel_key, parte in self._partes_cabecalho_rodape.items():
+            rels[rel_key]._target = parte
+        
+        for parte, blob in self._blobs_footnotes.items():
+            parte._blob = blob
+        
+        for prop, valor in self._propriedades_originais.items():
+            setattr(self._docx.core_properties, prop, valor)
+    
+    def renderizar(self, context: dict, output_path) -> None:
+        """
+        Renderiza o template com o contexto e salva em output_path
+        
+        Args:
+            context: Variáveis do template (ex: DocumentoRPCM.to_dict())
+            output_path: Caminho (ou arquivo binário) de destino
+        """
+        with self._lock:
+            self._restaurar_estado_original()
+            
+            doc_template = DocxTemplate(BytesIO(self._blob))
+            doc_template.docx = self._docx
+            doc_template.render(context, jinja_env=self._jinja_env)
+            doc_template.save(output_path)
+
+
+class TemplateNaoSuportadoError(DocumentGenerationError):
+    """Template usa recursos que o motor rápido não suporta (laços, condicionais, filtros)"""
+    pass
+
+
+# Caracteres de controle que o docxtpl (resolve_listing) converte em
+# elementos do Word: tabulação, novo parágrafo, quebra de linha e de página
+_CARACTERES_QUEBRA = ('\t', '\a', '\n', '\f')
+
+
+def _resolver_quebras(xml: str) -> str:
+    """
+    Converte \\t, \\a, \\n e \\f dentro dos <w:t> em <w:tab/>, novo parágrafo,
+    <w:br/> e quebra de página, com a mesma regra do DocxTemplate.resolve_listing
+    (as propriedades do run e do parágrafo são repetidas nos elementos novos)
+    """
+    def resolver_texto(propriedades_run, propriedades_paragrafo, match):
+        texto = match.group(0).replace(
+            '\t',
+            '</w:t></w:r>'
+            f'<w:r>{propriedades_run}<w:tab/></w:r>'
+            f'<w:r>{propriedades_run}<w:t xml:space="preserve">'
+        )
+        texto = texto.replace(
+            '\a',
+            '</w:t></w:r></w:p>'
+            f'<w:p>{propriedades_paragrafo}<w:r>{propriedades_run}<w:t xml:space="preserve">'
+        )
+        texto = texto.replace('\n', '</w:t><w:br/><w:t xml:space="preserve">')
+        return texto.replace(
+            '\f',
+            '</w:t></w:r></w:p>'
+            '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+            f'<w:p>{propriedades_paragrafo}<w:r>{propriedades_run}<w:t xml:space="preserve">'
+        )
+
+    def resolver_run(propriedades_paragrafo, match):
+        propriedades_run = re.search(r'<w:rPr>.*?</w:rPr>', match.group(0))
+        propriedades_run = propriedades_run.group(0) if propriedades_run else ''
+        return re.sub(
+            r'<w:t(?: [^>]*)?>.*?</w:t>',
+            lambda m: resolver_texto(propriedades_run, propriedades_paragrafo, m),
+            match.group(0),
+            flags=re.DOTALL
+        )
+
+    def resolver_paragrafo(match):
+        propriedades_paragrafo = re.search(r'<w:pPr>.*?</w:pPr>', match.group(0))
+        propriedades_paragrafo = propriedades_paragrafo.group(0) if propriedades_paragrafo else ''
+        return re.sub(
+            r'<w:r(?: [^>]*)?>.*?</w:r>',
+            lambda m: resolver_run(propriedades_paragrafo, m),
+            match.group(0),
+            flags=re.DOTALL
+        )
+
+    return re.sub(r'<w:p(?: [^>]*)?>.*?</w:p>', resolver_paragrafo, xml, flags=re.DOTALL)
+
+
+class FastTemplate:
+    """
+    Motor de renderização rápido para templates com variáveis simples {{VAR}}
+    
+    Localiza os placeholders de word/document.xml, cabeçalhos e rodapés uma
+    única vez. Por documento, apenas concatena os trechos fixos com os valores
+    escapados para XML; as demais partes do .docx são copiadas de um zip base
+    já compactado, sem recompressão.
+    
+    Raises:
+        TemplateNaoSuportadoError: Se o template usa laços, condicionais ou
+                                   expressões que exigem o Jinja
+    """
+    
+    def __init__(self, template_path: Path):
+        """
+        Args:
+            template_path: Caminho para o arquivo template .docx
+        """
+        self.template_path = Path(template_path)
+        self.mtime = self.template_path.stat().st_mtime
+        
+        # {nome_parte: (ZipInfo, [trecho_fixo, variavel, trecho_fixo, ...])}
+        self._partes = {}
+        base = BytesIO()
+        
+        with zipfile.ZipFile(self.template_path) as zin, \
+                zipfile.ZipFile(base, 'w', zipfile.ZIP_DEFLATED) as zbase:
+            for item in zin.infolist():
+                conteudo = zin.read(item.filename)
+                
+                if _PARTES_NAO_SUPORTADAS_RAPIDO.match(item.filename):
+                    xml = conteudo.decode('utf-8')
+                    if _REGEX_BLOCO_JINJA.search(xml) or _REGEX_PLACEHOLDER.search(xml):
+                        raise TemplateNaoSuportadoError(
+                            f"Variáveis em {item.filename} não são suportadas pelo motor rápido"
+                        )
+                
+                if _PARTES_TEMPLATE_RAPIDO.match(item.filename):
+                    segmentos = self._compilar_parte(item.filename, conteudo.decode('utf-8'))
+                    if len(segmentos) > 1:
+                        self._partes[item.filename] = (item, segmentos)
+                        continue
+                
+                zbase.writestr(item, conteudo)
+        
+        self._zip_base = base.getvalue()
+        logger.debug(
+            f"Template rápido compilado: {self.template_path} "
+            f"({len(self._partes)} parte(s) com variáveis)"
+        )
+    
+    @staticmethod
+    def _compilar_parte(nome: str, xml: str) -> list:
+        """
+        Divide o XML da parte em trechos fixos e nomes de variáveis
+        
+        Returns:
+            Lista alternando [texto, variavel, texto, ..., texto]
+        """
+        if _REGEX_BLOCO_JINJA.search(xml):
+            raise TemplateNaoSuportadoError(
+                f"Laços/condicionais em {nome} exigem o motor docxtpl"
+            )
+        
+        # Como no docxtpl: o <w:t> que recebe um valor preserva espaços nas
+        # pontas (senão o Word descarta os do valor)
+        xml = re.sub(
+            r'<w:t>((?:(?!<w:t>).)*)(\{\{.*?\}\})',
+            r'<w:t xml:space="preserve">\1\2',
+            xml,
+            flags=re.DOTALL
+        )
+        
+        segmentos = []
+        inicio = 0
+        for match in _REGEX_PLACEHOLDER.finditer(xml):
+            # Remover tags XML que o Word inseriu dentro do placeholder
+            expressao = re.sub(r'<[^>]*>', '', match.group(1))
+            identificador = _REGEX_IDENTIFICADOR.match(expressao)
+            if not identificador:
+                raise TemplateNaoSuportadoError(
+                    f"Expressão '{{{{{expressao}}}}}' em {nome} exige o motor docxtpl"
+                )
+            
+            segmentos.append(xml[inicio:match.start()])
+            segmentos.append(identificador.group(1))
+            inicio = match.end()
+        
+        segmentos.append(xml[inicio:])
+        return segmentos
+    
+    def esta_atualizado(self) -> bool:
+        """Verifica se o arquivo do template não foi alterado desde a compilação"""
+        try:
+            return self.template_path.stat().st_mtime == self.mtime
+        except OSError:
+            return False
+    
+    def renderizar(self, context: dict, output_path) -> None:
+        """
+        Substitui as variáveis e grava o .docx em output_path
+        
+        Variáveis ausentes do contexto são renderizadas vazias, como no docxtpl.
+        Valores com quebras de linha (célula com Alt+Enter), tabulações etc.
+        passam pela mesma conversão do docxtpl (_resolver_quebras).
+        
+        Args:
+            context: Variáveis do template (ex: DocumentoRPCM.to_dict())
+            output_path: Caminho (ou arquivo binário) de destino
+        """
+        valores = {
+            chave: xml_escape(str(valor)) for chave, valor in context.items()
+        }
+        
+        if hasattr(output_path, 'write'):
+            destino = output_path
+            destino.write(self._zip_base)
+        else:
+            destino = open(output_path, 'w+b')
+            destino.write(self._zip_base)
+        
+        try:
+            with zipfile.ZipFile(destino, 'a') as zout:
+                for item, segmentos in self._partes.values():
+                    partes_xml = list(segmentos)
+                    for i in range(1, len(partes_xml), 2):
+                        partes_xml[i] = valores.get(partes_xml[i], '')
+                    xml = ''.join(partes_xml)
+                    # Só há o que converter se algum valor trouxe os caracteres
+                    if any(
+                        caractere in partes_xml[i]
+                        for i in range(1, len(partes_xml), 2)
+                        for caractere in _CARACTERES_QUEBRA
+                    ):
+                        xml = _resolver_quebras(xml)
+                    zout.writestr(item, xml.encode('utf-8'))
+        finally:
+            if destino is not output_path:
+                destino.close()
+
+
+_templates_compilados = {}
+_templates_compilados_lock = threading.Lock()
+
+
+def obter_template_compilado(template_path, motor: str = MOTOR_DOCXTPL):
+    """
+    Retorna o template compilado do cache, recompilando se o arquivo mudou
+    
+    O cache é indexado pelo caminho absoluto do template e pelo motor, e
+    invalidado pela data de modificação (mtime) do arquivo. Se o motor rápido
+    não suportar o template, retorna o CompiledTemplate (docxtpl).
+    
+    Args:
+        template_path: Caminho para o arquivo template .docx
+        motor: MOTOR_DOCXTPL ou MOTOR_RAPIDO
+        
+    Returns:
+        CompiledTemplate ou FastTemplate pronto para renderizar
+    """
+    if motor not in (MOTOR_DOCXTPL, MOTOR_RAPIDO):
+        raise ValueError(f"Motor de renderização desconhecido: {motor}")
+    
+    caminho = Path(template_path).resolve()
+    chave = (str(caminho), motor)
+    
+    with _templates_compilados_lock:
+        compilado = _templates_compilados.get(chave)
+        if compilado is None or not compilado.esta_atualizado():
+            compilado = None
+            if motor == MOTOR_RAPIDO:
+                try:
+                    compilado = FastTemplate(caminho)
+                except TemplateNaoSuportadoError as e:
+                    logger.warning(f"Motor rápido indisponível, usando docxtpl: {e}")
+            if compilado is None:
+                compilado = CompiledTemplate(caminho)
+            _templates_compilados[chave] = compilado
+        return compilado
+
+
 class DocumentGenerator:
     """
     Classe responsável por gerar documentos RPCM a partir do template incluído no projeto
     """
     
-    def __init__(self, template_path: Optional[str] = None):
+    def __init__(
+        self,
+        template_path: Optional[str] = None,
+        usar_cache: bool = False,
+        motor: str = MOTOR_DOCXTPL
+    ):
         """
         Args:
             template_path: Caminho para o arquivo template .docx
                           Se None, usa o template padrão em templates/template_rpcm.docx
+            usar_cache: Se True, carrega o template uma única vez (CompiledTemplate)
+                        e renderiza cada documento a partir da cópia em memória
+            motor: MOTOR_DOCXTPL (Jinja completo) ou MOTOR_RAPIDO (substituição
+                   direta no zip; volta ao docxtpl se o template usar laços/condicionais).
+                   O motor rápido sempre usa o cache de templates.
         """
+        if motor not in (MOTOR_DOCXTPL, MOTOR_RAPIDO):
+            raise ValueError(f"Motor de renderização desconhecido: {motor}")
+        
+        self.motor = motor
+        self.usar_cache = usar_cache or motor == MOTOR_RAPIDO
+
         if template_path is None:
             # Usar template incluído no projeto
             projeto_root = Path(__file__).parent.parent.parent
@@ -43,6 +446,15 @@ class DocumentGenerator:
         
         self._validar_template()
     
+    @property
+    def motor_efetivo(self) -> str:
+        """Motor que de fato renderiza: o rápido volta ao docxtpl se não suportar o template"""
+        if self.motor == MOTOR_RAPIDO and isinstance(
+            obter_template_compilado(self.template_path, self.motor), FastTemplate
+        ):
+            return MOTOR_RAPIDO
+        return MOTOR_DOCXTPL
+    
     def _validar_template(self):
         """Valida se o template existe e é acessível"""
         if not self.template_path.exists():
@@ -56,8 +468,11 @@ class DocumentGenerator:
             raise ValueError("Template deve ser um arquivo .docx")
         
         try:
-            # Tentar abrir para validar
-            DocxTemplate(str(self.template_path))
+            # Tentar abrir para validar (com cache, o parse já fica compilado)
+            if self.usar_cache:
+                obter_template_compilado(self.template_path, self.motor)
+            else:
+                DocxTemplate(str(self.template_path))
         except Exception as e:
             raise ValueError(f"Template inválido ou corrompido: {str(e)}")
     
@@ -79,19 +494,11 @@ class DocumentGenerator:
         logger.info(f"Iniciando geração do documento para: {dados.numero_preco}")
         
         try:
-            # 1. Carregar template
-            doc_template = DocxTemplate(str(self.template_path))
-            logger.debug("Template carregado")
-            
-            # 2. Preparar contexto com variáveis
+            # 1. Preparar contexto com variáveis
             context = dados.to_dict()
             logger.debug(f"Contexto preparado: {context}")
             
-            # 3. Renderizar template com variáveis
-            doc_template.render(context)
-            logger.debug("Template renderizado com variáveis")
-            
-            # 4. Determinar caminho final
+            # 2. Determinar caminho final
             if output_path is None:
                 output_dir = self.template_path.parent / "documentos_gerados"
                 output_dir.mkdir(exist_ok=True)
@@ -99,8 +506,17 @@ class DocumentGenerator:
             else:
                 output_path = Path(output_path)
             
-            # 5. Salvar documento final
-            doc_template.save(str(output_path))
+            # 3. Renderizar e salvar documento final
+            if self.usar_cache:
+                template = obter_template_compilado(self.template_path, self.motor)
+                template.renderizar(context, str(output_path))
+                logger.debug("Template compilado renderizado com variáveis")
+            else:
+                doc_template = DocxTemplate(str(self.template_path))
+                doc_template.render(context)
+                logger.debug("Template renderizado com variáveis")
+                doc_template.save(str(output_path))
+            
             logger.info(f"Documento gerado com sucesso: {output_path}")
             
             return str(output_path)
@@ -110,18 +526,235 @@ class DocumentGenerator:
             raise DocumentGenerationError(f"Falha na geração: {str(e)}") from e
 
 
+class GenerationManifest:
+    """
+    Manifesto de geração gravado na pasta de saída (.manifesto_rpcm.json)
+    
+    Registra, para cada arquivo gerado, um hash do template, do motor de
+    renderização (os motores não geram o mesmo XML para todo contexto) e do
+    contexto renderizado. Em uma nova execução, documentos cujo arquivo
+    existe e cujo hash coincide podem ser pulados. O manifesto é salvo periodicamente para
+    que um lote interrompido possa ser retomado.
+    """
+    
+    NOME_ARQUIVO = '.manifesto_rpcm.json'
+    SALVAR_A_CADA = 100
+    
+    def __init__(self, output_path: Path, template_path: Path, motor: str = MOTOR_DOCXTPL):
+        """
+        Args:
+            output_path: Pasta de saída dos documentos
+            template_path: Template usado na geração
+            motor: Motor que efetivamente renderiza (DocumentGenerator.motor_efetivo)
+        """
+        self.caminho = Path(output_path) / self.NOME_ARQUIVO
+        self.hash_template = hashlib.sha256(Path(template_path).read_bytes()).hexdigest()
+        self.motor = motor
+        self._pendentes_salvar = 0
+        self._arquivos = {}
+        
+        if self.caminho.exists():
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    self._arquivos = json.load(f).get('arquivos', {})
+            except Exception as e:
+                logger.warning(f"Manifesto ilegível, será recriado: {e}")
+    
+    def calcular_hash(self, documento: DocumentoRPCM) -> str:
+        """Hash do template + motor + contexto renderizado do documento"""
+        contexto = json.dumps(documento.to_dict(), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(
+            f"{self.hash_template}\n{self.motor}\n{contexto}".encode('utf-8')
+        ).hexdigest()
+    
+    def esta_atualizado(self, documento: DocumentoRPCM, arquivo_path: Path) -> bool:
+        """Verifica se o arquivo existe e foi gerado com o mesmo template e dados"""
+        return (
+            self._arquivos.get(arquivo_path.name) == self.calcular_hash(documento)
+            and arquivo_path.exists()
+        )
+    
+    def registrar(self, documento: DocumentoRPCM, arquivo: str):
+        """Registra um documento gerado com sucesso"""
+        self._arquivos[Path(arquivo).name] = self.calcular_hash(documento)
+        self._pendentes_salvar += 1
+        
+        if self._pendentes_salvar >= self.SALVAR_A_CADA:
+            self.salvar()
+    
+    def salvar(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+        temporario = self.caminho.with_suffix('.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': 1, 'arquivos': self._arquivos}, f, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+        self._pendentes_salvar = 0
+
+
+def _documento_de_item(item: Union[DocumentoRPCM, dict]) -> DocumentoRPCM:
+    """
+    Converte um item de entrada (DocumentoRPCM ou dict de linha) em DocumentoRPCM
+    
+    Aceita tanto as chaves usadas pela interface ('descricao', 'unidade',
+    'numero_preco') quanto os nomes das colunas da planilha.
+    """
+    if isinstance(item, DocumentoRPCM):
+        return item
+    
+    def campo(*chaves):
+        for chave in chaves:
+            if chave in item and item[chave] is not None:
+                return str(item[chave])
+        return ''
+    
+    return DocumentoRPCM(
+        descricao=campo('descricao', 'Descrição'),
+        unidade=campo('unidade', 'Unidade'),
+        numero_preco=campo('numero_preco', 'Nº Preço')
+    )
+
+
+def _ler_planilha_em_blocos(arquivo: str, colunas: list, tamanho_bloco: int = None):
+    """
+    Lê as colunas indicadas de um .csv/.xlsx/.xls em blocos de DataFrames de texto
+    
+    Arquivos .xlsx são percorridos em modo somente leitura (openpyxl), sem
+    materializar a planilha inteira; .csv usa o leitor em blocos do pandas.
+    
+    Yields:
+        Tuplas (linha_inicial, DataFrame) com índice 0..n-1 dentro do bloco
+        
+    Raises:
+        ValueError: Se alguma coluna estiver ausente
+    """
+    import pandas as pd
+    
+    tamanho_bloco = tamanho_bloco or TAMANHO_BLOCO_IMPORTACAO
+    
+    def validar_colunas(encontradas):
+        faltando = [col for col in colunas if col not in encontradas]
+        if faltando:
+            raise ValueError(f"Colunas faltando no arquivo: {', '.join(faltando)}")
+    
+    sufixo = Path(arquivo).suffix.lower()
+    
+    if sufixo == '.csv':
+        validar_colunas(pd.read_csv(arquivo, nrows=0).columns)
+        leitor = pd.read_csv(arquivo, usecols=colunas, dtype=str, chunksize=tamanho_bloco)
+        inicio = 0
+        for bloco in leitor:
+            yield inicio, bloco[colunas].reset_index(drop=True)
+            inicio += len(bloco)
+    
+    elif sufixo == '.xls':
+        # Formato antigo não suporta leitura em streaming
+        df = pd.read_excel(arquivo, dtype=str)
+        validar_colunas(df.columns)
+        for inicio in range(0, len(df), tamanho_bloco):
+            yield inicio, df[colunas].iloc[inicio:inicio + tamanho_bloco].reset_index(drop=True)
+    
+    else:
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(arquivo, read_only=True, data_only=True)
+        try:
+            # Primeira planilha, como o pd.read_excel (a ativa pode ser outra)
+            linhas = workbook.worksheets[0].iter_rows(values_only=True)
+            cabecalho = [str(valor).strip() if valor is not None else '' for valor in next(linhas, ())]
+            validar_colunas(cabecalho)
+            posicoes = [cabecalho.index(col) for col in colunas]
+            
+            inicio = 0
+            buffer = []
+            for linha in linhas:
+                buffer.append([linha[p] if p < len(linha) else None for p in posicoes])
+                if len(buffer) >= tamanho_bloco:
+                    yield inicio, pd.DataFrame(buffer, columns=colunas, dtype=object)
+                    inicio += len(buffer)
+                    buffer = []
+            if buffer:
+                yield inicio, pd.DataFrame(buffer, columns=colunas, dtype=object)
+        finally:
+            workbook.close()
+
+
+def _normalizar_bloco_importacao(bloco):
+    """
+    Converte um bloco da planilha para texto limpo, com operações vetorizadas
+    
+    Valores ausentes viram '', espaços são removidos e códigos numéricos lidos
+    como float ('400726.0') voltam ao formato inteiro ('400726').
+    """
+    bloco = bloco.fillna('').astype(str)
+    for coluna in bloco.columns:
+        bloco[coluna] = bloco[coluna].str.strip()
+    bloco['Nº Preço'] = bloco['Nº Preço'].str.replace(r'^(\d+)\.0+$', r'\1', regex=True)
+    return bloco
+
+
+def _gerar_lote_worker(
+    template_path: str,
+    usar_cache: bool,
+    motor: str,
+    output_directory: str,
+    lote: list
+) -> list:
+    """
+    Gera um lote de documentos em um processo do pool
+    
+    O template é carregado uma única vez por processo (cache de templates).
+    
+    Args:
+        lote: Lista de tuplas (indice, DocumentoRPCM)
+        
+    Returns:
+        Lista de tuplas (indice, arquivo, erro)
+    """
+    generator = DocumentGenerator(template_path, usar_cache=usar_cache, motor=motor)
+    output_path = Path(output_directory)
+    resultados = []
+    
+    for indice, documento in lote:
+        try:
+            arquivo_path = output_path / documento.get_nome_arquivo()
+            resultados.append((indice, generator.gerar_documento(documento, str(arquivo_path)), None))
+        except Exception as e:
+            resultados.append((indice, None, str(e)))
+    
+    return resultados
+
+
 class BatchDocumentGenerator:
     """
     Classe para geração em lote de documentos RPCM
     """
     
-    def __init__(self, template_path: Optional[str] = None):
+    def __init__(
+        self,
+        template_path: Optional[str] = None,
+        usar_cache: bool = True,
+        motor: str = MOTOR_DOCXTPL
+    ):
         """
         Args:
             template_path: Caminho para o template (opcional)
+            usar_cache: Se True (padrão), o template é carregado uma única vez
+                        e reaproveitado por todos os documentos do lote
+            motor: Motor de renderização (MOTOR_DOCXTPL ou MOTOR_RAPIDO)
         """
-        self.generator = DocumentGenerator(template_path)
-        self.documentos = []
+        self.generator = DocumentGenerator(template_path, usar_cache=usar_cache, motor=motor)
+        # Índice por número de preço; o dict preserva a ordem de inserção
+        self._documentos = {}
+    
+    @property
+    def documentos(self) -> tuple:
+        """
+        Documentos da lista, na ordem de inserção (somente leitura)
+        
+        Para alterar a lista use adicionar_documento, adicionar_lote,
+        remover_documento e limpar_lista.
+        """
+        return tuple(self._documentos.values())
     
     def adicionar_documento(self, documento: DocumentoRPCM):
         """
@@ -134,90 +767,370 @@ class BatchDocumentGenerator:
             ValueError: Se número de preço já existe na lista
         """
         # Verificar duplicata
-        for doc in self.documentos:
-            if doc.numero_preco == documento.numero_preco:
-                raise ValueError(
-                    f"Número de preço {documento.numero_preco} já existe na lista"
-                )
+        if documento.numero_preco in self._documentos:
+            raise ValueError(
+                f"Número de preço {documento.numero_preco} já existe na lista"
+            )
         
-        self.documentos.append(documento)
+        self._documentos[documento.numero_preco] = documento
         logger.info(f"Documento adicionado à lista: {documento.numero_preco}")
     
+    def adicionar_lote(self, itens: Iterable[Union[DocumentoRPCM, dict]]) -> list:
+        """
+        Valida e adiciona vários documentos em uma única passada
+        
+        Args:
+            itens: Iterável de DocumentoRPCM ou dicts de linha (mesmos formatos
+                   aceitos por gerar_iter)
+            
+        Returns:
+            Lista de rejeições: [{'indice': 3, 'numero_preco': '400726', 'erro': '...'}]
+            com o índice do item no iterável de entrada
+        """
+        rejeitados = []
+        adicionados = 0
+        
+        for indice, item in enumerate(itens):
+            numero_preco = None
+            try:
+                documento = _documento_de_item(item)
+                numero_preco = documento.numero_preco
+                
+                if numero_preco in self._documentos:
+                    raise ValueError(f"Número de preço {numero_preco} já existe na lista")
+                
+                self._documentos[numero_preco] = documento
+                adicionados += 1
+            except Exception as e:
+                rejeitados.append({
+                    'indice': indice,
+                    'numero_preco': numero_preco,
+                    'erro': str(e)
+                })
+        
+        logger.info(f"Lote adicionado à lista: {adicionados} documentos, {len(rejeitados)} rejeitados")
+        return rejeitados
+    
     def remover_documento(self, numero_preco: str):
         """Remove documento da lista pelo número de preço"""
-        self.documentos = [doc for doc in self.documentos 
-                          if doc.numero_preco != numero_preco]
+        self._documentos.pop(numero_preco, None)
         logger.info(f"Documento removido da lista: {numero_preco}")
     
     def limpar_lista(self):
         """Limpa todos os documentos da lista"""
-        self.documentos = []
+        self._documentos = {}
         logger.info("Lista de documentos limpa")
     
     def gerar_todos(
         self, 
         output_directory: str,
-        callback_progresso: Optional[callable] = None
+        callback_progresso: Optional[callable] = None,
+        workers: int = 1,
+        tamanho_lote: Optional[int] = None,
+        cancelar: Optional[threading.Event] = None,
+        incremental: bool = False
     ) -> dict:
         """
         Gera todos os documentos da lista
         
         Args:
             output_directory: Diretório onde salvar os documentos
-            callback_progresso: Função callback(atual, total, nome_arquivo) para progresso
+            callback_progresso: Função callback(atual, total, nome_arquivo) para progresso.
+                                Sempre chamada na thread de quem chamou gerar_todos
+            workers: Número de processos para geração paralela (1 = sequencial)
+            tamanho_lote: Documentos por tarefa no modo paralelo (padrão: automático).
+                          Cada tarefa carrega o template uma única vez
+            cancelar: Evento que, quando sinalizado, interrompe a geração entre
+                      documentos; os já gerados são mantidos no resultado
+            incremental: Se True, usa o manifesto da pasta de saída para pular
+                         documentos já gerados com o mesmo template e os mesmos
+                         dados, permitindo retomar um lote interrompido
             
         Returns:
-            dict com estatísticas: {'sucesso': 10, 'erro': 0, 'total': 10, 'arquivos': [...]}
+            dict com estatísticas: {'sucesso': 10, 'erro': 0, 'ignorados': 0, 'total': 10,
+            'arquivos': [...], 'erros': [...], 'cancelado': False}
+            Os arquivos e erros seguem a ordem da lista de entrada; 'arquivos'
+            inclui os documentos ignorados por já estarem atualizados
         """
-        if not self.documentos:
+        documentos = self.documentos
+        if not documentos:
             raise ValueError("Lista de documentos está vazia")
         
         output_path = Path(output_directory)
         output_path.mkdir(parents=True, exist_ok=True)
         
+        total = len(documentos)
+        logger.info(f"Iniciando geração em lote de {total} documentos")
+        
+        manifesto = None
+        ignorados = {}
+        pendentes = list(range(total))
+        
+        if incremental:
+            manifesto = GenerationManifest(
+                output_path, self.generator.template_path, self.generator.motor_efetivo
+            )
+            pendentes = []
+            for indice, documento in enumerate(documentos):
+                arquivo_path = output_path / documento.get_nome_arquivo()
+                if manifesto.esta_atualizado(documento, arquivo_path):
+                    ignorados[indice] = str(arquivo_path)
+                else:
+                    pendentes.append(indice)
+            
+            logger.info(
+                f"Modo incremental: {len(ignorados)} atualizados, "
+                f"{len(pendentes)} a gerar"
+            )
+        
+        documentos_pendentes = [documentos[indice] for indice in pendentes]
+        ao_gerar = manifesto.registrar if manifesto else None
+        
+        try:
+            if not documentos_pendentes:
+                gerados_pendentes = []
+            elif workers > 1 and len(documentos_pendentes) > 1:
+                gerados_pendentes = self._gerar_paralelo(
+                    documentos_pendentes, output_path, callback_progresso,
+                    workers, tamanho_lote, cancelar, ao_gerar
+                )
+            else:
+                gerados_pendentes = self._gerar_sequencial(
+                    documentos_pendentes, output_path, callback_progresso, cancelar, ao_gerar
+                )
+        finally:
+            if manifesto:
+                manifesto.salvar()
+        
+        gerados = dict(zip(pendentes, gerados_pendentes))
+        
         resultados = {
             'sucesso': 0,
             'erro': 0,
-            'total': len(self.documentos),
+            'ignorados': len(ignorados),
+            'total': total,
             'arquivos': [],
-            'erros': []
+            'erros': [],
+            'cancelado': cancelar is not None and cancelar.is_set()
         }
         
-        logger.info(f"Iniciando geração em lote de {resultados['total']} documentos")
+        for indice, documento in enumerate(documentos):
+            if indice in ignorados:
+                resultados['arquivos'].append(ignorados[indice])
+                continue
+            
+            gerado = gerados.get(indice)
+            if gerado is None:
+                # Não processado (geração cancelada)
+                continue
+            
+            arquivo, erro = gerado
+            if erro is None:
+                resultados['sucesso'] += 1
+                resultados['arquivos'].append(arquivo)
+            else:
+                resultados['erro'] += 1
+                resultados['erros'].append({
+                    'numero_preco': documento.numero_preco,
+                    'erro': erro
+                })
+        
+        if resultados['cancelado']:
+            logger.warning(
+                f"Geração em lote cancelada: {resultados['sucesso'] + resultados['erro']} "
+                f"de {len(pendentes)} documentos processados"
+            )
+        
+        logger.info(
+            f"Geração em lote concluída: {resultados['sucesso']} sucesso, "
+            f"{resultados['erro']} erros, {resultados['ignorados']} ignorados"
+        )
+        
+        return resultados
+    
+    def gerar_iter(
+        self,
+        itens: Iterable[Union[DocumentoRPCM, dict]],
+        output_directory: str,
+        cancelar: Optional[threading.Event] = None
+    ) -> Iterator[dict]:
+        """
+        Gera documentos sob demanda, produzindo um resultado por documento
+        
+        Não usa nem altera self.documentos: cada item é convertido, gerado e
+        descartado, de modo que a memória não cresce com o tamanho da entrada.
+        Duplicatas não são verificadas (use adicionar_documento para isso).
         
-        for i, documento in enumerate(self.documentos, 1):
+        Args:
+            itens: Iterável de DocumentoRPCM ou dicts de linha, com as chaves
+                   'descricao'/'unidade'/'numero_preco' ou as colunas da
+                   planilha 'Descrição'/'Unidade'/'Nº Preço'
+            output_directory: Diretório onde salvar os documentos
+            cancelar: Evento que, quando sinalizado, encerra a iteração
+            
+        Yields:
+            dict: {'indice': 0, 'numero_preco': '400726', 'arquivo': '...', 'erro': None}
+            Em caso de falha, 'arquivo' é None e 'erro' contém a mensagem
+        """
+        output_path = Path(output_directory)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        for indice, item in enumerate(itens):
+            if cancelar is not None and cancelar.is_set():
+                logger.warning(f"Geração sob demanda cancelada após {indice} documentos")
+                return
+            
+            resultado = {'indice': indice, 'numero_preco': None, 'arquivo': None, 'erro': None}
+            try:
+                documento = _documento_de_item(item)
+                resultado['numero_preco'] = documento.numero_preco
+                
+                arquivo_path = output_path / documento.get_nome_arquivo()
+                resultado['arquivo'] = self.generator.gerar_documento(documento, str(arquivo_path))
+            except Exception as e:
+                resultado['erro'] = str(e)
+                logger.error(f"[{indice + 1}] Erro: {resultado['numero_preco']} - {str(e)}")
+            
+            yield resultado
+    
+    def _gerar_sequencial(
+        self,
+        documentos: list,
+        output_path: Path,
+        callback_progresso: Optional[callable],
+        cancelar: Optional[threading.Event],
+        ao_gerar: Optional[callable] = None
+    ) -> list:
+        """
+        Gera os documentos um a um no processo atual
+        
+        Args:
+            ao_gerar: Função ao_gerar(documento, arquivo) chamada após cada sucesso
+        
+        Returns:
+            Lista de tuplas (arquivo, erro) na ordem de documentos;
+            None para documentos não processados por cancelamento
+        """
+        total = len(documentos)
+        gerados = [None] * total
+        
+        for i, documento in enumerate(documentos, 1):
+            if cancelar is not None and cancelar.is_set():
+                break
+            
             try:
                 # Callback de progresso
                 if callback_progresso:
-                    callback_progresso(i, resultados['total'], documento.get_nome_arquivo())
+                    callback_progresso(i, total, documento.get_nome_arquivo())
                 
                 # Gerar documento
                 arquivo_path = output_path / documento.get_nome_arquivo()
                 resultado = self.generator.gerar_documento(documento, str(arquivo_path))
+                gerados[i - 1] = (resultado, None)
                 
-                resultados['sucesso'] += 1
-                resultados['arquivos'].append(resultado)
+                if ao_gerar:
+                    ao_gerar(documento, resultado)
                 
-                logger.info(f"[{i}/{resultados['total']}] Sucesso: {documento.numero_preco}")
+                logger.info(f"[{i}/{total}] Sucesso: {documento.numero_preco}")
                 
             except Exception as e:
-                resultados['erro'] += 1
-                resultados['erros'].append({
-                    'numero_preco': documento.numero_preco,
-                    'erro': str(e)
-                })
-                logger.error(f"[{i}/{resultados['total']}] Erro: {documento.numero_preco} - {str(e)}")
+                gerados[i - 1] = (None, str(e))
+                logger.error(f"[{i}/{total}] Erro: {documento.numero_preco} - {str(e)}")
         
-        logger.info(f"Geração em lote concluída: {resultados['sucesso']} sucesso, {resultados['erro']} erros")
+        return gerados
+    
+    def _gerar_paralelo(
+        self,
+        documentos: list,
+        output_path: Path,
+        callback_progresso: Optional[callable],
+        workers: int,
+        tamanho_lote: Optional[int],
+        cancelar: Optional[threading.Event],
+        ao_gerar: Optional[callable] = None
+    ) -> list:
+        """
+        Distribui os documentos em lotes entre processos (ProcessPoolExecutor)
         
-        return resultados
+        O callback de progresso é chamado nesta thread à medida que cada lote
+        termina, com a contagem de documentos concluídos. Ao cancelar, os lotes
+        ainda não iniciados são descartados e os em andamento são concluídos.
+        
+        Args:
+            ao_gerar: Função ao_gerar(documento, arquivo) chamada após cada sucesso
+        
+        Returns:
+            Lista de tuplas (arquivo, erro) na ordem de documentos;
+            None para documentos não processados por cancelamento
+        """
+        total = len(documentos)
+        if not tamanho_lote:
+            # ~4 lotes por worker equilibra carga sem recarregar o template demais
+            tamanho_lote = max(1, math.ceil(total / (workers * 4)))
+        
+        indexados = list(enumerate(documentos))
+        lotes = [indexados[i:i + tamanho_lote] for i in range(0, total, tamanho_lote)]
+        
+        gerados = [None] * total
+        concluidos = 0
+        
+        logger.info(f"Geração paralela: {workers} processos, {len(lotes)} lotes de até {tamanho_lote}")
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _gerar_lote_worker,
+                    str(self.generator.template_path),
+                    self.generator.usar_cache,
+                    self.generator.motor,
+                    str(output_path),
+                    lote
+                ): lote
+                for lote in lotes
+            }
+            
+            for future in as_completed(futures):
+                if cancelar is not None and cancelar.is_set():
+                    for pendente in futures:
+                        pendente.cancel()
+                
+                if future.cancelled():
+                    continue
+                
+                lote = futures[future]
+                try:
+                    resultados_lote = future.result()
+                except Exception as e:
+                    # Falha do processo inteiro: todos os documentos do lote falham
+                    resultados_lote = [(indice, None, str(e)) for indice, _ in lote]
+                
+                for indice, arquivo, erro in resultados_lote:
+                    gerados[indice] = (arquivo, erro)
+                    documento = documentos[indice]
+                    concluidos += 1
+                    
+                    if erro is None:
+                        if ao_gerar:
+                            ao_gerar(documento, arquivo)
+                        logger.info(f"[{concluidos}/{total}] Sucesso: {documento.numero_preco}")
+                    else:
+                        logger.error(f"[{concluidos}/{total}] Erro: {documento.numero_preco} - {erro}")
+                    
+                    if callback_progresso:
+                        callback_progresso(concluidos, total, documento.get_nome_arquivo())
+        
+        return gerados
     
     def importar_excel(self, arquivo_excel: str) -> int:
         """
         Importa lista de documentos de arquivo Excel/CSV
         
+        Lê apenas as três colunas necessárias, como texto, em blocos de
+        TAMANHO_BLOCO_IMPORTACAO linhas (.xlsx em modo somente leitura), e
+        valida/normaliza cada bloco com operações vetorizadas do pandas.
+        
         Args:
-            arquivo_excel: Caminho para arquivo .xlsx ou .csv
+            arquivo_excel: Caminho para arquivo .xlsx, .xls ou .csv
             
         Returns:
             Número de documentos importados
@@ -225,41 +1138,31 @@ class BatchDocumentGenerator:
         Formato esperado do Excel:
         | Descrição | Unidade | Nº Preço |
         """
-        import pandas as pd
-        
         try:
-            # Ler arquivo
-            if arquivo_excel.endswith('.csv'):
-                df = pd.read_csv(arquivo_excel)
-            else:
-                df = pd.read_excel(arquivo_excel)
-            
-            # Validar colunas
-            colunas_necessarias = ['Descrição', 'Unidade', 'Nº Preço']
-            colunas_faltando = [col for col in colunas_necessarias if col not in df.columns]
-            
-            if colunas_faltando:
-                raise ValueError(
-                    f"Colunas faltando no arquivo: {', '.join(colunas_faltando)}"
-                )
-            
-            # Importar cada linha
             importados = 0
             erros = []
             
-            for idx, row in df.iterrows():
-                try:
-                    doc = DocumentoRPCM(
-                        descricao=str(row['Descrição']).strip(),
-                        unidade=str(row['Unidade']).strip(),
-                        numero_preco=str(row['Nº Preço']).strip()
+            for inicio, bloco in _ler_planilha_em_blocos(arquivo_excel, COLUNAS_IMPORTACAO):
+                bloco = _normalizar_bloco_importacao(bloco)
+                
+                # Linhas com campos obrigatórios vazios (linha 1 = cabeçalho)
+                vazios = bloco == ''
+                invalidas = vazios.any(axis=1)
+                for posicao in invalidas.to_numpy().nonzero()[0]:
+                    faltando = [col for col in COLUNAS_IMPORTACAO if vazios.iat[posicao, COLUNAS_IMPORTACAO.index(col)]]
+                    erros.append(
+                        f"Linha {inicio + posicao + 2}: Campos obrigatórios vazios: {', '.join(faltando)}"
                     )
-                    
-                    self.adicionar_documento(doc)
-                    importados += 1
-                    
-                except Exception as e:
-                    erros.append(f"Linha {idx+2}: {str(e)}")
+                
+                validas = bloco[~invalidas]
+                linhas = validas.to_dict('records')
+                rejeitados = self.adicionar_lote(linhas)
+                importados += len(linhas) - len(rejeitados)
+                
+                numeros_linha = validas.index.to_numpy()
+                erros.extend(
+                    f"Linha {inicio + numeros_linha[r['indice']] + 2}: {r['erro']}" for r in rejeitados
+                )
             
             if erros:
                 logger.warning(f"Importação com erros:\n" + "\n".join(erros))
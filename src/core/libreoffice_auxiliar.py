@@ -0,0 +1,119 @@
+"""
+Processo auxiliar UNO do LibreOfficePool
+
+Executado pelo Python que acompanha o LibreOffice (<instalação>/program/python)
+quando o módulo uno não pode ser importado pela aplicação (ex: executável
+PyInstaller no Windows). Conecta-se ao soffice já iniciado pelo pool e
+atende comandos JSON, um por linha, na entrada padrão:
+
+    {"comando": "converter", "origem": "C:/a.docx", "destino": "C:/a.pdf"}
+    {"comando": "sondar"}
+    {"comando": "sair"}
+
+Cada comando é respondido com uma linha JSON na saída padrão: {"ok": true}
+ou {"ok": false, "erro": "..."}. A primeira linha, antes de qualquer
+comando, informa se a conexão com o soffice foi estabelecida.
+
+Uso:
+    python libreoffice_auxiliar.py "<conexão UNO>" <timeout da conexão em s>
+
+Não importa nada de src: roda fora do ambiente da aplicação.
+"""
+
+from pathlib import Path
+import json
+import sys
+import time
+
+import uno
+from com.sun.star.beans import PropertyValue
+from com.sun.star.connection import NoConnectException
+
+
+def _propriedades(**valores) -> tuple:
+    """Tupla de PropertyValue para as chamadas UNO"""
+    propriedades = []
+    for nome, valor in valores.items():
+        propriedade = PropertyValue()
+        propriedade.Name = nome
+        propriedade.Value = valor
+        propriedades.append(propriedade)
+    return tuple(propriedades)
+
+
+def _responder(**dados):
+    sys.stdout.write(json.dumps(dados) + "\n")
+    sys.stdout.flush()
+
+
+def _conectar(conexao: str, timeout: float):
+    """Desktop do soffice que escuta em conexao (espera ele subir)"""
+    contexto_local = uno.getComponentContext()
+    resolvedor = contexto_local.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", contexto_local
+    )
+    limite = time.monotonic() + timeout
+    while True:
+        try:
+            contexto = resolvedor.resolve(f"uno:{conexao}")
+            break
+        except NoConnectException:
+            if time.monotonic() > limite:
+                raise
+            time.sleep(0.25)
+
+    return contexto.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", contexto
+    )
+
+
+def _converter(desktop, origem: str, destino: str):
+    documento = desktop.loadComponentFromURL(
+        Path(origem).as_uri(), "_blank", 0, _propriedades(Hidden=True, ReadOnly=True)
+    )
+    if documento is None:
+        raise Exception("Documento não pôde ser aberto")
+    try:
+        documento.storeToURL(Path(destino).as_uri(), _propriedades(FilterName="writer_pdf_Export"))
+    finally:
+        try:
+            documento.close(True)
+        except Exception:
+            pass
+
+
+def main() -> int:
+    conexao, timeout = sys.argv[1], float(sys.argv[2])
+    try:
+        desktop = _conectar(conexao, timeout)
+    except Exception as e:
+        _responder(ok=False, erro=f"Sem conexão com o soffice: {str(e)}")
+        return 1
+    _responder(ok=True)
+
+    for linha in sys.stdin:
+        try:
+            pedido = json.loads(linha)
+            comando = pedido.get('comando')
+            if comando == 'sair':
+                break
+            if comando == 'sondar':
+                desktop.getComponents()
+            elif comando == 'converter':
+                _converter(desktop, pedido['origem'], pedido['destino'])
+            else:
+                raise ValueError(f"Comando desconhecido: {comando}")
+        except Exception as e:
+            _responder(ok=False, erro=str(e))
+        else:
+            _responder(ok=True)
+
+    try:
+        desktop.terminate()
+    except Exception:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,561 @@
+"""
+Pool de processos LibreOffice para conversão DOCX → PDF em paralelo
+
+Este módulo é responsável por:
+1. Manter N processos soffice headless de longa duração, cada um com o seu
+   próprio perfil (-env:UserInstallation), de modo que não disputem o perfil
+2. Enviar os documentos a um processo ocioso por um pipe local (UNO)
+3. Verificar a saúde de cada processo antes de usá-lo e reciclá-lo após K
+   documentos (ou após uma falha/timeout)
+4. Converter blocos de documentos com uma única chamada ao soffice e apontar
+   quais PDFs não foram gerados
+
+Modos de operação (escolhidos nesta ordem):
+- servidor: o módulo uno é importável pela própria aplicação
+- auxiliar: o uno só existe no Python que acompanha o LibreOffice
+  (<instalação>/program/python), caso do executável Windows; esse Python
+  roda libreoffice_auxiliar.py, que fala UNO com o soffice, e a aplicação
+  conversa com ele por pipes
+- linha de comando: sem nenhum dos dois não há processo de longa duração,
+  portanto nem sondagem nem reciclagem; cada worker é apenas um perfil
+  próprio para chamar soffice --convert-to (por documento ou por bloco)
+  em paralelo sem conflito
+"""
+
+from pathlib import Path
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+    UNO_DISPONIVEL = True
+except ImportError:
+    UNO_DISPONIVEL = False
+
+MODO_SERVIDOR = 'servidor'
+MODO_AUXILIAR = 'auxiliar'
+MODO_LINHA_COMANDO = 'linha_de_comando'
+
+SCRIPT_AUXILIAR = Path(__file__).with_name('libreoffice_auxiliar.py')
+
+DOCUMENTOS_POR_WORKER = 200
+TIMEOUT_CONVERSAO = 60
+TIMEOUT_INICIALIZACAO = 60
+TIMEOUT_SONDAGEM = 10
+# Um bloco recebe TIMEOUT_CONVERSAO mais este tempo por documento
+TIMEOUT_POR_DOCUMENTO_LOTE = 10
+
+
+def encontrar_python_libreoffice(soffice: str) -> Optional[str]:
+    """Python que acompanha a instalação do soffice (traz o módulo uno), ou None"""
+    pasta_programa = Path(soffice).resolve().parent
+    for nome in ('python.exe', 'python'):
+        candidato = pasta_programa / nome
+        if candidato.is_file():
+            return str(candidato)
+    return None
+
+
+def escolher_modo(soffice: str) -> str:
+    """Melhor modo disponível para o soffice informado (ver docstring do módulo)"""
+    if UNO_DISPONIVEL:
+        return MODO_SERVIDOR
+    if SCRIPT_AUXILIAR.is_file() and encontrar_python_libreoffice(soffice):
+        return MODO_AUXILIAR
+    return MODO_LINHA_COMANDO
+
+
+def _aguardar_ou_matar(processo: subprocess.Popen, timeout: int = 10):
+    try:
+        processo.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+        processo.wait()
+
+
+def _propriedades(**valores) -> tuple:
+    """Tupla de PropertyValue para as chamadas UNO"""
+    propriedades = []
+    for nome, valor in valores.items():
+        propriedade = PropertyValue()
+        propriedade.Name = nome
+        propriedade.Value = valor
+        propriedades.append(propriedade)
+    return tuple(propriedades)
+
+
+class LibreOfficeWorker:
+    """
+    Um processo soffice com perfil próprio
+
+    Não é thread-safe: o LibreOfficePool garante que cada worker atende um
+    documento por vez.
+    """
+
+    def __init__(self, soffice: str, perfil: Path, nome: str, modo: str = None, timeout: int = TIMEOUT_CONVERSAO):
+        """
+        Args:
+            soffice: Caminho do executável soffice
+            perfil: Pasta do perfil exclusivo deste worker
+            nome: Identificador do worker (também nome do pipe UNO)
+            modo: MODO_SERVIDOR, MODO_AUXILIAR ou MODO_LINHA_COMANDO
+                  (padrão: escolher_modo)
+            timeout: Tempo máximo de uma conversão, em segundos
+        """
+        self.soffice = soffice
+        self.perfil = Path(perfil)
+        self.nome = nome
+        self.modo = modo or escolher_modo(soffice)
+        self.timeout = timeout
+        self.documentos = 0
+        self._processo = None
+        self._desktop = None
+        self._auxiliar = None
+        self._respostas = None
+
+    @property
+    def _argumento_perfil(self) -> str:
+        return f"-env:UserInstallation={self.perfil.absolute().as_uri()}"
+
+    @property
+    def persistente(self) -> bool:
+        """Há um processo de longa duração (sondado e reciclado)?"""
+        return self.modo != MODO_LINHA_COMANDO
+
+    @property
+    def iniciado(self) -> bool:
+        if not self.persistente:
+            return self.perfil.exists()
+        return self._processo is not None
+
+    def iniciar(self):
+        """Sobe o processo soffice e conecta ao pipe (modos servidor e auxiliar)"""
+        self.documentos = 0
+        self.perfil.mkdir(parents=True, exist_ok=True)
+        if not self.persistente:
+            return
+
+        conexao = f"pipe,name={self.nome};urp;StarOffice.ComponentContext"
+        self._processo = subprocess.Popen(
+            [
+                self.soffice, self._argumento_perfil,
+                "--headless", "--invisible", "--nologo", "--norestore", "--nodefault",
+                f"--accept={conexao}"
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+        if self.modo == MODO_AUXILIAR:
+            self._iniciar_auxiliar(conexao)
+        else:
+            self._conectar(conexao)
+        logger.info(f"LibreOffice {self.nome} iniciado (pid {self._processo.pid}, {self.modo})")
+
+    def _conectar(self, conexao: str):
+        contexto_local = uno.getComponentContext()
+        resolvedor = contexto_local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", contexto_local
+        )
+        limite = time.monotonic() + TIMEOUT_INICIALIZACAO
+        while True:
+            try:
+                contexto = resolvedor.resolve(f"uno:{conexao}")
+                break
+            except NoConnectException:
+                if self._processo.poll() is not None or time.monotonic() > limite:
+                    self.encerrar()
+                    raise Exception(f"LibreOffice ({self.nome}) não iniciou")
+                time.sleep(0.25)
+
+        self._desktop = contexto.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", contexto
+        )
+
+    def _iniciar_auxiliar(self, conexao: str):
+        """Sobe o libreoffice_auxiliar.py no Python do LibreOffice e espera a conexão"""
+        try:
+            self._auxiliar = subprocess.Popen(
+                [
+                    encontrar_python_libreoffice(self.soffice), str(SCRIPT_AUXILIAR),
+                    conexao, str(TIMEOUT_INICIALIZACAO)
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                # python.exe é um programa de console: sem isso abre uma janela
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+
+            # Leitura da saída em thread própria, para as esperas terem
+            # timeout também no Windows (onde não há select em pipes)
+            respostas = queue.Queue()
+            saida = self._auxiliar.stdout
+
+            def ler():
+                for linha in saida:
+                    respostas.put(linha)
+                respostas.put(None)
+
+            threading.Thread(target=ler, name=f"{self.nome}_saida", daemon=True).start()
+            self._respostas = respostas
+            self._aguardar_resposta(TIMEOUT_INICIALIZACAO + 10)
+        except Exception as e:
+            self.encerrar()
+            raise Exception(f"LibreOffice ({self.nome}) não iniciou: {str(e)}")
+
+    def _aguardar_resposta(self, timeout: float):
+        """Próxima resposta do auxiliar; exceção se ela indicar falha ou não vier"""
+        try:
+            linha = self._respostas.get(timeout=timeout)
+        except queue.Empty:
+            # Conversão travada: derruba os dois processos; a próxima
+            # sondagem falha e o pool reinicia o worker
+            self._matar()
+            raise Exception(f"Tempo limite de {timeout}s excedido")
+        if linha is None:
+            raise Exception("Processo auxiliar do LibreOffice terminou")
+
+        resposta = json.loads(linha)
+        if not resposta.get('ok'):
+            raise Exception(resposta.get('erro') or "Falha sem descrição")
+
+    def _pedir(self, timeout: float, **pedido):
+        """Envia um comando ao auxiliar e espera a resposta"""
+        try:
+            self._auxiliar.stdin.write(json.dumps(pedido) + "\n")
+            self._auxiliar.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise Exception(f"Processo auxiliar do LibreOffice indisponível: {str(e)}")
+        self._aguardar_resposta(timeout)
+
+    def _matar(self):
+        for processo in (self._auxiliar, self._processo):
+            if processo is not None and processo.poll() is None:
+                processo.kill()
+
+    def saudavel(self) -> bool:
+        """
+        Processo vivo e respondendo a uma chamada UNO
+
+        No modo linha de comando não há processo a sondar: sempre True.
+        """
+        if not self.persistente:
+            return True
+        if self._processo is None or self._processo.poll() is not None:
+            return False
+        try:
+            if self.modo == MODO_AUXILIAR:
+                if self._auxiliar.poll() is not None:
+                    return False
+                self._pedir(TIMEOUT_SONDAGEM, comando='sondar')
+            else:
+                self._desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def encerrar(self):
+        """Finaliza o processo (o perfil é mantido para o próximo início)"""
+        if self._processo is None:
+            return
+        if self._auxiliar is not None:
+            # O auxiliar encerra o soffice (desktop.terminate) ao sair
+            try:
+                self._auxiliar.stdin.write(json.dumps({'comando': 'sair'}) + "\n")
+                self._auxiliar.stdin.close()
+            except (OSError, ValueError):
+                pass
+            _aguardar_ou_matar(self._auxiliar)
+            self._auxiliar = None
+            self._respostas = None
+        else:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+        _aguardar_ou_matar(self._processo)
+        self._processo = None
+        self._desktop = None
+
+    def converter(self, arquivo_docx: Path, arquivo_pdf: Path):
+        """Converte um documento; exceção em caso de falha"""
+        arquivo_docx = Path(arquivo_docx).absolute()
+        arquivo_pdf = Path(arquivo_pdf).absolute()
+
+        # PDF anterior seria confundido com o resultado desta conversão
+        if arquivo_pdf.exists():
+            try:
+                arquivo_pdf.unlink()
+            except Exception:
+                pass
+
+        if self.modo == MODO_LINHA_COMANDO:
+            self._converter_linha_comando(arquivo_docx, arquivo_pdf)
+        elif self.modo == MODO_AUXILIAR:
+            self._converter_auxiliar(arquivo_docx, arquivo_pdf)
+        else:
+            self._converter_servidor(arquivo_docx, arquivo_pdf)
+
+        self.documentos += 1
+        if not arquivo_pdf.exists():
+            raise Exception("PDF não foi criado pelo LibreOffice")
+
+    def _converter_servidor(self, arquivo_docx: Path, arquivo_pdf: Path):
+        # Uma conversão travada não retorna pela UNO: o vigia derruba o
+        # processo e a chamada falha, liberando a thread
+        expirou = threading.Event()
+
+        def vigiar():
+            expirou.set()
+            if self._processo is not None:
+                self._processo.kill()
+
+        vigia = threading.Timer(self.timeout, vigiar)
+        vigia.start()
+        documento = None
+        try:
+            documento = self._desktop.loadComponentFromURL(
+                arquivo_docx.as_uri(), "_blank", 0, _propriedades(Hidden=True, ReadOnly=True)
+            )
+            documento.storeToURL(arquivo_pdf.as_uri(), _propriedades(FilterName="writer_pdf_Export"))
+        except Exception as e:
+            if expirou.is_set():
+                raise Exception(f"Tempo limite de {self.timeout}s excedido")
+            raise Exception(f"LibreOffice falhou: {str(e)}")
+        finally:
+            vigia.cancel()
+            if documento is not None and not expirou.is_set():
+                try:
+                    documento.close(True)
+                except Exception:
+                    pass
+
+    def _converter_auxiliar(self, arquivo_docx: Path, arquivo_pdf: Path):
+        try:
+            self._pedir(self.timeout, comando='converter', origem=str(arquivo_docx), destino=str(arquivo_pdf))
+        except Exception as e:
+            raise Exception(f"LibreOffice falhou: {str(e)}")
+
+    def _converter_linha_comando(self, arquivo_docx: Path, arquivo_pdf: Path):
+        resultado = subprocess.run(
+            [
+                self.soffice, self._argumento_perfil, "--headless", "--norestore",
+                "--convert-to", "pdf:writer_pdf_Export",
+                "--outdir", str(arquivo_pdf.parent),
+                str(arquivo_docx)
+            ],
+            capture_output=True,
+            timeout=self.timeout,
+            text=True
+        )
+        if resultado.returncode != 0:
+            raise Exception(f"LibreOffice falhou: {resultado.stderr}")
+
+        gerado = arquivo_pdf.parent / f"{arquivo_docx.stem}.pdf"
+        if gerado != arquivo_pdf and gerado.exists():
+            os.replace(gerado, arquivo_pdf)
+
+    def converter_lote(self, arquivos_docx: list, pasta_saida: Path):
+        """
+        Converte vários documentos com uma única chamada ao soffice (modo
+        linha de comando), gerando <stem>.pdf em pasta_saida
+
+        Não verifica o resultado: quem chama compara os PDFs gerados com os
+        esperados. Exceção apenas se a chamada inteira falhar (ex: timeout).
+        """
+        timeout = self.timeout + TIMEOUT_POR_DOCUMENTO_LOTE * len(arquivos_docx)
+        try:
+            resultado = subprocess.run(
+                [
+                    self.soffice, self._argumento_perfil, "--headless", "--norestore",
+                    "--convert-to", "pdf:writer_pdf_Export",
+                    "--outdir", str(Path(pasta_saida).absolute()),
+                    *(str(Path(arquivo).absolute()) for arquivo in arquivos_docx)
+                ],
+                capture_output=True,
+                timeout=timeout,
+                text=True
+            )
+        except subprocess.TimeoutExpired:
+            raise Exception(f"Tempo limite de {timeout}s excedido no bloco")
+        finally:
+            self.documentos += len(arquivos_docx)
+
+        if resultado.returncode != 0:
+            raise Exception(f"LibreOffice falhou: {resultado.stderr}")
+
+
+class LibreOfficePool:
+    """
+    Pool de LibreOfficeWorker compartilhado entre threads
+
+    converter() pode ser chamado de várias threads ao mesmo tempo: cada
+    chamada pega um worker ocioso (esperando se todos estiverem ocupados),
+    verifica a saúde, recicla se já atendeu documentos_por_worker documentos
+    e devolve o worker ao final. Os processos sobem sob demanda, então um
+    pool de 4 workers usado com 2 arquivos só inicia 2.
+
+    No modo linha de comando não há processos a manter: os workers apenas
+    limitam as chamadas simultâneas ao soffice, cada uma com o seu perfil.
+
+    Uso:
+        with LibreOfficePool(soffice, workers=4) as pool:
+            pool.converter(docx, pdf)
+    """
+
+    def __init__(
+        self,
+        soffice: str,
+        workers: int = 2,
+        documentos_por_worker: int = DOCUMENTOS_POR_WORKER,
+        timeout: int = TIMEOUT_CONVERSAO,
+        pasta_perfis: Optional[Path] = None,
+        modo: Optional[str] = None
+    ):
+        """
+        Args:
+            soffice: Caminho do executável soffice
+            workers: Quantidade de processos LibreOffice
+            documentos_por_worker: Documentos atendidos antes de reiniciar o
+                                   processo (contém vazamentos de memória)
+            timeout: Tempo máximo de uma conversão, em segundos
+            pasta_perfis: Onde criar os perfis (padrão: pasta temporária,
+                          removida em fechar())
+            modo: MODO_SERVIDOR, MODO_AUXILIAR ou MODO_LINHA_COMANDO
+                  (padrão: escolher_modo)
+        """
+        self.documentos_por_worker = documentos_por_worker
+        self._pasta_temporaria = pasta_perfis is None
+        self.pasta_perfis = Path(pasta_perfis or tempfile.mkdtemp(prefix="rpcm_libreoffice_"))
+
+        self._workers = [
+            LibreOfficeWorker(
+                soffice,
+                self.pasta_perfis / f"perfil_{indice}",
+                f"rpcm_lo_{os.getpid()}_{id(self)}_{indice}",
+                modo,
+                timeout
+            )
+            for indice in range(max(1, workers))
+        ]
+        self.modo = self._workers[0].modo
+        if self.modo == MODO_LINHA_COMANDO:
+            logger.info("LibreOffice sem UNO: uma chamada ao soffice por documento/bloco, sem reciclagem")
+        self._ociosos = queue.Queue()
+        for worker in self._workers:
+            self._ociosos.put(worker)
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    @property
+    def descricao(self) -> str:
+        """Resumo para o log da conversão"""
+        if self.modo == MODO_LINHA_COMANDO:
+            return f"{len(self)} perfil(is) LibreOffice em paralelo (um soffice por chamada)"
+        return f"{len(self)} processo(s) LibreOffice de longa duração ({self.modo})"
+
+    def _preparar(self, worker: LibreOfficeWorker):
+        """Garante um processo saudável e dentro do limite de documentos"""
+        if not worker.persistente:
+            if not worker.iniciado:
+                worker.iniciar()
+            return
+        if worker.iniciado:
+            if worker.documentos < self.documentos_por_worker and worker.saudavel():
+                return
+            logger.info(f"Reciclando LibreOffice {worker.nome} após {worker.documentos} documentos")
+            worker.encerrar()
+        worker.iniciar()
+
+    def converter(self, arquivo_docx: Path, arquivo_pdf: Path) -> bool:
+        """Converte um documento em um worker ocioso; exceção em caso de falha"""
+        worker = self._ociosos.get()
+        try:
+            self._preparar(worker)
+            worker.converter(arquivo_docx, arquivo_pdf)
+            return True
+        except Exception:
+            # Estado desconhecido após a falha: o próximo uso reinicia
+            if not worker.saudavel():
+                worker.encerrar()
+            raise
+        finally:
+            self._ociosos.put(worker)
+
+    def converter_lote(self, arquivos_docx: list, pasta_saida: Path) -> list:
+        """
+        Converte um bloco de documentos para <stem>.pdf em pasta_saida
+
+        No modo linha de comando o bloco inteiro vai em uma única chamada ao
+        soffice (o custo de inicialização é pago uma vez por bloco); nos
+        modos servidor e auxiliar os documentos já são enviados ao processo
+        aberto, um a um.
+
+        Returns:
+            Lista dos arquivos cujo PDF não foi gerado (para nova tentativa
+            individual)
+        """
+        pasta_saida = Path(pasta_saida)
+        esperados = [(arquivo, pasta_saida / f"{Path(arquivo).stem}.pdf") for arquivo in arquivos_docx]
+
+        if self.modo != MODO_LINHA_COMANDO:
+            faltantes = []
+            for arquivo, arquivo_pdf in esperados:
+                try:
+                    self.converter(arquivo, arquivo_pdf)
+                except Exception as e:
+                    logger.warning(f"{Path(arquivo).name}: {str(e)}")
+                    faltantes.append(arquivo)
+            return faltantes
+
+        # PDFs antigos sairiam como "gerados" na conferência
+        for _, arquivo_pdf in esperados:
+            if arquivo_pdf.exists():
+                arquivo_pdf.unlink()
+
+        worker = self._ociosos.get()
+        try:
+            self._preparar(worker)
+            worker.converter_lote(arquivos_docx, pasta_saida)
+        except Exception as e:
+            # Parte do bloco pode ter sido convertida antes da falha
+            logger.warning(f"Bloco LibreOffice ({len(arquivos_docx)} arquivos) falhou: {str(e)}")
+        finally:
+            self._ociosos.put(worker)
+
+        return [
+            arquivo for arquivo, arquivo_pdf in esperados
+            if not arquivo_pdf.exists() or arquivo_pdf.stat().st_size == 0
+        ]
+
+    def fechar(self):
+        """Encerra todos os processos e remove os perfis temporários"""
+        for worker in self._workers:
+            try:
+                worker.encerrar()
+            except Exception as e:
+                logger.warning(f"Falha ao encerrar LibreOffice {worker.nome}: {str(e)}")
+        if self._pasta_temporaria:
+            shutil.rmtree(self.pasta_perfis, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
@@ -0,0 +1,168 @@
+"""
+Organizador de lotes de RPCM
+
+Este módulo é responsável por:
+1. Interpretar listas de números de preço (coladas ou digitadas)
+2. Verificar quais números estão presentes em uma pasta de lote
+3. Copiar os PDFs solicitados da pasta banco para a pasta do lote
+"""
+
+from pathlib import Path
+import logging
+import re
+import shutil
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_lista_numeros(texto: str) -> list:
+    """
+    Extrai os números de preço de um texto livre
+
+    Aceita qualquer combinação de vírgula, ponto-e-vírgula, quebras de linha,
+    tabs ou espaços como separador. Itens não numéricos são ignorados.
+
+    Args:
+        texto: Texto com os números (ex: "400006, 400009\\n400010")
+
+    Returns:
+        Lista de números (strings) na ordem em que aparecem
+    """
+    return [item for item in re.split(r'[,;\s]+', texto) if re.match(r'^\d+$', item)]
+
+
+def extrair_numero_arquivo(nome_arquivo: str) -> str:
+    """
+    Extrai o número do início do nome do arquivo
+
+    re.match é mais robusto: lida com espaços iniciais, BOM e outros
+    caracteres invisíveis no início do nome.
+
+    Returns:
+        Número encontrado ou "" se o nome não começa com dígitos
+    """
+    match = re.match(r'^\s*(\d+)', nome_arquivo)
+    return match.group(1) if match else ""
+
+
+def listar_pdfs(pasta: Path) -> list:
+    """Lista os PDFs da pasta (iterdir + suffix.lower() é mais confiável que glob no Windows)"""
+    return [
+        f for f in Path(pasta).iterdir()
+        if f.is_file() and f.suffix.lower() == '.pdf'
+    ]
+
+
+def verificar_lote(pasta_destino: Path, numeros: Iterable[str]) -> dict:
+    """
+    Compara os números solicitados com os PDFs presentes na pasta do lote
+
+    Args:
+        pasta_destino: Pasta do lote
+        numeros: Números solicitados
+
+    Returns:
+        dict com: 'total_arquivos', 'numeros_encontrados' (set), 'solicitados' (set),
+        'conformes', 'ausentes', 'excedentes' (listas ordenadas) e
+        'repetidos' ({numero: [arquivos]})
+
+    Raises:
+        FileNotFoundError: Se a pasta não existe
+    """
+    pasta_destino = Path(pasta_destino)
+    if not pasta_destino.exists():
+        raise FileNotFoundError(f"Pasta de destino não existe: {pasta_destino}")
+
+    arquivos_encontrados = listar_pdfs(pasta_destino)
+    mapa_numeros_arquivos = {}
+
+    for arquivo in arquivos_encontrados:
+        numero = extrair_numero_arquivo(arquivo.stem)
+        if numero:
+            mapa_numeros_arquivos.setdefault(numero, []).append(arquivo.name)
+
+    numeros_encontrados = set(mapa_numeros_arquivos)
+    solicitados = {str(num).strip() for num in numeros}
+
+    return {
+        'total_arquivos': len(arquivos_encontrados),
+        'numeros_encontrados': numeros_encontrados,
+        'solicitados': solicitados,
+        'conformes': sorted(solicitados & numeros_encontrados),
+        'ausentes': sorted(solicitados - numeros_encontrados),
+        'excedentes': sorted(numeros_encontrados - solicitados),
+        'repetidos': {
+            num: arqs for num, arqs in sorted(mapa_numeros_arquivos.items()) if len(arqs) > 1
+        }
+    }
+
+
+def copiar_lote(
+    pasta_origem: Path,
+    pasta_destino: Path,
+    numeros: Iterable[str],
+    callback_arquivo: Optional[callable] = None
+) -> dict:
+    """
+    Copia da pasta banco para a pasta do lote os PDFs cujos números foram solicitados
+
+    Args:
+        pasta_origem: Pasta banco com todos os PDFs
+        pasta_destino: Pasta do lote (criada se não existir)
+        numeros: Números solicitados
+        callback_arquivo: Função callback(nome_arquivo, erro) chamada a cada
+                          cópia; erro é None em caso de sucesso
+
+    Returns:
+        dict com: 'total_origem', 'copiados', 'numeros_copiados' (set),
+        'nao_encontrados' (lista ordenada), 'erros' (lista de mensagens)
+
+    Raises:
+        FileNotFoundError: Se a pasta de origem não existe
+    """
+    pasta_origem = Path(pasta_origem)
+    pasta_destino = Path(pasta_destino)
+
+    if not pasta_origem.exists():
+        raise FileNotFoundError(f"Pasta de origem não existe: {pasta_origem}")
+
+    pasta_destino.mkdir(parents=True, exist_ok=True)
+
+    solicitados = {str(num).strip() for num in numeros}
+    arquivos_encontrados = listar_pdfs(pasta_origem)
+
+    resultado = {
+        'total_origem': len(arquivos_encontrados),
+        'copiados': 0,
+        'numeros_copiados': set(),
+        'nao_encontrados': [],
+        'erros': []
+    }
+
+    for arquivo in arquivos_encontrados:
+        numero = extrair_numero_arquivo(arquivo.stem)
+        if numero not in solicitados:
+            continue
+
+        try:
+            shutil.copy2(str(arquivo), str(pasta_destino / arquivo.name))
+            resultado['copiados'] += 1
+            resultado['numeros_copiados'].add(numero)
+            erro = None
+        except Exception as e:
+            erro = str(e)
+            resultado['erros'].append(f"{arquivo.name}: {erro}")
+            logger.error(f"Erro ao copiar {arquivo.name}: {erro}")
+
+        if callback_arquivo:
+            callback_arquivo(arquivo.name, erro)
+
+    resultado['nao_encontrados'] = sorted(solicitados - resultado['numeros_copiados'])
+
+    logger.info(
+        f"Lote organizado: {resultado['copiados']} copiados, "
+        f"{len(resultado['nao_encontrados'])} não encontrados"
+    )
+
+    return resultado
@@ -0,0 +1,260 @@
+"""
+Índice invertido persistente de números → arquivos DOCX
+
+Este módulo é responsável por:
+1. Extrair os números (sequências de dígitos) do texto de cada DOCX de uma pasta
+2. Guardar em SQLite (na pasta de configuração do aplicativo, um banco por
+   pasta de documentos) quais arquivos/partes contêm cada número
+3. Atualizar o índice de forma incremental (só arquivos com mtime/tamanho novos)
+4. Responder quais arquivos podem conter alguma chave de um mapeamento
+"""
+
+from pathlib import Path
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import zipfile
+from typing import Optional
+
+from src.core.number_replacer import (
+    PARTES_TEXTO,
+    MultiPatternReplacer,
+    extrair_texto_bruto
+)
+from src.utils.config_manager import ConfigManager
+
+logger = logging.getLogger(__name__)
+
+PASTA_INDICES = ConfigManager.CONFIG_FILE.parent / 'indices_numeros'
+
+_REGEX_NUMERO = re.compile(r'\d+')
+
+# Versão do conteúdo indexado (PRAGMA user_version). Incrementar quando a
+# extração dos números mudar: bancos de outra versão são refeitos do zero.
+# 2: texto só dos <w:t> (sem <w:delText>/<w:instrText>)
+VERSAO_ESQUEMA = 2
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    id INTEGER PRIMARY KEY,
+    nome TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tamanho INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ocorrencias (
+    numero TEXT NOT NULL,
+    arquivo_id INTEGER NOT NULL REFERENCES arquivos(id) ON DELETE CASCADE,
+    parte TEXT NOT NULL,
+    PRIMARY KEY (numero, arquivo_id, parte)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ocorrencias_arquivo ON ocorrencias(arquivo_id);
+"""
+
+
+def extrair_numeros_docx(arquivo: Path) -> dict:
+    """
+    Extrai os números de cada parte de texto de um DOCX
+
+    Returns:
+        dict {nome_da_parte: set(numeros)}
+    """
+    numeros = {}
+    with zipfile.ZipFile(str(arquivo)) as pacote:
+        for nome in pacote.namelist():
+            if PARTES_TEXTO.match(nome):
+                encontrados = set(_REGEX_NUMERO.findall(extrair_texto_bruto(pacote.read(nome))))
+                if encontrados:
+                    numeros[nome] = encontrados
+    return numeros
+
+
+class NumberIndex:
+    """
+    Índice SQLite dos números presentes nos DOCX de uma pasta
+
+    O índice guarda, por arquivo, o mtime e o tamanho da última leitura;
+    atualizar() só relê arquivos novos ou alterados e remove os apagados.
+    Como um número da planilha pode aparecer dentro de uma sequência maior
+    de dígitos, a busca compara as chaves com os números indexados pelo
+    mesmo autômato da substituição, e não por igualdade.
+    """
+
+    SALVAR_A_CADA = 200
+
+    def __init__(self, caminho_db: Path):
+        """
+        Args:
+            caminho_db: Arquivo SQLite (criado se não existir)
+        """
+        self.caminho_db = Path(caminho_db)
+        self._conexao = sqlite3.connect(str(self.caminho_db))
+        self._conexao.execute("PRAGMA foreign_keys = ON")
+
+        versao = self._conexao.execute("PRAGMA user_version").fetchone()[0]
+        if versao != VERSAO_ESQUEMA:
+            if versao:
+                logger.info(f"Índice de números na versão {versao}; refazendo ({self.caminho_db.name})")
+            self._conexao.executescript(
+                "DROP TABLE IF EXISTS ocorrencias; DROP TABLE IF EXISTS arquivos;"
+            )
+        self._conexao.executescript(_ESQUEMA)
+        self._conexao.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+    @staticmethod
+    def caminho_da_pasta(pasta: Path, pasta_indices: Path = PASTA_INDICES) -> Path:
+        """
+        Banco do índice de uma pasta de documentos, em pasta_indices
+
+        O nome leva o hash do caminho absoluto da pasta (normalizado, no
+        Windows, para maiúsculas/minúsculas), de modo que pastas homônimas
+        em lugares diferentes não dividem o índice.
+        """
+        caminho = os.path.normcase(str(Path(pasta).resolve()))
+        chave = hashlib.sha1(caminho.encode('utf-8')).hexdigest()[:16]
+        return Path(pasta_indices) / f"{Path(pasta).resolve().name}_{chave}.sqlite"
+
+    @classmethod
+    def da_pasta(cls, pasta: Path, pasta_indices: Path = PASTA_INDICES) -> 'NumberIndex':
+        """Abre (ou cria) o índice da pasta, guardado fora dela (ver caminho_da_pasta)"""
+        caminho_db = cls.caminho_da_pasta(pasta, pasta_indices)
+        caminho_db.parent.mkdir(parents=True, exist_ok=True)
+        return cls(caminho_db)
+
+    def fechar(self):
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def atualizar(self, pasta: Path, callback_progresso: Optional[callable] = None) -> dict:
+        """
+        Sincroniza o índice com os DOCX da pasta
+
+        Args:
+            pasta: Pasta com os arquivos .docx
+            callback_progresso: Função callback(atual, total) chamada a cada
+                                arquivo relido
+
+        Returns:
+            dict com: 'total', 'atualizados', 'removidos', 'erros' (mensagens)
+        """
+        arquivos = {arquivo.name: arquivo for arquivo in Path(pasta).glob("*.docx")}
+        registrados = {
+            nome: (id_arquivo, mtime_ns, tamanho)
+            for id_arquivo, nome, mtime_ns, tamanho in self._conexao.execute(
+                "SELECT id, nome, mtime_ns, tamanho FROM arquivos"
+            )
+        }
+
+        resultado = {'total': len(arquivos), 'atualizados': 0, 'removidos': 0, 'erros': []}
+
+        with self._conexao:
+            removidos = [(registrados[nome][0],) for nome in registrados.keys() - arquivos.keys()]
+            self._conexao.executemany("DELETE FROM arquivos WHERE id = ?", removidos)
+            resultado['removidos'] = len(removidos)
+
+        pendentes = []
+        for nome, arquivo in sorted(arquivos.items()):
+            estado = arquivo.stat()
+            registro = registrados.get(nome)
+            if registro and registro[1:] == (estado.st_mtime_ns, estado.st_size):
+                continue
+            pendentes.append((arquivo, estado))
+
+        # Gravação em transações de SALVAR_A_CADA arquivos: uma interrupção
+        # perde no máximo esse trecho, que é relido na próxima atualização
+        with self._conexao:
+            for idx, (arquivo, estado) in enumerate(pendentes, 1):
+                self._conexao.execute("DELETE FROM arquivos WHERE nome = ?", (arquivo.name,))
+
+                try:
+                    numeros = extrair_numeros_docx(arquivo)
+                except Exception as e:
+                    # Fica fora do índice: continua sendo tratado como candidato
+                    resultado['erros'].append(f"{arquivo.name}: {str(e)}")
+                    logger.warning(f"Não foi possível indexar {arquivo.name}: {str(e)}")
+                    continue
+
+                id_arquivo = self._conexao.execute(
+                    "INSERT INTO arquivos (nome, mtime_ns, tamanho) VALUES (?, ?, ?)",
+                    (arquivo.name, estado.st_mtime_ns, estado.st_size)
+                ).lastrowid
+                self._conexao.executemany(
+                    "INSERT INTO ocorrencias (numero, arquivo_id, parte) VALUES (?, ?, ?)",
+                    [
+                        (numero, id_arquivo, parte)
+                        for parte, encontrados in numeros.items()
+                        for numero in encontrados
+                    ]
+                )
+                resultado['atualizados'] += 1
+
+                if idx % self.SALVAR_A_CADA == 0:
+                    self._conexao.commit()
+                if callback_progresso:
+                    callback_progresso(idx, len(pendentes))
+
+        logger.info(
+            f"Índice atualizado: {resultado['atualizados']} relidos, "
+            f"{resultado['removidos']} removidos, {resultado['total']} arquivos"
+        )
+        return resultado
+
+    def arquivos_indexados(self) -> set:
+        """Nomes de todos os arquivos presentes no índice"""
+        return {nome for (nome,) in self._conexao.execute("SELECT nome FROM arquivos")}
+
+    def arquivos_candidatos(self, substituidor: MultiPatternReplacer) -> Optional[set]:
+        """
+        Nomes dos arquivos indexados que contêm ao menos uma chave do mapeamento
+
+        Arquivos fora do índice (ex: que falharam na leitura) não aparecem
+        aqui e devem ser tratados como candidatos pelo chamador.
+
+        Returns:
+            set de nomes, ou None se o mapeamento tem chaves não numéricas
+            (que o índice não cobre); nesse caso todos os arquivos são candidatos
+        """
+        if not all(chave.isdigit() for chave in substituidor.mapeamento):
+            return None
+
+        numeros = [
+            numero for (numero,) in self._conexao.execute("SELECT DISTINCT numero FROM ocorrencias")
+            if substituidor.encontrar(numero)
+        ]
+        return self._arquivos_com_numeros(numeros)
+
+    def arquivos_com_numero(self, numero: str) -> dict:
+        """
+        Arquivos e partes onde um número aparece exatamente
+
+        Returns:
+            dict {nome_arquivo: [partes]}
+        """
+        resultado = {}
+        for nome, parte in self._conexao.execute(
+            "SELECT a.nome, o.parte FROM ocorrencias o JOIN arquivos a ON a.id = o.arquivo_id "
+            "WHERE o.numero = ? ORDER BY a.nome, o.parte",
+            (str(numero),)
+        ):
+            resultado.setdefault(nome, []).append(parte)
+        return resultado
+
+    def _arquivos_com_numeros(self, numeros: list) -> set:
+        self._conexao.execute("CREATE TEMP TABLE IF NOT EXISTS busca (numero TEXT PRIMARY KEY)")
+        with self._conexao:
+            self._conexao.execute("DELETE FROM busca")
+            self._conexao.executemany("INSERT OR IGNORE INTO busca VALUES (?)", ((n,) for n in numeros))
+
+        return {
+            nome for (nome,) in self._conexao.execute(
+                "SELECT DISTINCT a.nome FROM busca b "
+                "JOIN ocorrencias o ON o.numero = b.numero "
+                "JOIN arquivos a ON a.id = o.arquivo_id"
+            )
+        }
@@ -0,0 +1,1307 @@
+"""
+Substituição de números de preço em documentos Word (processamento em lote)
+
+Este módulo é responsável por:
+1. Carregar o mapeamento CodSAP → CodServico de uma planilha
+2. Compilar o mapeamento em um autômato de busca múltipla (Aho-Corasick)
+3. Substituir os números nos <w:t> dos documentos DOCX direto no pacote zip
+4. Processar todos os DOCX de uma pasta, gravando o relatório por arquivo
+   (CSV/JSON Lines) durante o processamento
+"""
+
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import bisect
+import copy
+import csv
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_WNS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+WNS_T = _WNS + 't'
+WNS_P = _WNS + 'p'
+# Elementos de run que quebram a continuidade do texto de um parágrafo
+_QUEBRAS_TEXTO = (_WNS + 'tab', _WNS + 'br', _WNS + 'cr')
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Partes do pacote que contêm texto visível: corpo (incluindo caixas de
+# texto, que ficam dentro de w:txbxContent), cabeçalhos, rodapés e notas
+PARTES_TEXTO = re.compile(r'^word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$')
+
+# Prefixo(s) declarados para o namespace WordprocessingML em uma parte; o
+# conteúdo dos <prefixo:t> alimenta o pré-filtro que evita o parse XML de
+# partes sem nenhum número candidato
+_REGEX_PREFIXO_WNS = re.compile(
+    rb'xmlns(?::([\w.-]+))?="' + re.escape(_WNS[1:-1].encode()) + rb'"'
+)
+_regex_texto_por_prefixos = {}
+
+# Diários de substituição (originais das partes alteradas, para desfazer)
+PASTA_DIARIOS = '.diarios_substituicao'
+MAXIMO_DIARIOS = 20
+_ESTADO_DIARIO = 'estado.json'
+
+# Cabeçalho local de um membro zip: assinatura + campos fixos (30 bytes)
+_TAMANHO_CABECALHO_LOCAL = 30
+_FLAG_DESCRITOR_DADOS = 0x08
+
+# Estado interno do ZipFile de destino usado pela cópia sem recompressão;
+# faltando algum (outra versão do Python), os membros são copiados pela
+# API pública (leitura + writestr)
+_ATRIBUTOS_COPIA_BRUTA = ('fp', 'start_dir', '_didModify', 'NameToInfo', 'filelist')
+
+
+def _localizar_colunas_mapeamento(colunas) -> tuple:
+    """
+    Encontra as colunas de busca (CodSAP) e substituição (CodServico)
+
+    Raises:
+        ValueError: Se as colunas não forem encontradas
+    """
+    col_busca = None
+    col_subst = None
+
+    for col in colunas:
+        col_lower = str(col).lower()
+        if 'codsap' in col_lower:
+            col_busca = col
+        elif 'codservico' in col_lower or 'cod_servico' in col_lower:
+            col_subst = col
+
+    if col_busca is None or col_subst is None:
+        raise ValueError("Planilha deve conter colunas 'CodSAP' e 'CodServico'")
+
+    return col_busca, col_subst
+
+
+def _ler_colunas_mapeamento(caminho: str):
+    """
+    Lê apenas as colunas CodSAP e CodServico, como texto
+
+    Arquivos .xlsx são percorridos em modo somente leitura (openpyxl), sem
+    materializar a planilha inteira.
+
+    Returns:
+        DataFrame com as colunas 'busca' e 'subst' (valores brutos)
+    """
+    import pandas as pd
+
+    sufixo = Path(caminho).suffix.lower()
+
+    if sufixo == '.csv':
+        col_busca, col_subst = _localizar_colunas_mapeamento(pd.read_csv(caminho, nrows=0).columns)
+        df = pd.read_csv(caminho, usecols=[col_busca, col_subst], dtype=str)
+        return pd.DataFrame({'busca': df[col_busca], 'subst': df[col_subst]})
+
+    if sufixo == '.xls':
+        # Formato antigo não suporta leitura em streaming
+        col_busca, col_subst = _localizar_colunas_mapeamento(pd.read_excel(caminho, nrows=0).columns)
+        df = pd.read_excel(caminho, usecols=[col_busca, col_subst], dtype=str)
+        return pd.DataFrame({'busca': df[col_busca], 'subst': df[col_subst]})
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        # Primeira planilha, como o pd.read_excel (a ativa pode ser outra)
+        linhas = workbook.worksheets[0].iter_rows(values_only=True)
+        cabecalho = [str(valor).strip() if valor is not None else '' for valor in next(linhas, ())]
+        col_busca, col_subst = _localizar_colunas_mapeamento(cabecalho)
+        pos_busca = cabecalho.index(col_busca)
+        pos_subst = cabecalho.index(col_subst)
+
+        busca = []
+        subst = []
+        for linha in linhas:
+            busca.append(linha[pos_busca] if pos_busca < len(linha) else None)
+            subst.append(linha[pos_subst] if pos_subst < len(linha) else None)
+    finally:
+        workbook.close()
+
+    return pd.DataFrame({'busca': busca, 'subst': subst}, dtype=object)
+
+
+def _normalizar_codigos(serie):
+    """
+    Converte códigos para texto limpo, com operações vetorizadas
+
+    Valores ausentes viram '', espaços são removidos e códigos numéricos lidos
+    como float ('400726.0') voltam ao formato inteiro ('400726').
+    """
+    serie = serie.where(serie.notna(), '').astype(str).str.strip()
+    return serie.str.replace(r'^(\d+)\.0+$', r'\1', regex=True)
+
+
+def analisar_planilha_mapeamento(caminho: str) -> dict:
+    """
+    Carrega a planilha de mapeamento e relata duplicidades e conflitos
+
+    Lê apenas as colunas CodSAP e CodServico como texto e normaliza os
+    códigos de forma vetorizada, de modo que códigos gravados como número
+    ('400726.0') casem com o texto dos documentos. Linhas repetidas são
+    descartadas; se o mesmo CodSAP aponta para CodServico diferentes, vale a
+    primeira linha e o caso é relatado em 'conflitos'.
+
+    Args:
+        caminho: Arquivo .xlsx, .xls ou .csv com as colunas CodSAP e CodServico
+
+    Returns:
+        dict com: 'mapeamento' (lista de tuplas (CodSAP, CodServico) sem
+        chaves repetidas, na ordem da planilha), 'linhas' (linhas com os dois
+        códigos preenchidos), 'ignoradas' (linhas com algum código vazio),
+        'duplicados' (linhas repetidas descartadas) e 'conflitos'
+        ({CodSAP: [CodServico, ...]} na ordem em que aparecem)
+
+    Raises:
+        ValueError: Se as colunas não forem encontradas
+    """
+    df = _ler_colunas_mapeamento(caminho)
+    df['busca'] = _normalizar_codigos(df['busca'])
+    df['subst'] = _normalizar_codigos(df['subst'])
+
+    preenchidas = (df['busca'] != '') & (df['subst'] != '')
+    df = df[preenchidas]
+
+    unicos = df.drop_duplicates()
+    por_chave = unicos.groupby('busca', sort=False)['subst']
+    conflitantes = por_chave.size()
+    conflitantes = conflitantes[conflitantes > 1].index
+
+    conflitos = {}
+    if len(conflitantes):
+        for busca, grupo in unicos[unicos['busca'].isin(conflitantes)].groupby('busca', sort=False):
+            conflitos[busca] = grupo['subst'].tolist()
+        logger.warning(
+            f"{len(conflitos)} CodSAP com CodServico diferentes na planilha; "
+            f"usada a primeira ocorrência de cada"
+        )
+
+    primeiros = unicos.drop_duplicates(subset='busca', keep='first')
+
+    return {
+        'mapeamento': list(zip(primeiros['busca'], primeiros['subst'])),
+        'linhas': int(preenchidas.sum()),
+        'ignoradas': int((~preenchidas).sum()),
+        'duplicados': len(df) - len(unicos),
+        'conflitos': conflitos
+    }
+
+
+def carregar_mapeamento_planilha(caminho: str) -> list:
+    """
+    Carrega a planilha e extrai os pares (numero_busca, numero_substituir)
+
+    Ver analisar_planilha_mapeamento para o relatório de duplicidades e
+    conflitos.
+
+    Args:
+        caminho: Arquivo .xlsx, .xls ou .csv com as colunas CodSAP e CodServico
+
+    Returns:
+        Lista de tuplas (CodSAP, CodServico), uma por CodSAP
+
+    Raises:
+        ValueError: Se as colunas não forem encontradas
+    """
+    return analisar_planilha_mapeamento(caminho)['mapeamento']
+
+
+class MultiPatternReplacer:
+    """
+    Substituidor multipadrão baseado em autômato Aho-Corasick
+
+    O autômato é construído uma única vez a partir do mapeamento e encontra
+    todas as ocorrências de todos os números em um único passe pelo texto,
+    independentemente da quantidade de linhas da planilha.
+
+    As substituições são aplicadas simultaneamente: entre ocorrências que se
+    sobrepõem vence a que começa primeiro e, empatando, a mais longa. O texto
+    substituído nunca é reprocessado, então mapeamentos encadeados (A→B, B→C)
+    não geram cascata A→C como acontecia com str.replace sequencial.
+    """
+
+    def __init__(self, mapeamento: list):
+        """
+        Args:
+            mapeamento: Lista de tuplas (numero_busca, numero_substituir). Se o
+                        mesmo número aparecer mais de uma vez, vale o primeiro
+        """
+        self.mapeamento = {}
+        for numero_busca, numero_substituir in mapeamento:
+            if numero_busca and numero_busca not in self.mapeamento:
+                self.mapeamento[numero_busca] = numero_substituir
+
+        # Nó 0 é a raiz. Para cada nó: transições, link de falha, padrão que
+        # termina nele (ou None) e próximo nó terminal na cadeia de falhas
+        self._transicoes = [{}]
+        self._falha = [0]
+        self._padrao = [None]
+        self._saida = [0]
+
+        for numero_busca in self.mapeamento:
+            self._inserir(numero_busca)
+        self._construir_falhas()
+
+        # Identifica o mapeamento efetivo (ex: para validar uma prévia)
+        self.assinatura = hashlib.sha256(
+            json.dumps(list(self.mapeamento.items())).encode('utf-8')
+        ).hexdigest()
+
+    def _inserir(self, padrao: str):
+        no = 0
+        for caractere in padrao:
+            proximo = self._transicoes[no].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._padrao.append(None)
+                self._saida.append(0)
+                self._transicoes[no][caractere] = proximo
+            no = proximo
+        self._padrao[no] = padrao
+
+    def _construir_falhas(self):
+        """Calcula os links de falha e de saída em largura (BFS)"""
+        fila = list(self._transicoes[0].values())
+        for no in fila:
+            for caractere, filho in self._transicoes[no].items():
+                fila.append(filho)
+
+                falha = self._falha[no]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falha[filho] = destino if destino != filho else 0
+
+                alvo = self._falha[filho]
+                self._saida[filho] = alvo if self._padrao[alvo] else self._saida[alvo]
+
+    def __len__(self) -> int:
+        return len(self.mapeamento)
+
+    def encontrar(self, texto: str) -> list:
+        """
+        Localiza as ocorrências que serão substituídas
+
+        Returns:
+            Lista de tuplas (inicio, fim, numero_busca) em ordem, sem sobreposição
+        """
+        transicoes = self._transicoes
+        falha = self._falha
+        padrao = self._padrao
+        saida = self._saida
+
+        candidatos = []
+        no = 0
+        for posicao, caractere in enumerate(texto):
+            while no and caractere not in transicoes[no]:
+                no = falha[no]
+            no = transicoes[no].get(caractere, 0)
+
+            terminal = no if padrao[no] else saida[no]
+            while terminal:
+                encontrado = padrao[terminal]
+                candidatos.append((posicao + 1 - len(encontrado), posicao + 1, encontrado))
+                terminal = saida[terminal]
+
+        if not candidatos:
+            return candidatos
+
+        # Mais à esquerda primeiro; no mesmo início, o mais longo
+        candidatos.sort(key=lambda c: (c[0], -c[1]))
+        ocorrencias = []
+        fim_anterior = 0
+        for candidato in candidatos:
+            if candidato[0] >= fim_anterior:
+                ocorrencias.append(candidato)
+                fim_anterior = candidato[1]
+        return ocorrencias
+
+    def substituir(self, texto: str) -> tuple:
+        """
+        Aplica todas as substituições no texto em um único passe
+
+        Returns:
+            Tupla (texto_novo, {numero_busca: quantidade}); o dict fica vazio
+            se nada foi substituído
+        """
+        ocorrencias = self.encontrar(texto)
+        if not ocorrencias:
+            return texto, {}
+
+        partes = []
+        contagem = {}
+        ultimo = 0
+        for inicio, fim, numero_busca in ocorrencias:
+            partes.append(texto[ultimo:inicio])
+            partes.append(self.mapeamento[numero_busca])
+            contagem[numero_busca] = contagem.get(numero_busca, 0) + 1
+            ultimo = fim
+        partes.append(texto[ultimo:])
+
+        return ''.join(partes), contagem
+
+
+def compilar_mapeamento(mapeamento: Union[list, MultiPatternReplacer]) -> MultiPatternReplacer:
+    """Compila o mapeamento (lista de pares) no autômato; aceita um já compilado"""
+    if isinstance(mapeamento, MultiPatternReplacer):
+        return mapeamento
+    return MultiPatternReplacer(mapeamento)
+
+
+def _regex_texto_xml(dados: bytes):
+    """Regex do conteúdo dos <w:t> da parte, com o prefixo que ela declara"""
+    prefixos = tuple(sorted(set(_REGEX_PREFIXO_WNS.findall(dados)))) or (b'w',)
+    regex = _regex_texto_por_prefixos.get(prefixos)
+    if regex is None:
+        tags = b'|'.join(re.escape(prefixo + b':t' if prefixo else b't') for prefixo in prefixos)
+        regex = re.compile(rb'<(' + tags + rb')(?:\s[^>]*)?(?<!/)>([^<]*)</\1>')
+        _regex_texto_por_prefixos[prefixos] = regex
+    return regex
+
+
+def extrair_texto_bruto(dados: bytes) -> str:
+    """
+    Extrai o texto dos <w:t> de uma parte XML direto dos bytes, sem montar árvore XML
+
+    O conteúdo dos <w:t> é concatenado, na ordem do documento, sem
+    separador: cada trecho visto por _mapear_trechos aparece inteiro no
+    resultado. Texto excluído em revisões (<w:delText>) e códigos de campo
+    (<w:instrText>) ficam de fora, pois não são substituídos e, no meio de
+    um número, o esconderiam do pré-filtro.
+    """
+    from xml.sax.saxutils import unescape
+
+    texto = b''.join(conteudo for _, conteudo in _regex_texto_xml(dados).findall(dados))
+    return unescape(texto.decode('utf-8', errors='replace'))
+
+
+def possui_candidatos(dados: bytes, substituidor: MultiPatternReplacer) -> bool:
+    """
+    Pré-filtro: indica se uma parte XML pode conter algum número do mapeamento
+
+    Varre o texto bruto da parte (extrair_texto_bruto) com o autômato. Não
+    gera falsos negativos para o que a substituição encontraria, apenas
+    falsos positivos baratos (ex: fronteira de parágrafos ou de tabulações).
+    """
+    texto = extrair_texto_bruto(dados)
+    return bool(texto) and bool(substituidor.encontrar(texto))
+
+
+def _mapear_trechos(raiz) -> list:
+    """
+    Agrupa os <w:t> de uma parte em trechos de texto contínuo
+
+    Um trecho é a sequência de <w:t> de um mesmo parágrafo, em ordem, sem
+    tabulação ou quebra de linha entre eles. Parágrafos de caixas de texto
+    aninhadas formam trechos próprios.
+
+    Returns:
+        Lista de listas de elementos <w:t>
+    """
+    trechos = []
+    atual = []
+    paragrafo_atual = None
+
+    for elem in raiz.iter(WNS_T, *_QUEBRAS_TEXTO):
+        if elem.tag != WNS_T:
+            paragrafo_atual = None
+            continue
+
+        paragrafo = next(elem.iterancestors(WNS_P), None)
+        if paragrafo is not paragrafo_atual:
+            if atual:
+                trechos.append(atual)
+            atual = []
+            paragrafo_atual = paragrafo
+        atual.append(elem)
+
+    if atual:
+        trechos.append(atual)
+    return trechos
+
+
+def _aplicar_ocorrencias(nos: list, ocorrencias: list, mapeamento: dict) -> dict:
+    """
+    Aplica ocorrências já localizadas no texto concatenado dos <w:t> de um trecho
+
+    O texto substituto fica no nó onde a ocorrência começa; os caracteres
+    restantes da ocorrência são removidos dos nós seguintes. A formatação de
+    cada run é preservada.
+
+    Args:
+        nos: Elementos <w:t> do trecho
+        ocorrencias: Lista de (inicio, fim, numero_busca) sem sobreposição
+        mapeamento: dict {numero_busca: numero_substituir}
+
+    Returns:
+        {numero_busca: quantidade}
+    """
+    textos = [no.text or '' for no in nos]
+
+    # Posição inicial de cada nó no texto concatenado
+    inicios = []
+    posicao = 0
+    for texto in textos:
+        inicios.append(posicao)
+        posicao += len(texto)
+
+    novos = [[] for _ in nos]
+
+    def copiar_original(de, ate):
+        indice = bisect.bisect_right(inicios, de) - 1
+        while de < ate:
+            fim_no = inicios[indice] + len(textos[indice])
+            if de < fim_no:
+                corte = min(ate, fim_no)
+                novos[indice].append(textos[indice][de - inicios[indice]:corte - inicios[indice]])
+                de = corte
+            indice += 1
+
+    contagem = {}
+    cursor = 0
+    for inicio, fim, numero_busca in ocorrencias:
+        copiar_original(cursor, inicio)
+        indice = bisect.bisect_right(inicios, inicio) - 1
+        novos[indice].append(mapeamento[numero_busca])
+        contagem[numero_busca] = contagem.get(numero_busca, 0) + 1
+        cursor = fim
+    copiar_original(cursor, posicao)
+
+    for no, texto_original, partes in zip(nos, textos, novos):
+        texto_novo = ''.join(partes)
+        if texto_novo == texto_original:
+            continue
+        no.text = texto_novo
+        # Espaços que passaram a ficar na borda do nó precisam ser preservados
+        if texto_novo != texto_novo.strip():
+            no.set(_XML_SPACE, 'preserve')
+
+    return contagem
+
+
+def _texto_trecho(nos: list) -> str:
+    return ''.join(no.text or '' for no in nos)
+
+
+def _ler_parte(dados: bytes):
+    from lxml import etree
+
+    parser = etree.XMLParser(resolve_entities=False, huge_tree=True)
+    return etree.fromstring(dados, parser)
+
+
+def _classificar_local(nome_parte: str, no) -> str:
+    """Local de uma ocorrência: cabecalho, rodape, notas, caixa_texto, tabela ou corpo"""
+    if '/header' in nome_parte:
+        return 'cabecalho'
+    if '/footer' in nome_parte:
+        return 'rodape'
+    if 'notes' in nome_parte:
+        return 'notas'
+
+    tags = {ancestral.tag for ancestral in no.iterancestors(_WNS + 'txbxContent', _WNS + 'tbl')}
+    if _WNS + 'txbxContent' in tags:
+        return 'caixa_texto'
+    if _WNS + 'tbl' in tags:
+        return 'tabela'
+    return 'corpo'
+
+
+def _localizar_em_parte(nome_parte: str, dados: bytes, substituidor: MultiPatternReplacer) -> tuple:
+    """
+    Localiza (sem alterar) as ocorrências em uma parte XML
+
+    Returns:
+        Tupla (ocorrencias_por_trecho, locais), onde ocorrencias_por_trecho é
+        uma lista de (indice_do_trecho, [(inicio, fim, numero_busca)]) e
+        locais é {numero_busca: {local: quantidade}}
+    """
+    ocorrencias_por_trecho = []
+    locais = {}
+
+    for indice, nos in enumerate(_mapear_trechos(_ler_parte(dados))):
+        ocorrencias = substituidor.encontrar(_texto_trecho(nos))
+        if not ocorrencias:
+            continue
+
+        ocorrencias_por_trecho.append((indice, ocorrencias))
+        local = _classificar_local(nome_parte, nos[0])
+        for _, _, numero_busca in ocorrencias:
+            por_local = locais.setdefault(numero_busca, {})
+            por_local[local] = por_local.get(local, 0) + 1
+
+    return ocorrencias_por_trecho, locais
+
+
+def _substituir_em_parte(
+    dados: bytes,
+    substituidor: MultiPatternReplacer,
+    ocorrencias_por_trecho: Optional[list] = None
+) -> tuple:
+    """
+    Aplica as substituições nos <w:t> de uma parte XML
+
+    Faz um passe linear por trecho de parágrafo, de modo que números
+    divididos entre vários runs (revisão, ortografia, formatação) também
+    são encontrados.
+
+    Args:
+        ocorrencias_por_trecho: Ocorrências já localizadas por uma prévia
+                                (_localizar_em_parte); dispensa a busca
+
+    Returns:
+        Tupla (bytes_novos ou None se nada mudou, {numero_busca: quantidade})
+    """
+    from lxml import etree
+
+    raiz = _ler_parte(dados)
+    trechos = _mapear_trechos(raiz)
+
+    if ocorrencias_por_trecho is None:
+        ocorrencias_por_trecho = []
+        for indice, nos in enumerate(trechos):
+            ocorrencias = substituidor.encontrar(_texto_trecho(nos))
+            if ocorrencias:
+                ocorrencias_por_trecho.append((indice, ocorrencias))
+
+    contagem = {}
+    for indice, ocorrencias in ocorrencias_por_trecho:
+        aplicadas = _aplicar_ocorrencias(trechos[indice], ocorrencias, substituidor.mapeamento)
+        for numero, quantidade in aplicadas.items():
+            contagem[numero] = contagem.get(numero, 0) + quantidade
+
+    if not contagem:
+        return None, contagem
+
+    standalone = True if b'standalone="yes"' in dados[:200] else None
+    return etree.tostring(
+        raiz, encoding='UTF-8', xml_declaration=True, standalone=standalone
+    ), contagem
+
+
+def _copia_bruta_suportada(zip_destino: zipfile.ZipFile) -> bool:
+    """
+    Indica se _copiar_membro_bruto pode escrever neste ZipFile
+
+    Além dos atributos, confere que o arquivo está posicionado no fim dos
+    dados (start_dir), como a cópia pressupõe.
+    """
+    if not all(hasattr(zip_destino, atributo) for atributo in _ATRIBUTOS_COPIA_BRUTA):
+        return False
+    try:
+        return zip_destino.fp.tell() == zip_destino.start_dir
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _copiar_membro(
+    arquivo_origem,
+    zip_origem: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    zip_destino: zipfile.ZipFile
+):
+    """Copia um membro sem recompressão quando possível; senão, pela API pública"""
+    if _copia_bruta_suportada(zip_destino):
+        _copiar_membro_bruto(arquivo_origem, info, zip_destino)
+    else:
+        novo = copy.copy(info)
+        novo.extra = b''
+        zip_destino.writestr(novo, zip_origem.read(info))
+
+
+def _copiar_membro_bruto(arquivo_origem, info: zipfile.ZipInfo, zip_destino: zipfile.ZipFile):
+    """
+    Copia um membro para o zip de destino sem descomprimir/recomprimir
+
+    Lê os bytes já comprimidos direto do arquivo de origem e grava um novo
+    cabeçalho local com o mesmo CRC e tamanhos.
+    """
+    arquivo_origem.seek(info.header_offset)
+    cabecalho = arquivo_origem.read(_TAMANHO_CABECALHO_LOCAL)
+    tamanho_nome, tamanho_extra = struct.unpack('<HH', cabecalho[26:30])
+    arquivo_origem.seek(info.header_offset + _TAMANHO_CABECALHO_LOCAL + tamanho_nome + tamanho_extra)
+    dados_comprimidos = arquivo_origem.read(info.compress_size)
+
+    novo = copy.copy(info)
+    # CRC e tamanhos já são conhecidos: dispensa o descritor após os dados
+    novo.flag_bits &= ~_FLAG_DESCRITOR_DADOS
+    novo.extra = b''
+
+    saida = zip_destino.fp
+    novo.header_offset = saida.tell()
+    saida.write(novo.FileHeader())
+    saida.write(dados_comprimidos)
+
+    zip_destino.filelist.append(novo)
+    zip_destino.NameToInfo[novo.filename] = novo
+    zip_destino.start_dir = saida.tell()
+    zip_destino._didModify = True
+
+
+def _registrar_no_diario(diario: Path, arquivo: Path, originais: dict, caminho_novo: str):
+    """
+    Grava no diário as partes originais de um arquivo prestes a ser substituído
+
+    Cada arquivo alterado tem sua própria entrada (um zip pequeno com apenas
+    as partes XML que mudaram), o que permite gravar a partir de vários
+    processos sem coordenação. O estado (mtime, tamanho) do arquivo novo é
+    guardado para que o desfazer não sobrescreva edições posteriores.
+    """
+    estado = os.stat(caminho_novo)
+    entrada = Path(diario) / f"{arquivo.name}.zip"
+    entrada_temp = entrada.with_suffix('.tmp')
+
+    with zipfile.ZipFile(entrada_temp, 'w', zipfile.ZIP_DEFLATED) as registro:
+        registro.writestr(_ESTADO_DIARIO, json.dumps({
+            'arquivo': arquivo.name,
+            'mtime_ns': estado.st_mtime_ns,
+            'tamanho': estado.st_size
+        }))
+        for nome, dados in originais.items():
+            registro.writestr(nome, dados)
+
+    os.replace(entrada_temp, entrada)
+
+
+def _reescrever_docx(
+    arquivo: Path,
+    partes_alteradas: dict,
+    originais: Optional[dict] = None,
+    diario: Optional[Path] = None
+):
+    """
+    Regrava o pacote trocando apenas as partes alteradas
+
+    Os demais membros (imagens, fontes, estilos) são copiados byte a byte.
+    O novo pacote é escrito e sincronizado em disco em um arquivo temporário
+    na mesma pasta e só então substitui o original (rename atômico): uma
+    interrupção nunca deixa um DOCX truncado.
+
+    Args:
+        originais: Bytes originais das partes alteradas (gravados no diário)
+        diario: Pasta do diário; a entrada é gravada antes da troca do arquivo
+    """
+    arquivo = Path(arquivo)
+    descritor, caminho_temp = tempfile.mkstemp(
+        prefix=f".{arquivo.stem}_", suffix=".tmp", dir=str(arquivo.parent)
+    )
+    os.close(descritor)
+
+    try:
+        with open(arquivo, 'rb') as origem, zipfile.ZipFile(origem) as zip_origem, \
+                zipfile.ZipFile(caminho_temp, 'w') as zip_destino:
+            for info in zip_origem.infolist():
+                if info.filename in partes_alteradas:
+                    novo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    novo.compress_type = info.compress_type
+                    novo.external_attr = info.external_attr
+                    zip_destino.writestr(novo, partes_alteradas[info.filename])
+                else:
+                    _copiar_membro(origem, zip_origem, info, zip_destino)
+
+        with open(caminho_temp, 'rb+') as temp:
+            os.fsync(temp.fileno())
+
+        if diario is not None:
+            _registrar_no_diario(diario, arquivo, originais, caminho_temp)
+
+        os.replace(caminho_temp, arquivo)
+    except BaseException:
+        if os.path.exists(caminho_temp):
+            os.remove(caminho_temp)
+        raise
+
+
+def _estado_arquivo(arquivo: Path) -> tuple:
+    estado = os.stat(arquivo)
+    return estado.st_mtime_ns, estado.st_size
+
+
+def localizar_numeros_docx(
+    arquivo: Path,
+    mapeamento: Union[list, MultiPatternReplacer]
+) -> dict:
+    """
+    Localiza, sem alterar o arquivo, as ocorrências de cada número em um DOCX
+
+    Args:
+        arquivo: Documento .docx
+        mapeamento: Lista de tuplas ou autômato já compilado
+
+    Returns:
+        dict com: 'estado' ((mtime_ns, tamanho) do arquivo lido),
+        'ocorrencias' ({numero_busca: {local: quantidade}}, com local em
+        corpo/tabela/caixa_texto/cabecalho/rodape/notas) e 'partes'
+        ({parte: ocorrências por trecho}, reaproveitado por
+        substituir_numeros_docx)
+    """
+    substituidor = compilar_mapeamento(mapeamento)
+    localizacao = {'estado': _estado_arquivo(arquivo), 'ocorrencias': {}, 'partes': {}}
+
+    with zipfile.ZipFile(str(arquivo)) as pacote:
+        for nome in pacote.namelist():
+            if not PARTES_TEXTO.match(nome):
+                continue
+
+            dados = pacote.read(nome)
+            if not possui_candidatos(dados, substituidor):
+                continue
+
+            ocorrencias_por_trecho, locais = _localizar_em_parte(nome, dados, substituidor)
+            if not ocorrencias_por_trecho:
+                continue
+
+            localizacao['partes'][nome] = ocorrencias_por_trecho
+            for numero, por_local in locais.items():
+                total_numero = localizacao['ocorrencias'].setdefault(numero, {})
+                for local, quantidade in por_local.items():
+                    total_numero[local] = total_numero.get(local, 0) + quantidade
+
+    return localizacao
+
+
+def substituir_numeros_docx(
+    arquivo: Path,
+    mapeamento: Union[list, MultiPatternReplacer],
+    localizacao: Optional[dict] = None,
+    diario: Optional[Path] = None
+) -> dict:
+    """
+    Aplica todas as substituições do mapeamento em um DOCX e salva se houve alteração
+
+    Trabalha direto no pacote zip, sem python-docx: percorre os <w:t> do
+    corpo, caixas de texto, cabeçalhos, rodapés e notas, e regrava apenas as
+    partes que mudaram. Imagens e demais membros são copiados sem
+    recompressão. O texto de cada parágrafo é percorrido uma única vez pelo
+    autômato, inclusive números divididos entre runs.
+
+    Partes sem nenhum número candidato (pré-filtro sobre os bytes) nem chegam
+    a ser interpretadas como XML; um arquivo sem candidatos é descartado sem
+    nenhum parse.
+
+    Args:
+        arquivo: Documento .docx (sobrescrito no lugar)
+        mapeamento: Lista de tuplas (numero_busca, numero_substituir) ou
+                    autômato já compilado (preferível em lote)
+        localizacao: Resultado de localizar_numeros_docx com o mesmo
+                     mapeamento. Se o arquivo não mudou desde então, as
+                     ocorrências localizadas são aplicadas sem nova busca
+        diario: Pasta de diário (criar_diario); guarda as partes originais
+                para que a alteração possa ser desfeita (desfazer_diario)
+
+    Returns:
+        dict {numero_busca: quantidade} com as substituições feitas; vazio
+        (falso) se nenhum número foi encontrado
+    """
+    substituidor = compilar_mapeamento(mapeamento)
+
+    if localizacao is not None and localizacao['estado'] != _estado_arquivo(arquivo):
+        localizacao = None
+    if localizacao is not None and not localizacao['partes']:
+        return {}
+
+    partes_alteradas = {}
+    originais = {}
+    contagem = {}
+
+    with zipfile.ZipFile(str(arquivo)) as pacote:
+        for nome in pacote.namelist():
+            if localizacao is not None:
+                if nome not in localizacao['partes']:
+                    continue
+                dados = pacote.read(nome)
+                dados_novos, encontrados = _substituir_em_parte(
+                    dados, substituidor, localizacao['partes'][nome]
+                )
+            else:
+                if not PARTES_TEXTO.match(nome):
+                    continue
+
+                dados = pacote.read(nome)
+                if not possui_candidatos(dados, substituidor):
+                    continue
+
+                dados_novos, encontrados = _substituir_em_parte(dados, substituidor)
+
+            if dados_novos is not None:
+                partes_alteradas[nome] = dados_novos
+                originais[nome] = dados
+                for numero, quantidade in encontrados.items():
+                    contagem[numero] = contagem.get(numero, 0) + quantidade
+
+    # Salvar arquivo apenas se houve substituição
+    if partes_alteradas:
+        _reescrever_docx(Path(arquivo), partes_alteradas, originais, diario)
+
+    return contagem
+
+
+# Autômato recebido uma única vez por processo do pool (ver _inicializar_worker)
+_substituidor_worker = None
+
+
+def _inicializar_worker(substituidor: MultiPatternReplacer):
+    """Initializer do pool: guarda o autômato compilado no processo"""
+    global _substituidor_worker
+    _substituidor_worker = substituidor
+
+
+def _processar_arquivo(arquivo: Path, extra: tuple, substituidor: MultiPatternReplacer) -> tuple:
+    """
+    Substitui em um arquivo sem propagar exceções
+
+    Args:
+        extra: Tupla (localizacao ou None, pasta do diário ou None)
+
+    Returns:
+        Tupla (contagem, erro); erro é None em caso de sucesso
+    """
+    localizacao, diario = extra
+    try:
+        return substituir_numeros_docx(arquivo, substituidor, localizacao, diario), None
+    except Exception as e:
+        return {}, str(e)
+
+
+def _localizar_arquivo(arquivo: Path, _, substituidor: MultiPatternReplacer) -> tuple:
+    """
+    Localiza as ocorrências de um arquivo sem propagar exceções
+
+    Returns:
+        Tupla (localizacao, erro); erro é None em caso de sucesso
+    """
+    try:
+        return localizar_numeros_docx(arquivo, substituidor), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _cronometrar(funcao: callable, arquivo: Path, extra, substituidor: MultiPatternReplacer) -> tuple:
+    """Executa funcao(arquivo, extra, substituidor) e acrescenta a duração em ms ao resultado"""
+    inicio = time.perf_counter()
+    resultado, erro = funcao(arquivo, extra, substituidor)
+    return resultado, erro, (time.perf_counter() - inicio) * 1000
+
+
+def _executar_tarefa_worker(tarefa: tuple) -> tuple:
+    """Executa funcao(arquivo, extra) em um processo do pool com o autômato do processo"""
+    funcao, arquivo, extra = tarefa
+    return _cronometrar(funcao, arquivo, extra, _substituidor_worker)
+
+
+def _iterar_resultados(
+    funcao: callable,
+    tarefas: list,
+    substituidor: MultiPatternReplacer,
+    workers: int
+):
+    """
+    Executa funcao(arquivo, extra, substituidor) para cada tarefa (arquivo, extra)
+    e gera (arquivo, resultado, erro, tempo_ms) na ordem das tarefas
+
+    Com workers > 1 as tarefas são distribuídas em blocos entre processos;
+    cada processo recebe o autômato uma única vez, no initializer. O tempo
+    é medido no processo que executou a tarefa.
+    """
+    if workers <= 1 or len(tarefas) <= 1:
+        for arquivo, extra in tarefas:
+            yield (arquivo, *_cronometrar(funcao, arquivo, extra, substituidor))
+        return
+
+    # ~4 blocos por worker equilibra carga sem excesso de comunicação
+    tamanho_bloco = max(1, math.ceil(len(tarefas) / (workers * 4)))
+    logger.info(f"Execução paralela: {workers} processos, blocos de até {tamanho_bloco}")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_inicializar_worker,
+        initargs=(substituidor,)
+    ) as executor:
+        resultados = executor.map(
+            _executar_tarefa_worker,
+            [(funcao, arquivo, extra) for arquivo, extra in tarefas],
+            chunksize=tamanho_bloco
+        )
+        for (arquivo, _), (resultado, erro, tempo_ms) in zip(tarefas, resultados):
+            yield arquivo, resultado, erro, tempo_ms
+
+
+def _descartados_pelo_indice(pasta: Path, substituidor: MultiPatternReplacer) -> set:
+    """
+    Nomes dos arquivos que o índice garante não conter nenhuma chave
+
+    Falhas no índice (pasta de configuração inacessível, banco corrompido)
+    não impedem o processamento: apenas nenhum arquivo é descartado.
+    """
+    import sqlite3
+    from src.core.number_index import NumberIndex
+
+    try:
+        with NumberIndex.da_pasta(pasta) as indice:
+            indice.atualizar(pasta)
+            candidatos = indice.arquivos_candidatos(substituidor)
+            if candidatos is None:
+                return set()
+            return indice.arquivos_indexados() - candidatos
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Índice de números indisponível, processando todos os arquivos: {str(e)}")
+        return set()
+
+
+class BatchReport:
+    """
+    Relatório por arquivo da substituição em lote, gravado durante o processamento
+
+    Cada registrar() escreve uma linha no CSV (separador ';', abre direto no
+    Excel) e/ou no JSON Lines, sem acumular nada em memória: o relatório de
+    um lote de qualquer tamanho ocupa o mesmo espaço, e uma interrupção
+    preserva as linhas dos arquivos já processados.
+
+    Colunas: arquivo, status ('processado', 'desconsiderado', 'erro'),
+    substituicoes (total), numeros ({numero_busca: quantidade}; no CSV como
+    "400726=2, 400727=1"), tempo_ms e erro.
+    """
+
+    COLUNAS = ['arquivo', 'status', 'substituicoes', 'numeros', 'tempo_ms', 'erro']
+    FORMATOS = ('csv', 'jsonl')
+
+    def __init__(self, caminho_base: Path, formatos: tuple = FORMATOS):
+        """
+        Args:
+            caminho_base: Caminho sem extensão (ex: pasta/relatorio_20260101);
+                          cada formato acrescenta a sua
+            formatos: Formatos a gravar ('csv' e/ou 'jsonl')
+        """
+        formatos_invalidos = set(formatos) - set(self.FORMATOS)
+        if formatos_invalidos or not formatos:
+            raise ValueError(f"Formatos de relatório inválidos: {formatos}")
+
+        caminho_base = Path(caminho_base)
+        self.caminhos = {}
+        self.linhas = 0
+        self._csv = None
+        self._jsonl = None
+
+        # Arquivos com buffer de linha: cada registro chega ao disco ao
+        # terminar o arquivo correspondente
+        if 'csv' in formatos:
+            self.caminhos['csv'] = caminho_base.with_name(caminho_base.name + '.csv')
+            self._arquivo_csv = open(self.caminhos['csv'], 'w', newline='', encoding='utf-8-sig', buffering=1)
+            self._csv = csv.writer(self._arquivo_csv, delimiter=';')
+            self._csv.writerow(self.COLUNAS)
+        if 'jsonl' in formatos:
+            self.caminhos['jsonl'] = caminho_base.with_name(caminho_base.name + '.jsonl')
+            self._jsonl = open(self.caminhos['jsonl'], 'w', encoding='utf-8', buffering=1)
+
+    def registrar(
+        self,
+        arquivo: str,
+        status: str,
+        contagem: Optional[dict] = None,
+        tempo_ms: float = 0.0,
+        erro: Optional[str] = None
+    ):
+        """Grava a linha de um arquivo"""
+        contagem = contagem or {}
+        total = sum(contagem.values())
+        tempo_ms = round(tempo_ms, 1)
+
+        if self._csv is not None:
+            numeros = ", ".join(f"{numero}={quantidade}" for numero, quantidade in contagem.items())
+            self._csv.writerow([arquivo, status, total, numeros, tempo_ms, erro or ''])
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps({
+                'arquivo': arquivo,
+                'status': status,
+                'substituicoes': total,
+                'numeros': contagem,
+                'tempo_ms': tempo_ms,
+                'erro': erro
+            }, ensure_ascii=False) + '\n')
+        self.linhas += 1
+
+    def fechar(self):
+        if self._csv is not None:
+            self._arquivo_csv.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+
+def previsualizar_pasta(
+    pasta: Path,
+    mapeamento: Union[list, MultiPatternReplacer],
+    callback_progresso: Optional[callable] = None,
+    workers: int = 1,
+    usar_indice: bool = False
+) -> dict:
+    """
+    Simula a substituição em lote sem alterar nenhum arquivo
+
+    O resultado pode ser passado a processar_pasta(previa=...): arquivos que
+    não mudaram desde a prévia são aplicados com as ocorrências já
+    localizadas, sem nova busca, e os sem ocorrência nem são abertos.
+
+    Args:
+        pasta: Pasta com os arquivos .docx
+        mapeamento: Lista de tuplas ou autômato já compilado
+        callback_progresso: Função callback(atual, total, total_erros)
+        workers: Número de processos (1 = sequencial na thread atual)
+        usar_indice: Consulta o índice persistente da pasta (NumberIndex)
+
+    Returns:
+        dict com: 'pasta', 'assinatura' (do mapeamento), 'total',
+        'arquivos' ({nome: localização}, ver localizar_numeros_docx),
+        'com_ocorrencias' e 'desconsiderados' (listas de nomes),
+        'ocorrencias' (totais {numero_busca: {local: quantidade}}) e 'erros'
+    """
+    arquivos = sorted(Path(pasta).glob("*.docx"))
+    substituidor = compilar_mapeamento(mapeamento)
+
+    previa = {
+        'pasta': str(Path(pasta).resolve()),
+        'assinatura': substituidor.assinatura,
+        'total': len(arquivos),
+        'arquivos': {},
+        'com_ocorrencias': [],
+        'desconsiderados': [],
+        'ocorrencias': {},
+        'erros': []
+    }
+
+    descartados = _descartados_pelo_indice(pasta, substituidor) if usar_indice else set()
+    tarefas = [(arquivo, None) for arquivo in arquivos if arquivo.name not in descartados]
+    localizacoes = _iterar_resultados(_localizar_arquivo, tarefas, substituidor, workers)
+
+    for idx, arquivo in enumerate(arquivos, 1):
+        if arquivo.name in descartados:
+            localizacao = {'estado': _estado_arquivo(arquivo), 'ocorrencias': {}, 'partes': {}}
+            erro = None
+        else:
+            _, localizacao, erro, _ = next(localizacoes)
+
+        if erro is not None:
+            previa['erros'].append(f"{arquivo.name}: {erro}")
+        else:
+            previa['arquivos'][arquivo.name] = localizacao
+            if localizacao['ocorrencias']:
+                previa['com_ocorrencias'].append(arquivo.name)
+                for numero, por_local in localizacao['ocorrencias'].items():
+                    total_numero = previa['ocorrencias'].setdefault(numero, {})
+                    for local, quantidade in por_local.items():
+                        total_numero[local] = total_numero.get(local, 0) + quantidade
+            else:
+                previa['desconsiderados'].append(arquivo.name)
+
+        if callback_progresso:
+            callback_progresso(idx, previa['total'], len(previa['erros']))
+
+    logger.info(
+        f"Prévia concluída: {len(previa['com_ocorrencias'])} arquivos com ocorrências, "
+        f"{len(previa['desconsiderados'])} desconsiderados, {len(previa['erros'])} erros"
+    )
+
+    return previa
+
+
+def processar_pasta(
+    pasta: Path,
+    mapeamento: Union[list, MultiPatternReplacer],
+    callback_progresso: Optional[callable] = None,
+    workers: int = 1,
+    usar_indice: bool = False,
+    previa: Optional[dict] = None,
+    diario: Optional[Path] = None,
+    relatorio: Optional[BatchReport] = None
+) -> dict:
+    """
+    Substitui os números em todos os DOCX de uma pasta
+
+    Args:
+        pasta: Pasta com os arquivos .docx
+        mapeamento: Lista de tuplas (numero_busca, numero_substituir) ou
+                    autômato já compilado
+        callback_progresso: Função callback(atual, total, total_erros) chamada
+                            após cada arquivo, na thread que chamou esta função
+        workers: Número de processos (1 = sequencial na thread atual)
+        usar_indice: Consulta o índice persistente da pasta (NumberIndex),
+                     atualizado de forma incremental, e abre apenas os
+                     arquivos que contêm alguma chave do mapeamento
+        previa: Resultado de previsualizar_pasta para a mesma pasta e o mesmo
+                mapeamento; é ignorada se algum dos dois mudou
+        diario: Pasta de diário (criar_diario) para poder desfazer o lote
+        relatorio: BatchReport que recebe uma linha por arquivo assim que ele
+                   termina (status, substituições por número, tempo, erro)
+
+    Returns:
+        dict com: 'total', 'processados', 'desconsiderados' (nomes sem nenhum
+        número da planilha, descartados pelo pré-filtro sem parse XML) e
+        'erros' (mensagens "arquivo: erro"), sempre na ordem dos arquivos
+    """
+    arquivos = sorted(Path(pasta).glob("*.docx"))
+    # Autômato construído uma única vez para a pasta inteira
+    substituidor = compilar_mapeamento(mapeamento)
+
+    resultado = {
+        'total': len(arquivos),
+        'processados': 0,
+        'desconsiderados': [],
+        'erros': []
+    }
+
+    localizacoes = {}
+    if previa is not None:
+        if (previa['assinatura'] == substituidor.assinatura
+                and previa['pasta'] == str(Path(pasta).resolve())):
+            localizacoes = previa['arquivos']
+        else:
+            logger.warning("Prévia ignorada: pasta ou mapeamento diferentes")
+
+    descartados = _descartados_pelo_indice(pasta, substituidor) if usar_indice else set()
+    tarefas = [
+        (arquivo, (localizacoes.get(arquivo.name), diario))
+        for arquivo in arquivos if arquivo.name not in descartados
+    ]
+    resultados_arquivos = _iterar_resultados(_processar_arquivo, tarefas, substituidor, workers)
+
+    for idx, arquivo in enumerate(arquivos, 1):
+        if arquivo.name in descartados:
+            # O índice garante que nenhum número do mapeamento está no arquivo
+            contagem, erro, tempo_ms = {}, None, 0.0
+        else:
+            _, contagem, erro, tempo_ms = next(resultados_arquivos)
+
+        if erro is not None:
+            status = 'erro'
+            resultado['erros'].append(f"{arquivo.name}: {erro}")
+            logger.error(f"Erro ao processar {arquivo.name}: {erro}")
+        elif contagem:
+            status = 'processado'
+            resultado['processados'] += 1
+        else:
+            # Arquivo desconsiderado (nenhum número encontrado)
+            status = 'desconsiderado'
+            resultado['desconsiderados'].append(arquivo.name)
+
+        if relatorio is not None:
+            relatorio.registrar(arquivo.name, status, contagem, tempo_ms, erro)
+
+        if callback_progresso:
+            callback_progresso(idx, resultado['total'], len(resultado['erros']))
+
+    logger.info(
+        f"Substituição em lote concluída: {resultado['processados']} processados, "
+        f"{len(resultado['desconsiderados'])} desconsiderados, {len(resultado['erros'])} erros"
+    )
+
+    return resultado
+
+
+def criar_diario(pasta: Path) -> Path:
+    """
+    Cria a pasta de diário de um novo lote de substituição
+
+    Os diários ficam em <pasta>/.diarios_substituicao/<data_hora>; apenas os
+    MAXIMO_DIARIOS mais recentes são mantidos.
+
+    Returns:
+        Caminho do diário criado
+    """
+    raiz = Path(pasta) / PASTA_DIARIOS
+    diario = raiz / datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    diario.mkdir(parents=True)
+
+    for antigo in listar_diarios(pasta)[MAXIMO_DIARIOS:]:
+        shutil.rmtree(antigo, ignore_errors=True)
+
+    return diario
+
+
+def listar_diarios(pasta: Path) -> list:
+    """Diários da pasta, do mais recente para o mais antigo"""
+    raiz = Path(pasta) / PASTA_DIARIOS
+    if not raiz.is_dir():
+        return []
+    return sorted((d for d in raiz.iterdir() if d.is_dir()), reverse=True)
+
+
+def desfazer_diario(
+    diario: Path,
+    forcar: bool = False,
+    callback_progresso: Optional[callable] = None
+) -> dict:
+    """
+    Desfaz um lote de substituição restaurando as partes originais gravadas
+
+    Só as partes XML registradas são regravadas (imagens e demais membros
+    são copiados byte a byte), com a mesma escrita atômica da substituição.
+    Arquivos modificados depois do lote são preservados, a menos que
+    forcar=True. Se tudo foi restaurado, o diário é removido.
+
+    Args:
+        diario: Pasta do diário (ver listar_diarios)
+        forcar: Restaura mesmo arquivos alterados depois do lote
+        callback_progresso: Função callback(atual, total)
+
+    Returns:
+        dict com: 'total', 'restaurados', 'ignorados' e 'erros' (mensagens)
+    """
+    diario = Path(diario)
+    pasta = diario.parent.parent
+    entradas = sorted(diario.glob("*.zip"))
+
+    resultado = {'total': len(entradas), 'restaurados': 0, 'ignorados': [], 'erros': []}
+
+    for idx, entrada in enumerate(entradas, 1):
+        try:
+            with zipfile.ZipFile(entrada) as registro:
+                estado = json.loads(registro.read(_ESTADO_DIARIO))
+                originais = {
+                    nome: registro.read(nome)
+                    for nome in registro.namelist() if nome != _ESTADO_DIARIO
+                }
+
+            arquivo = pasta / estado['arquivo']
+            estado_atual = _estado_arquivo(arquivo)
+            if not forcar and estado_atual != (estado['mtime_ns'], estado['tamanho']):
+                resultado['ignorados'].append(f"{arquivo.name}: alterado depois do lote")
+            else:
+                _reescrever_docx(arquivo, originais)
+                entrada.unlink()
+                resultado['restaurados'] += 1
+        except Exception as e:
+            resultado['erros'].append(f"{entrada.stem}: {str(e)}")
+            logger.error(f"Erro ao desfazer {entrada.stem}: {str(e)}")
+
+        if callback_progresso:
+            callback_progresso(idx, resultado['total'])
+
+    if not resultado['ignorados'] and not resultado['erros']:
+        shutil.rmtree(diario, ignore_errors=True)
+
+    logger.info(
+        f"Lote desfeito: {resultado['restaurados']} restaurados, "
+        f"{len(resultado['ignorados'])} ignorados, {len(resultado['erros'])} erros"
+    )
+
+    return resultado
@@ -0,0 +1,955 @@
+"""
+Conversão de documentos DOCX para PDF
+
+Este módulo é responsável por:
+1. Detectar os métodos de conversão disponíveis (LibreOffice, Aspose.Words, Word COM)
+2. Converter um arquivo com fallback automático entre os métodos
+3. Converter listas de arquivos reaproveitando a instância do Word
+4. Converter em paralelo com um pool de processos LibreOffice (LibreOfficePool)
+5. Converter em blocos com uma chamada ao LibreOffice por bloco
+6. Converter em paralelo com um pool de instâncias do Word (WordPool)
+7. Ordenar o fallback pelo desempenho medido de cada método (BackendRegistry)
+8. Converter apenas os DOCX novos ou alterados de uma pasta (ConversionManifest)
+"""
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import ctypes
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import subprocess
+from typing import Optional
+
+from src.core.conversion_backends import ARQUIVO_ESTATISTICAS, BackendRegistry, FunctionBackend
+from src.core.libreoffice_pool import DOCUMENTOS_POR_WORKER, LibreOfficePool
+from src.core.word_pool import DOCUMENTOS_POR_INSTANCIA, WordPool
+
+logger = logging.getLogger(__name__)
+
+# Importar bibliotecas de conversão
+try:
+    import win32com.client
+    WORD_COM_DISPONIVEL = True
+except ImportError:
+    WORD_COM_DISPONIVEL = False
+
+try:
+    import aspose.words as aw
+    ASPOSE_WORDS_DISPONIVEL = True
+except ImportError:
+    ASPOSE_WORDS_DISPONIVEL = False
+
+
+def encontrar_libreoffice() -> Optional[str]:
+    """Retorna o caminho do soffice nos locais padrão do Windows (ou no PATH), ou None"""
+    possible_paths = [
+        r"C:\Program Files\LibreOffice\program\soffice.exe",
+        r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+        r"C:\Users\{}\AppData\Local\Programs\LibreOffice\program\soffice.exe".format(
+            os.environ.get('USERNAME', '')
+        )
+    ]
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+# Verificar se LibreOffice está realmente disponível no sistema
+LIBREOFFICE_DISPONIVEL = encontrar_libreoffice() is not None
+
+# Cada processo LibreOffice ocupa um núcleo e algumas centenas de MB
+WORKERS_LIBREOFFICE = max(1, min(4, (os.cpu_count() or 1) // 2))
+
+# Documentos por chamada ao soffice no modo em blocos; a linha de comando do
+# Windows aceita ~32767 caracteres, então os blocos também são limitados
+# pelo tamanho somado dos caminhos
+TAMANHO_BLOCO_LIBREOFFICE = 200
+LIMITE_LINHA_COMANDO = 30000
+
+# Cada instância do Word é um processo WINWORD.EXE completo
+WORKERS_WORD = max(1, min(3, (os.cpu_count() or 1) // 2))
+
+
+def _dividir_em_blocos(arquivos: list, tamanho_bloco: int) -> list:
+    """Divide os arquivos em blocos de até tamanho_bloco itens e LIMITE_LINHA_COMANDO caracteres"""
+    blocos = []
+    bloco = []
+    caracteres = 0
+    for arquivo in arquivos:
+        tamanho = len(str(Path(arquivo).absolute())) + 3
+        if bloco and (len(bloco) >= tamanho_bloco or caracteres + tamanho > LIMITE_LINHA_COMANDO):
+            blocos.append(bloco)
+            bloco = []
+            caracteres = 0
+        bloco.append(arquivo)
+        caracteres += tamanho
+    if bloco:
+        blocos.append(bloco)
+    return blocos
+
+
+def _inicializar_com():
+    """Inicializa COM na thread atual (necessário para o Word COM)"""
+    try:
+        ctypes.windll.ole32.CoInitializeEx(None, 0)
+    except Exception:
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except Exception:
+            pass
+
+
+def _finalizar_com():
+    """Libera COM na thread atual"""
+    try:
+        ctypes.windll.ole32.CoUninitialize()
+    except Exception:
+        try:
+            import pythoncom
+            pythoncom.CoUninitialize()
+        except Exception:
+            pass
+
+
+def _log_padrao(mensagem, tipo="info"):
+    """Callback de log usado quando nenhum é fornecido"""
+    if tipo == "erro":
+        logger.error(mensagem)
+    else:
+        logger.info(mensagem)
+
+
+def _assinatura_arquivo(arquivo: Path) -> Optional[tuple]:
+    """(mtime_ns, tamanho) do arquivo, ou None se ele não existe"""
+    try:
+        estado = Path(arquivo).stat()
+    except OSError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+
+class ConversionManifest:
+    """
+    Manifesto de conversão gravado na pasta de saída (.manifesto_pdf.json)
+    
+    Registra, para cada PDF convertido com sucesso, o DOCX de origem com o
+    mtime, o tamanho e o hash SHA-256 do conteúdo. Em uma nova execução, um
+    DOCX com o mesmo mtime e tamanho (ou, se estes mudaram, com o mesmo hash,
+    ex: arquivo copiado sem alteração) e cujo PDF existe pode ser pulado.
+    """
+    
+    NOME_ARQUIVO = '.manifesto_pdf.json'
+    SALVAR_A_CADA = 100
+    
+    def __init__(self, pasta_saida: Path):
+        """
+        Args:
+            pasta_saida: Pasta de saída dos PDFs
+        """
+        self.caminho = Path(pasta_saida) / self.NOME_ARQUIVO
+        self._pendentes_salvar = 0
+        self._arquivos = {}
+        
+        if self.caminho.exists():
+            try:
+                with open(self.caminho, 'r', encoding='utf-8') as f:
+                    self._arquivos = json.load(f).get('arquivos', {})
+            except Exception as e:
+                logger.warning(f"Manifesto ilegível, será recriado: {e}")
+    
+    @staticmethod
+    def calcular_hash(arquivo: Path) -> str:
+        """SHA-256 do conteúdo do arquivo, lido em blocos"""
+        resumo = hashlib.sha256()
+        with open(arquivo, 'rb') as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                resumo.update(bloco)
+        return resumo.hexdigest()
+    
+    def esta_atualizado(self, arquivo_docx: Path, arquivo_pdf: Path) -> bool:
+        """Verifica se o PDF existe e foi convertido deste DOCX sem alterações desde então"""
+        entrada = self._arquivos.get(Path(arquivo_pdf).name)
+        if not entrada or entrada['origem'] != str(Path(arquivo_docx).resolve()):
+            return False
+        if not Path(arquivo_pdf).exists():
+            return False
+        
+        estado = Path(arquivo_docx).stat()
+        if (entrada['mtime_ns'], entrada['tamanho']) == (estado.st_mtime_ns, estado.st_size):
+            return True
+        if entrada['tamanho'] != estado.st_size or entrada['sha256'] != self.calcular_hash(arquivo_docx):
+            return False
+        
+        # Conteúdo igual com outro mtime: atualiza para não recalcular o hash
+        entrada['mtime_ns'] = estado.st_mtime_ns
+        self._pendentes_salvar += 1
+        return True
+    
+    def registrar(self, arquivo_docx: Path, arquivo_pdf: Path):
+        """Registra um PDF convertido com sucesso"""
+        estado = Path(arquivo_docx).stat()
+        self._arquivos[Path(arquivo_pdf).name] = {
+            'origem': str(Path(arquivo_docx).resolve()),
+            'mtime_ns': estado.st_mtime_ns,
+            'tamanho': estado.st_size,
+            'sha256': self.calcular_hash(arquivo_docx)
+        }
+        self._pendentes_salvar += 1
+        
+        if self._pendentes_salvar >= self.SALVAR_A_CADA:
+            self.salvar()
+    
+    def salvar(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+        temporario = self.caminho.with_suffix('.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': 1, 'arquivos': self._arquivos}, f, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+        self._pendentes_salvar = 0
+
+
+class DocxToPdfConverter:
+    """
+    Conversor DOCX → PDF com fallback automático entre métodos
+    
+    Ordem inicial de tentativa: LibreOffice > Aspose.Words > Word COM
+    (instância compartilhada) > Word COM (nova instância). Com o uso, o
+    BackendRegistry reordena a cadeia por tipo/tamanho de documento, a
+    partir da taxa de sucesso e da latência medidas (salvas entre sessões).
+    """
+    
+    def __init__(self, caminho_estatisticas: Optional[Path] = ARQUIVO_ESTATISTICAS):
+        """
+        Args:
+            caminho_estatisticas: JSON das estatísticas de conversão por
+                                  método (None = não persistir)
+        """
+        self.metodos_disponiveis = self.detectar_metodos()
+        self.registro = BackendRegistry(caminho_estatisticas)
+    
+    @staticmethod
+    def detectar_metodos() -> list:
+        """Detecta métodos de conversão disponíveis"""
+        metodos = []
+        
+        if LIBREOFFICE_DISPONIVEL:
+            metodos.append("libreoffice")
+        
+        if WORD_COM_DISPONIVEL:
+            metodos.append("word_com")
+        
+        if ASPOSE_WORDS_DISPONIVEL:
+            metodos.append("aspose")
+        
+        return metodos
+    
+    def _criar_word_instance(self):
+        """Cria uma instância NOVA do Word forçando novo processo (DispatchEx)"""
+        try:
+            # DispatchEx FORÇA criação de novo processo separado
+            # Não reutiliza instâncias existentes que podem estar em estado inválido
+            word = win32com.client.DispatchEx("Word.Application")
+        except Exception:
+            # Fallback: Dispatch normal
+            word = win32com.client.Dispatch("Word.Application")
+
+        # Configurar a instância - cada propriedade em try-except separado
+        try:
+            word.Visible = False
+        except Exception:
+            pass
+        try:
+            word.DisplayAlerts = 0  # wdAlertsNone
+        except Exception:
+            pass
+        try:
+            word.ScreenUpdating = False
+        except Exception:
+            pass
+
+        # CRÍTICO para fidelidade de bordas/linhas:
+        # O Word computa o layout (espessura de bordas, espaçamentos) com base nos
+        # DPI da impressora ativa. Se a impressora padrão for uma HP/etc. a 1200 DPI,
+        # as bordas ficam desproporcionais no PDF. Definir "Microsoft Print to PDF"
+        # garante que o layout use as métricas corretas para saída em PDF.
+        try:
+            word.ActivePrinter = "Microsoft Print to PDF"
+        except Exception:
+            pass
+
+        return word
+
+    def _converter_com_word_com(self, arquivo_docx, arquivo_pdf, word_instance=None):
+        """Converte usando Word COM - reutiliza instância se fornecida (muito mais rápido)"""
+        doc = None
+        word = word_instance
+        criou_instancia = False
+
+        try:
+            # Criar instância apenas se não foi fornecida (modo avulso)
+            if word is None:
+                word = self._criar_word_instance()
+                criou_instancia = True
+
+            arquivo_docx_path = Path(arquivo_docx).absolute()
+            arquivo_pdf_path = Path(arquivo_pdf).absolute()
+            arquivo_docx_abs = str(arquivo_docx_path)
+            arquivo_pdf_abs = str(arquivo_pdf_path)
+
+            if not arquivo_docx_path.exists():
+                raise Exception(f"Arquivo não encontrado: {arquivo_docx_abs}")
+
+            # Remover PDF anterior se existir
+            if arquivo_pdf_path.exists():
+                try:
+                    arquivo_pdf_path.unlink()
+                except Exception:
+                    pass
+
+            # Abrir em modo EDIÇÃO (ReadOnly=False) — garante layout completo
+            try:
+                doc = word.Documents.Open(
+                    arquivo_docx_abs,  # FileName
+                    False,             # ConfirmConversions
+                    False,             # ReadOnly = False
+                    False              # AddToRecentFiles
+                )
+            except Exception as e:
+                raise Exception(f"Erro ao abrir documento: {str(e)}")
+
+            # Forçar recálculo completo do layout com as métricas da impressora PDF
+            # Necessário para garantir que as bordas usem os DPI corretos
+            try:
+                doc.Repaginate()
+            except Exception:
+                pass
+
+            # Exportar para PDF com máxima fidelidade
+            # ExportAsFixedFormat com parâmetros explícitos dá mais controle que SaveAs2
+            try:
+                doc.ExportAsFixedFormat(
+                    OutputFileName=arquivo_pdf_abs,
+                    ExportFormat=17,          # wdExportFormatPDF
+                    OpenAfterExport=False,
+                    OptimizeFor=0,            # wdExportOptimizeForPrint
+                    Item=0,                   # wdExportDocumentContent
+                    IncludeDocProps=False,
+                    KeepIRM=True,
+                    CreateBookmarks=0,        # wdExportCreateNoBookmarks
+                    DocStructureTags=False,
+                    BitmapMissingFonts=False, # Manter vetorial — evita rasterização que duplica bordas
+                    UseISO19005_1=False       # Não PDF/A — mais fidelidade visual
+                )
+            except Exception as e:
+                raise Exception(f"Erro ao exportar PDF: {str(e)}")
+
+            # Validar resultado
+            if not arquivo_pdf_path.exists() or arquivo_pdf_path.stat().st_size == 0:
+                raise Exception("PDF não foi criado ou está vazio")
+
+            return True
+
+        except Exception as e:
+            raise Exception(f"Erro no Word COM: {str(e)}")
+
+        finally:
+            # Sempre fechar o documento
+            if doc is not None:
+                try:
+                    doc.Close(SaveChanges=False)
+                except Exception:
+                    pass
+            # Fechar Word apenas se criamos a instância aqui (modo avulso)
+            if criou_instancia and word is not None:
+                try:
+                    word.Quit()
+                except Exception:
+                    pass
+    
+    def _converter_com_aspose_fallback(self, arquivo_docx, arquivo_pdf):
+        """Fallback para Aspose quando Word COM falha"""
+        try:
+            doc = aw.Document(str(arquivo_docx))
+            
+            # Configurar opções de salvamento para máxima qualidade
+            save_options = aw.saving.PdfSaveOptions()
+            save_options.compliance = aw.saving.PdfCompliance.PDF17
+            save_options.optimize_output = True
+            save_options.preserve_form_fields = True
+            save_options.jpeg_quality = 100
+            
+            doc.save(str(arquivo_pdf), save_options)
+            return True
+        except Exception as e:
+            raise Exception(f"Erro no Aspose Fallback: {str(e)}")
+    
+    def _converter_com_aspose(self, arquivo_docx, arquivo_pdf):
+        """Converte usando Aspose com MÁXIMA FIDELIDADE ao documento original"""
+        try:
+            doc = aw.Document(str(arquivo_docx))
+            
+            # Configurações para MÁXIMA FIDELIDADE
+            save_options = aw.saving.PdfSaveOptions()
+            
+            # Renderização nativa (não convertida)
+            save_options.dml_rendering_mode = aw.saving.DmlRenderingMode.NATIVE
+            
+            # Preservar estrutura e layout exato
+            save_options.preserve_form_fields = True
+            save_options.export_document_structure = True
+            
+            # Qualidade máxima de imagem
+            save_options.jpeg_quality = 100
+            save_options.color_mode = aw.saving.ColorMode.RGB
+            
+            # PDF17 padrão (não PDF/A que comprime mais)
+            save_options.compliance = aw.saving.PdfCompliance.PDF17
+            
+            # Usar fontes nativas para precisão máxima
+            save_options.use_core_fonts = False
+            save_options.embed_full_fonts = True
+            
+            # Configurações avançadas para máxima fidelidade
+            save_options.export_page_set = aw.saving.ExportPageSet("0")  # Todas as páginas
+            
+            # Desabilitar otimizações que podem afetar fidelidade
+            save_options.optimize_output = False
+            
+            # Salvar com máxima fidelidade
+            doc.save(str(arquivo_pdf), save_options)
+            return True
+            
+        except Exception as e:
+            raise Exception(f"Erro no Aspose: {str(e)}")
+    
+    def _converter_com_libreoffice(self, arquivo_docx, arquivo_pdf):
+        """Converte usando LibreOffice via CLI - MELHOR fidelidade para documentos complexos"""
+        try:
+            libreoffice_path = encontrar_libreoffice()
+            
+            if not libreoffice_path:
+                raise Exception("LibreOffice não encontrado no sistema")
+            
+            # Caminho absoluto
+            arquivo_docx_abs = str(Path(arquivo_docx).absolute())
+            pasta_saida_abs = str(Path(arquivo_pdf).parent.absolute())
+            
+            # Comando LibreOffice: melhor fidelidade com opções específicas
+            comando = [
+                libreoffice_path,
+                "--headless",
+                "--convert-to", "pdf:writer_pdf_Export:{'FilterOptions':''}",
+                "--outdir", pasta_saida_abs,
+                arquivo_docx_abs
+            ]
+            
+            # Executar conversão
+            resultado = subprocess.run(
+                comando,
+                capture_output=True,
+                timeout=60,
+                text=True
+            )
+            
+            if resultado.returncode != 0:
+                raise Exception(f"LibreOffice falhou: {resultado.stderr}")
+            
+            # Validar se PDF foi criado
+            if not Path(arquivo_pdf).exists():
+                raise Exception("PDF não foi criado pelo LibreOffice")
+            
+            return True
+            
+        except Exception as e:
+            raise Exception(f"Erro no LibreOffice: {str(e)}")
+    
+    def _validar_pdf_fidelidade(self, arquivo_pdf):
+        """Valida se o PDF foi criado com fidelidade mínima"""
+        try:
+            if not Path(arquivo_pdf).exists():
+                return False, "PDF não existe"
+            
+            tamanho = Path(arquivo_pdf).stat().st_size
+            if tamanho == 0:
+                return False, "PDF vazio"
+            
+            if tamanho < 1000:  # Menos de 1KB é suspeito
+                return False, "PDF muito pequeno (possível corrupção)"
+            
+            return True, "OK"
+        except Exception as e:
+            return False, str(e)
+    
+
+    def _converter_com_aspose_reparando(self, arquivo_docx, arquivo_pdf):
+        """Aspose; se falhar, tenta reparar o DOCX (re-parse e regravação) e converter de novo"""
+        try:
+            return self._converter_com_aspose(arquivo_docx, arquivo_pdf)
+        except Exception as e:
+            try:
+                doc_reparado = aw.Document(str(arquivo_docx))
+                # Força re-parse do documento
+                doc_reparado.save(str(arquivo_docx), aw.SaveFormat.DOCX)
+                # Tenta converter novamente
+                doc_reparado = aw.Document(str(arquivo_docx))
+                doc_reparado.save(str(arquivo_pdf), aw.SaveFormat.PDF)
+                return True
+            except Exception as e_repair:
+                raise Exception(f"{str(e)} | Reparação: {str(e_repair)}")
+    
+    def criar_backends(self, word_instance=None, usar_libreoffice=True, pool_libreoffice=None, pool_word=None) -> list:
+        """
+        Backends de conversão disponíveis, na ordem padrão de fallback
+        
+        Com pool_libreoffice (LibreOfficePool) o LibreOffice é usado por um
+        dos processos do pool, o que é seguro entre threads; sem o pool, cada
+        chamada inicia um soffice e só é usada se usar_libreoffice. Da mesma
+        forma, pool_word (WordPool) substitui word_instance e pode ser usado
+        de qualquer thread.
+        """
+        backends = []
+        
+        # LibreOffice: MELHOR fidelidade para bordas e linhas
+        if pool_libreoffice is not None:
+            backends.append(FunctionBackend("LibreOffice", pool_libreoffice.converter, seguro_entre_threads=True))
+        elif usar_libreoffice and LIBREOFFICE_DISPONIVEL:
+            # Instâncias avulsas disputam o mesmo perfil: não é seguro em paralelo
+            backends.append(FunctionBackend("LibreOffice", self._converter_com_libreoffice))
+        
+        # Aspose: boa fidelidade, funciona sem instalação
+        if ASPOSE_WORDS_DISPONIVEL:
+            backends.append(FunctionBackend(
+                "Aspose.Words", self._converter_com_aspose_reparando, seguro_entre_threads=True
+            ))
+        
+        # Word COM: pelo pool (thread STA do pool) ou pela instância passada
+        if pool_word is not None:
+            backends.append(FunctionBackend("Microsoft Word COM", pool_word.converter, seguro_entre_threads=True))
+        elif word_instance is not None:
+            backends.append(FunctionBackend(
+                "Microsoft Word COM",
+                lambda arquivo_docx, arquivo_pdf: self._converter_com_word_com(arquivo_docx, arquivo_pdf, word_instance)
+            ))
+        
+        # Word COM nova instância: criada e fechada na própria thread
+        if WORD_COM_DISPONIVEL:
+            backends.append(FunctionBackend(
+                "Microsoft Word COM (nova instância)",
+                lambda arquivo_docx, arquivo_pdf: self._converter_com_word_com(arquivo_docx, arquivo_pdf, None),
+                seguro_entre_threads=True
+            ))
+        
+        return backends
+    
+    def converter_arquivo_com_fallback(
+        self, arquivo_docx, arquivo_pdf, word_instance=None, usar_libreoffice=True, pool_libreoffice=None,
+        pool_word=None, em_paralelo=False
+    ):
+        """
+        Converte com fallback automático entre métodos (ver criar_backends)
+        
+        A ordem começa em LibreOffice > Aspose > Word COM e é ajustada pelo
+        registro de desempenho: para cada tipo/tamanho de documento, o método
+        com menor custo esperado (latência / taxa de sucesso) vem primeiro.
+        Com em_paralelo, só entram métodos seguros entre threads.
+        
+        Returns:
+            Tupla (True, nome_do_metodo)
+        """
+        backends = self.criar_backends(word_instance, usar_libreoffice, pool_libreoffice, pool_word)
+        metodo_usado = self.registro.converter(
+            arquivo_docx, arquivo_pdf, backends, exigir_seguro_entre_threads=em_paralelo
+        )
+        return True, metodo_usado
+    
+    def _criar_pool_word(self, instancias: int, documentos_por_instancia: int) -> WordPool:
+        """WordPool com as instâncias configuradas por _criar_word_instance"""
+        return WordPool(
+            self._criar_word_instance,
+            lambda word, arquivo_docx, arquivo_pdf: self._converter_com_word_com(arquivo_docx, arquivo_pdf, word),
+            instancias,
+            documentos_por_instancia,
+            _inicializar_com,
+            _finalizar_com
+        )
+    
+    def _converter_arquivo_worker(self, args):
+        """Worker para conversão paralela com COM inicializado"""
+        idx, total, arquivo_docx, pasta_saida, pool_libreoffice, pool_word = args
+        
+        # CRÍTICO: Inicializar COM em cada thread
+        _inicializar_com()
+        
+        try:
+            arquivo_pdf = pasta_saida / f"{arquivo_docx.stem}.pdf"
+            # Em modo paralelo, só métodos seguros entre threads (LibreOffice
+            # apenas pelo pool: instâncias avulsas disputam o mesmo perfil)
+            sucesso, metodo_usado = self.converter_arquivo_com_fallback(
+                arquivo_docx, arquivo_pdf, None, pool_libreoffice=pool_libreoffice,
+                pool_word=pool_word, em_paralelo=True
+            )
+            
+            return {
+                'sucesso': True,
+                'arquivo': arquivo_docx.name,
+                'metodo': metodo_usado,
+                'idx': idx,
+                'total': total
+            }
+        except Exception as e:
+            return {
+                'sucesso': False,
+                'arquivo': arquivo_docx.name,
+                'erro': str(e),
+                'idx': idx,
+                'total': total
+            }
+        finally:
+            # Limpar COM
+            _finalizar_com()
+    
+    def conversao_sequencial(
+        self,
+        arquivos_docx: list,
+        pasta_saida: Path,
+        log: Optional[callable] = None,
+        progresso: Optional[callable] = None,
+        word_instance=None,
+        pool_libreoffice: Optional[LibreOfficePool] = None
+    ):
+        """
+        Conversão sequencial com instância única do Word (muito mais rápido)
+        
+        Args:
+            arquivos_docx: Arquivos .docx a converter
+            pasta_saida: Pasta onde salvar os PDFs
+            log: Função log(mensagem, tipo) com tipo "info", "sucesso" ou "erro"
+            progresso: Função progresso(texto) para a linha de progresso
+            word_instance: Instância do Word já criada (opcional)
+            pool_libreoffice: Pool já aberto para a tentativa com LibreOffice
+                              (opcional; sem ele, um soffice por arquivo)
+            
+        Returns:
+            Tupla (convertidos, erros, metodos_usados, lista_erros)
+        """
+        log = log or _log_padrao
+        total_arquivos = len(arquivos_docx)
+        
+        # Inicializar COM na thread de conversão
+        _inicializar_com()
+
+        convertidos = 0
+        erros = 0
+        lista_erros = []
+        metodos_usados = {}
+
+        # Criar UMA ÚNICA instância do Word e reutilizar para todos os arquivos
+        # Isso elimina o overhead de ~3-5s de inicialização por arquivo
+        word = word_instance
+        criou_word = False
+        if WORD_COM_DISPONIVEL and word is None:
+            try:
+                word = self._criar_word_instance()
+                criou_word = True
+                log("✅ Word COM iniciado (instância compartilhada)", "info")
+            except Exception as e:
+                log(f"⚠️ Não foi possível iniciar Word COM: {e}", "info")
+                word = None
+
+        try:
+            for idx, arquivo_docx in enumerate(arquivos_docx, 1):
+                try:
+                    if progresso:
+                        progresso(f"[{idx}/{total_arquivos}] Convertendo: {arquivo_docx.name}")
+                    log(f"[{idx}/{total_arquivos}] 📄 {arquivo_docx.name}", "info")
+
+                    arquivo_pdf = pasta_saida / f"{arquivo_docx.stem}.pdf"
+
+                    sucesso, metodo_usado = self.converter_arquivo_com_fallback(
+                        arquivo_docx, arquivo_pdf, word, pool_libreoffice=pool_libreoffice
+                    )
+
+                    if sucesso:
+                        log(f"    ✅ Convertido com {metodo_usado}", "sucesso")
+                        convertidos += 1
+                        metodos_usados[metodo_usado] = metodos_usados.get(metodo_usado, 0) + 1
+
+                except Exception as e:
+                    erro_msg = str(e)
+                    log(f"    ❌ ERRO: {erro_msg}", "erro")
+                    erros += 1
+                    lista_erros.append(f"{arquivo_docx.name}: {erro_msg}")
+
+                    # Verificar se o Word ainda está vivo após um erro
+                    # Se travou, recriar a instância para os próximos arquivos
+                    if criou_word and word is not None:
+                        try:
+                            _ = word.Version  # Testa se Word ainda responde
+                        except Exception:
+                            log("⚠️ Word COM reiniciando...", "info")
+                            try:
+                                word.Quit()
+                            except Exception:
+                                pass
+                            word = None
+                            try:
+                                word = self._criar_word_instance()
+                                log("✅ Word COM reiniciado com sucesso", "info")
+                            except Exception as e_restart:
+                                log(f"❌ Falha ao reiniciar Word: {e_restart}", "info")
+                                word = None
+
+        finally:
+            # Fechar Word apenas se criamos a instância aqui
+            if criou_word and word is not None:
+                try:
+                    word.Quit()
+                except Exception:
+                    pass
+
+            # Limpar COM
+            _finalizar_com()
+            self.registro.salvar()
+
+        return convertidos, erros, metodos_usados, lista_erros
+    
+    def conversao_paralela(
+        self,
+        arquivos_docx: list,
+        pasta_saida: Path,
+        log: Optional[callable] = None,
+        progresso: Optional[callable] = None,
+        workers: int = WORKERS_LIBREOFFICE,
+        documentos_por_worker: int = DOCUMENTOS_POR_WORKER,
+        instancias_word: int = WORKERS_WORD,
+        documentos_por_instancia: int = DOCUMENTOS_POR_INSTANCIA
+    ):
+        """
+        Conversão paralela (múltiplos simultaneamente)
+        
+        Com LibreOffice disponível, sobe um LibreOfficePool de `workers`
+        processos (perfis separados, reciclados a cada documentos_por_worker
+        documentos) e distribui os arquivos entre eles; Aspose e Word COM
+        continuam como fallback por arquivo. Sem LibreOffice, o Word COM é
+        usado por um WordPool de `instancias_word` instâncias (uma por thread
+        STA, recicladas a cada documentos_por_instancia documentos ou quando
+        param de responder) em vez de uma instância nova por arquivo.
+        
+        Returns:
+            Tupla (convertidos, erros, metodos_usados, lista_erros)
+        """
+        log = log or _log_padrao
+        total_arquivos = len(arquivos_docx)
+        convertidos = 0
+        erros = 0
+        lista_erros = []
+        metodos_usados = {}
+        pool_libreoffice = None
+        pool_word = None
+        
+        if LIBREOFFICE_DISPONIVEL:
+            max_workers = max(1, min(workers, total_arquivos))
+            pool_libreoffice = LibreOfficePool(
+                encontrar_libreoffice(), max_workers, documentos_por_worker
+            )
+            log(f"✅ {pool_libreoffice.descricao}", "info")
+            if WORD_COM_DISPONIVEL:
+                # Apenas fallback: uma instância, criada só se for necessária
+                pool_word = self._criar_pool_word(1, documentos_por_instancia)
+        elif WORD_COM_DISPONIVEL:
+            max_workers = max(1, min(instancias_word, total_arquivos))
+            pool_word = self._criar_pool_word(max_workers, documentos_por_instancia)
+            log(f"✅ Pool Word COM com {max_workers} instância(s)", "info")
+        else:
+            # Usar até 3 threads paralelas (não mais para não sobrecarregar)
+            max_workers = min(3, total_arquivos)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Preparar tarefas
+                tarefas = []
+                for idx, arquivo_docx in enumerate(arquivos_docx, 1):
+                    args = (idx, total_arquivos, arquivo_docx, pasta_saida, pool_libreoffice, pool_word)
+                    future = executor.submit(self._converter_arquivo_worker, args)
+                    tarefas.append(future)
+                
+                # Processar resultados conforme completam
+                for future in as_completed(tarefas):
+                    resultado = future.result()
+                    
+                    if progresso:
+                        progresso(f"[{resultado['idx']}/{resultado['total']}] {resultado['arquivo']}")
+                    log(f"[{resultado['idx']}/{resultado['total']}] 📄 {resultado['arquivo']}", "info")
+                    
+                    if resultado['sucesso']:
+                        log(f"    ✅ Convertido com {resultado['metodo']}", "sucesso")
+                        convertidos += 1
+                        
+                        metodo = resultado['metodo']
+                        if metodo not in metodos_usados:
+                            metodos_usados[metodo] = 0
+                        metodos_usados[metodo] += 1
+                    else:
+                        log(f"    ❌ ERRO: {resultado['erro']}", "erro")
+                        erros += 1
+                        lista_erros.append(f"{resultado['arquivo']}: {resultado['erro']}")
+        finally:
+            if pool_libreoffice is not None:
+                pool_libreoffice.fechar()
+            if pool_word is not None:
+                pool_word.fechar()
+            self.registro.salvar()
+        
+        return convertidos, erros, metodos_usados, lista_erros
+    
+    def conversao_em_lote(
+        self,
+        arquivos_docx: list,
+        pasta_saida: Path,
+        log: Optional[callable] = None,
+        progresso: Optional[callable] = None,
+        workers: int = WORKERS_LIBREOFFICE,
+        tamanho_bloco: int = TAMANHO_BLOCO_LIBREOFFICE
+    ):
+        """
+        Conversão em blocos: cada bloco de até tamanho_bloco arquivos vai em
+        uma única chamada ao LibreOffice, pagando a inicialização uma vez
+        
+        Os blocos são distribuídos entre `workers` processos (perfis
+        separados). Ao final de cada bloco, os PDFs gerados são conferidos e
+        apenas os que faltaram são convertidos de novo, um a um, com o
+        fallback completo (LibreOffice > Aspose > Word COM). Sem LibreOffice,
+        equivale a conversao_sequencial.
+        
+        Returns:
+            Tupla (convertidos, erros, metodos_usados, lista_erros)
+        """
+        log = log or _log_padrao
+        if not LIBREOFFICE_DISPONIVEL or not arquivos_docx:
+            return self.conversao_sequencial(arquivos_docx, pasta_saida, log, progresso)
+        
+        total_arquivos = len(arquivos_docx)
+        # Blocos menores quando há poucos arquivos, para ocupar todos os workers
+        tamanho_bloco = max(1, min(tamanho_bloco, math.ceil(total_arquivos / max(1, workers))))
+        blocos = _dividir_em_blocos(arquivos_docx, tamanho_bloco)
+        
+        convertidos_lote = 0
+        faltantes = []
+        
+        with LibreOfficePool(encontrar_libreoffice(), min(workers, len(blocos))) as pool:
+            log(
+                f"📦 {len(blocos)} bloco(s) de até {tamanho_bloco} arquivo(s) em "
+                f"{pool.descricao}", "info"
+            )
+            
+            with ThreadPoolExecutor(max_workers=len(pool)) as executor:
+                tarefas = {
+                    executor.submit(pool.converter_lote, bloco, pasta_saida): bloco
+                    for bloco in blocos
+                }
+                for future in as_completed(tarefas):
+                    bloco = tarefas[future]
+                    faltantes_bloco = future.result()
+                    convertidos_lote += len(bloco) - len(faltantes_bloco)
+                    faltantes.extend(faltantes_bloco)
+                    
+                    if progresso:
+                        progresso(f"[{convertidos_lote + len(faltantes)}/{total_arquivos}] Convertendo em blocos...")
+                    log(
+                        f"    ✅ Bloco concluído: {len(bloco) - len(faltantes_bloco)}/{len(bloco)} "
+                        f"convertido(s) com LibreOffice", "sucesso"
+                    )
+            
+            metodos_usados = {"LibreOffice (bloco)": convertidos_lote} if convertidos_lote else {}
+            if not faltantes:
+                return convertidos_lote, 0, metodos_usados, []
+            
+            # Mantém a ordem original para o log das novas tentativas
+            pendentes = set(map(str, faltantes))
+            faltantes = [arquivo for arquivo in arquivos_docx if str(arquivo) in pendentes]
+            log(f"\n🔁 {len(faltantes)} arquivo(s) sem PDF; nova tentativa individual...", "info")
+            
+            convertidos, erros, metodos_individuais, lista_erros = self.conversao_sequencial(
+                faltantes, pasta_saida, log, progresso, pool_libreoffice=pool
+            )
+        
+        for metodo, qtd in metodos_individuais.items():
+            metodos_usados[metodo] = metodos_usados.get(metodo, 0) + qtd
+        
+        return convertidos_lote + convertidos, erros, metodos_usados, lista_erros
+    
+    def conversao_incremental(
+        self,
+        arquivos_docx: list,
+        pasta_saida: Path,
+        log: Optional[callable] = None,
+        progresso: Optional[callable] = None,
+        converter_lista: Optional[callable] = None
+    ):
+        """
+        Converte apenas os DOCX novos ou alterados desde a última conversão
+        
+        Compara cada DOCX com o ConversionManifest da pasta de saída (mtime,
+        tamanho e hash do conteúdo); os atualizados são pulados e os demais
+        são entregues a converter_lista. Ao final, os PDFs gerados nesta
+        execução são registrados no manifesto.
+        
+        Args:
+            converter_lista: Função (arquivos, pasta_saida, log, progresso) que
+                             retorna (convertidos, erros, metodos_usados,
+                             lista_erros); padrão: conversao_sequencial
+        
+        Returns:
+            Tupla (convertidos, erros, metodos_usados, lista_erros, ignorados)
+        """
+        log = log or _log_padrao
+        converter_lista = converter_lista or self.conversao_sequencial
+        pasta_saida = Path(pasta_saida)
+        manifesto = ConversionManifest(pasta_saida)
+        
+        pendentes = [
+            arquivo_docx for arquivo_docx in arquivos_docx
+            if not manifesto.esta_atualizado(arquivo_docx, pasta_saida / f"{Path(arquivo_docx).stem}.pdf")
+        ]
+        ignorados = len(arquivos_docx) - len(pendentes)
+        log(f"⏭️ {ignorados} arquivo(s) já atualizado(s); {len(pendentes)} para converter\n", "info")
+        
+        if not pendentes:
+            manifesto.salvar()
+            return 0, 0, {}, [], ignorados
+        
+        # Só entram no manifesto os PDFs escritos nesta execução e sem erro
+        # relatado: um PDF antigo que sobrou de uma conversão que falhou
+        # continua pendente. "Escrito" = assinatura (mtime_ns, tamanho)
+        # diferente da anterior, sem comparar com o relógio, que em FAT/exFAT
+        # e pastas de rede não é confiável
+        saidas = {
+            arquivo_docx: pasta_saida / f"{Path(arquivo_docx).stem}.pdf"
+            for arquivo_docx in pendentes
+        }
+        assinaturas_antes = {
+            arquivo_docx: _assinatura_arquivo(arquivo_pdf)
+            for arquivo_docx, arquivo_pdf in saidas.items()
+        }
+        lista_erros = []
+        try:
+            convertidos, erros, metodos_usados, lista_erros = converter_lista(
+                pendentes, pasta_saida, log, progresso
+            )
+        finally:
+            for arquivo_docx, arquivo_pdf in saidas.items():
+                nome = Path(arquivo_docx).name
+                if any(erro.startswith(f"{nome}: ") for erro in lista_erros):
+                    continue
+                assinatura = _assinatura_arquivo(arquivo_pdf)
+                if assinatura is not None and assinatura != assinaturas_antes[arquivo_docx]:
+                    manifesto.registrar(arquivo_docx, arquivo_pdf)
+            manifesto.salvar()
+        
+        return convertidos, erros, metodos_usados, lista_erros, ignorados
@@ -0,0 +1,212 @@
+"""
+Pool de instâncias do Word (COM) para conversão DOCX → PDF em paralelo
+
+Este módulo é responsável por:
+1. Manter N instâncias do Word, cada uma presa à sua própria thread STA
+   (COM inicializado na thread, objeto usado só por ela)
+2. Distribuir os documentos às instâncias ociosas por uma fila única
+3. Reciclar a instância após um número de documentos ou quando ela deixa de
+   responder (sondagem de word.Version)
+
+Nada aqui depende do pywin32: a criação da instância, a conversão de um
+documento e a inicialização do COM são recebidas como funções, o que
+permite exercitar o agendamento com um backend falso fora do Windows.
+"""
+
+from concurrent.futures import Future
+from pathlib import Path
+import logging
+import queue
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTOS_POR_INSTANCIA = 100
+
+# Sinal de parada na fila de tarefas (um por thread)
+_PARAR = None
+
+
+def _nada():
+    pass
+
+
+def instancia_responde(instancia) -> bool:
+    """Sonda a instância lendo word.Version; False se o Word travou ou caiu"""
+    try:
+        instancia.Version
+        return True
+    except Exception:
+        return False
+
+
+def _encerrar_instancia(instancia):
+    """Fecha a instância ignorando falhas (ela pode já estar morta)"""
+    try:
+        instancia.Quit()
+    except Exception:
+        pass
+
+
+class WordPool:
+    """
+    Pool de instâncias do Word, uma por thread STA
+
+    submeter() coloca o documento na fila e devolve um Future; a primeira
+    thread ociosa o converte com a sua instância. A instância é criada na
+    primeira tarefa da thread e recriada quando atinge
+    documentos_por_instancia documentos ou quando, antes de uma tarefa ou
+    após uma falha, não responde à sondagem.
+
+    Uso:
+        with WordPool(criar_instancia, converter_documento, instancias=3) as pool:
+            futuros = [pool.submeter(docx, pdf) for docx, pdf in pares]
+    """
+
+    def __init__(
+        self,
+        criar_instancia: callable,
+        converter_documento: callable,
+        instancias: int = 2,
+        documentos_por_instancia: int = DOCUMENTOS_POR_INSTANCIA,
+        inicializar_com: Optional[callable] = None,
+        finalizar_com: Optional[callable] = None
+    ):
+        """
+        Args:
+            criar_instancia: Função sem argumentos que cria uma instância do
+                             Word (chamada na thread que vai usá-la)
+            converter_documento: Função (instancia, arquivo_docx, arquivo_pdf)
+                                 que converte um documento ou lança exceção
+            instancias: Quantidade de instâncias/threads
+            documentos_por_instancia: Documentos antes de reciclar a instância
+            inicializar_com: Chamada no início de cada thread (CoInitialize)
+            finalizar_com: Chamada no fim de cada thread (CoUninitialize)
+        """
+        self._criar_instancia = criar_instancia
+        self._converter_documento = converter_documento
+        self.documentos_por_instancia = documentos_por_instancia
+        self._inicializar_com = inicializar_com or _nada
+        self._finalizar_com = finalizar_com or _nada
+
+        self._tarefas = queue.Queue()
+        self._trava = threading.Lock()
+        self.estatisticas = {'instancias_criadas': 0, 'reciclagens': 0, 'documentos': 0, 'falhas': 0}
+
+        self._threads = [
+            threading.Thread(target=self._executar_thread, name=f"word_sta_{indice}", daemon=True)
+            for indice in range(max(1, instancias))
+        ]
+        # Threads cujo COM foi inicializado (ou ainda vai ser)
+        self._threads_ativas = len(self._threads)
+        for thread in self._threads:
+            thread.start()
+
+    def __len__(self) -> int:
+        return len(self._threads)
+
+    def _contar(self, chave: str):
+        with self._trava:
+            self.estatisticas[chave] += 1
+
+    def _executar_thread(self):
+        """Laço de uma thread STA: uma instância do Word, tarefas da fila comum"""
+        try:
+            self._inicializar_com()
+        except Exception as e:
+            self._abandonar_thread(e)
+            return
+
+        instancia = None
+        documentos = 0
+
+        try:
+            while True:
+                tarefa = self._tarefas.get()
+                if tarefa is _PARAR:
+                    break
+                arquivo_docx, arquivo_pdf, futuro = tarefa
+                if not futuro.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    if instancia is not None and (
+                        documentos >= self.documentos_por_instancia
+                        or not instancia_responde(instancia)
+                    ):
+                        logger.info(f"Reciclando Word ({threading.current_thread().name}) após {documentos} documentos")
+                        _encerrar_instancia(instancia)
+                        instancia = None
+                        self._contar('reciclagens')
+
+                    if instancia is None:
+                        instancia = self._criar_instancia()
+                        documentos = 0
+                        self._contar('instancias_criadas')
+
+                    documentos += 1
+                    self._converter_documento(instancia, arquivo_docx, arquivo_pdf)
+                except Exception as e:
+                    self._contar('falhas')
+                    # Instância que parou de responder é descartada já, para
+                    # a próxima tarefa não esperar a sondagem
+                    if instancia is not None and not instancia_responde(instancia):
+                        _encerrar_instancia(instancia)
+                        instancia = None
+                        self._contar('reciclagens')
+                    futuro.set_exception(e)
+                else:
+                    self._contar('documentos')
+                    futuro.set_result(True)
+        finally:
+            if instancia is not None:
+                _encerrar_instancia(instancia)
+            self._finalizar_com()
+
+    def _abandonar_thread(self, erro: Exception):
+        """
+        Thread cujo COM não inicializou: deixa as tarefas para as demais
+
+        Se era a última thread, passa a falhar as tarefas da fila até
+        fechar(), em vez de deixá-las pendentes para sempre.
+        """
+        nome = threading.current_thread().name
+        logger.error(f"Falha ao inicializar o COM ({nome}): {str(erro)}")
+        with self._trava:
+            self._threads_ativas -= 1
+            ultima = self._threads_ativas == 0
+        if not ultima:
+            return
+
+        while True:
+            tarefa = self._tarefas.get()
+            if tarefa is _PARAR:
+                break
+            _, _, futuro = tarefa
+            if futuro.set_running_or_notify_cancel():
+                self._contar('falhas')
+                futuro.set_exception(Exception(f"COM não inicializado ({nome}): {str(erro)}"))
+
+    def submeter(self, arquivo_docx: Path, arquivo_pdf: Path) -> Future:
+        """Enfileira um documento; o Future resolve em True ou na exceção da conversão"""
+        futuro = Future()
+        self._tarefas.put((arquivo_docx, arquivo_pdf, futuro))
+        return futuro
+
+    def converter(self, arquivo_docx: Path, arquivo_pdf: Path) -> bool:
+        """Converte um documento esperando o resultado (seguro entre threads)"""
+        return self.submeter(arquivo_docx, arquivo_pdf).result()
+
+    def fechar(self):
+        """Espera as tarefas pendentes e encerra as instâncias e as threads"""
+        for _ in self._threads:
+            self._tarefas.put(_PARAR)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
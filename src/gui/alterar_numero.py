@@ -12,14 +12,7 @@ import os
 from datetime import datetime
 
 from src.gui.styles import COLORS, FONTS, SPACING
-
-# Importar biblioteca de manipulação de DOCX
-try:
-    from docx import Document
-    from docx.shared import RGBColor, Pt
-    DOCX_DISPONIVEL = True
-except ImportError:
-    DOCX_DISPONIVEL = False
+from src.core.number_replacer import substituir_numeros_docx
 
 
 class AlterarNumeroFrame(ctk.CTkScrollableFrame):
@@ -265,13 +258,6 @@ class AlterarNumeroFrame(ctk.CTkScrollableFrame):
     
     def _processar_arquivo(self):
         """Processa o arquivo em uma thread separada"""
-        if not DOCX_DISPONIVEL:
-            messagebox.showerror(
-                "Erro",
-                "Biblioteca python-docx não está instalada.\nPor favor, instale-a com: pip install python-docx"
-            )
-            return
-        
         # Validar entrada
         numero_busca = self.entrada_busca.get().strip()
         numero_substituir = self.entrada_substituir.get().strip()
@@ -294,42 +280,13 @@ class AlterarNumeroFrame(ctk.CTkScrollableFrame):
         )
         thread.start()
     
-    _WNS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t'
-
-    def _substituir_em_run(self, run, busca, substituir):
-        """Substitui texto nos elementos <w:t> do run sem tocar em imagens ou outros elementos"""
-        count = 0
-        for elem in run._r.iter(self._WNS):
-            if elem.text and busca in elem.text:
-                count += elem.text.count(busca)
-                elem.text = elem.text.replace(busca, substituir)
-        return count
-
     def _executar_substituicao(self, arquivo, numero_busca, numero_substituir):
         """Executa a substituição de números no documento"""
         try:
-            # Carregar documento
-            doc = Document(arquivo)
-            
-            count = 0
-            
-            # Procurar e substituir em parágrafos
-            for paragrafo in doc.paragraphs:
-                if numero_busca in paragrafo.text:
-                    for run in paragrafo.runs:
-                        count += self._substituir_em_run(run, numero_busca, numero_substituir)
-            
-            # Procurar e substituir em tabelas
-            for tabela in doc.tables:
-                for linha in tabela.rows:
-                    for celula in linha.cells:
-                        for paragrafo in celula.paragraphs:
-                            if numero_busca in paragrafo.text:
-                                for run in paragrafo.runs:
-                                    count += self._substituir_em_run(run, numero_busca, numero_substituir)
-            
-            # Salvar arquivo modificado no mesmo local (substitui o arquivo original)
-            doc.save(arquivo)
+            # Corpo, tabelas, caixas de texto, cabeçalhos e rodapés, direto no
+            # pacote zip; o arquivo original só é regravado se houve alteração
+            contagem = substituir_numeros_docx(Path(arquivo), [(numero_busca, numero_substituir)])
+            count = sum(contagem.values())
             
             self.ocorrencias_encontradas = count
             
@@ -6,31 +6,39 @@ Usa uma planilha para fazer substituições em massa
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import threading
+import queue
 from pathlib import Path
 import traceback
+import logging
 import os
 from datetime import datetime
 
 from src.gui.styles import COLORS, FONTS, SPACING
+from src.core.number_replacer import (
+    BatchReport,
+    analisar_planilha_mapeamento,
+    criar_diario,
+    desfazer_diario,
+    listar_diarios,
+    previsualizar_pasta,
+    processar_pasta
+)
 
 # Importar bibliotecas necessárias
-try:
-    from docx import Document
-    DOCX_DISPONIVEL = True
-except ImportError:
-    DOCX_DISPONIVEL = False
-
 try:
     import pandas as pd
     PANDAS_DISPONIVEL = True
 except ImportError:
     PANDAS_DISPONIVEL = False
 
-try:
-    from openpyxl import load_workbook
-    OPENPYXL_DISPONIVEL = True
-except ImportError:
-    OPENPYXL_DISPONIVEL = False
+logger = logging.getLogger(__name__)
+
+INTERVALO_ATUALIZACAO_MS = 250  # ~4 atualizações da interface por segundo
+TAMANHO_FILA_PROCESSAMENTO = 100
+
+# Pastas menores que isso não compensam o custo de subir os processos
+MINIMO_ARQUIVOS_PARALELO = 50
+WORKERS_SUBSTITUICAO = max(1, (os.cpu_count() or 1) - 1)
 
 
 class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
@@ -53,6 +61,9 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
         self.pasta_arquivos = None
         self.processamento_ativo = False
         self.dados_planilha = []
+        self._fila_processamento = None
+        self._previa = None  # Resultado da última prévia (reaproveitado ao processar)
+        self._usar_indice = False  # Estado do checkbox do índice no início da execução
         
         self._criar_interface()
     
@@ -187,6 +198,17 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
             text_color=COLORS['text_secondary']
         )
         self.label_pasta_arquivos.pack(side="left", fill="x", expand=True)
+        
+        # Índice de números: a primeira execução lê todos os arquivos para
+        # montá-lo; só compensa em pastas grandes processadas várias vezes
+        self.indice_var = ctk.BooleanVar(value=False)
+        self.check_indice = ctk.CTkCheckBox(
+            frame,
+            text="⚡ Usar índice de números (acelera execuções repetidas na mesma pasta)",
+            variable=self.indice_var,
+            font=FONTS['small']
+        )
+        self.check_indice.pack(anchor="w", padx=SPACING['padding'], pady=(0, SPACING['padding']))
     
     def _criar_secao_acoes(self):
         """Cria seção de botões de ação"""
@@ -218,6 +240,34 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
         )
         self.btn_processar.pack(side="left", padx=(0, SPACING['margin']))
         
+        # Botão pré-visualizar (simulação sem alterar arquivos)
+        self.btn_previa = ctk.CTkButton(
+            container,
+            text="👁 Pré-visualizar",
+            command=self._previsualizar_lote,
+            width=200,
+            height=45,
+            font=FONTS['button'],
+            fg_color=COLORS['primary'],
+            hover_color=COLORS['hover'],
+            state="disabled"
+        )
+        self.btn_previa.pack(side="left", padx=(0, SPACING['margin']))
+        
+        # Botão desfazer (restaura o último lote a partir do diário)
+        self.btn_desfazer = ctk.CTkButton(
+            container,
+            text="↩ Desfazer Último Lote",
+            command=self._desfazer_ultimo_lote,
+            width=200,
+            height=45,
+            font=FONTS['button'],
+            fg_color=COLORS['warning'],
+            hover_color=COLORS['hover'],
+            state="disabled"
+        )
+        self.btn_desfazer.pack(side="left", padx=(0, SPACING['margin']))
+        
         # Informação
         self.label_info = ctk.CTkLabel(
             container,
@@ -278,6 +328,7 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
         if arquivo:
             try:
                 self.arquivo_planilha = arquivo
+                self._previa = None
                 self.dados_planilha = self._carregar_planilha(arquivo)
                 
                 nome_arquivo = Path(arquivo).name
@@ -290,45 +341,31 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
                 )
     
     def _carregar_planilha(self, caminho):
-        """Carrega a planilha e extrai os dados"""
+        """Carrega a planilha e extrai os dados (avisa sobre CodSAP conflitantes)"""
         try:
             if PANDAS_DISPONIVEL:
-                # Usar pandas se disponível
-                if caminho.endswith('.csv'):
-                    df = pd.read_csv(caminho)
-                else:
-                    df = pd.read_excel(caminho)
-                
-                # Encontrar as colunas de busca e substituição (ignorar outras)
-                col_busca = None
-                col_subst = None
-                
-                for col in df.columns:
-                    col_lower = col.lower()
-                    if 'codsap' in col_lower:
-                        col_busca = col
-                    elif 'codservico' in col_lower or 'cod_servico' in col_lower:
-                        col_subst = col
-                
-                if not col_busca or not col_subst:
-                    raise ValueError("Planilha deve conter colunas 'CodSAP' e 'CodServico'")
-                
-                # Selecionar apenas as duas colunas necessárias
-                df_filtrado = df[[col_subst, col_busca]]
-                
-                dados = []
-                for idx, row in df_filtrado.iterrows():
-                    busca = str(row[col_busca]).strip()
-                    subst = str(row[col_subst]).strip()
-                    if busca and subst and busca != 'nan' and subst != 'nan':
-                        dados.append((busca, subst))
-                
-                return dados
+                analise = analisar_planilha_mapeamento(caminho)
             else:
                 raise ImportError("pandas não disponível")
         
         except Exception as e:
             raise Exception(f"Erro ao carregar planilha: {str(e)}")
+        
+        conflitos = analise['conflitos']
+        if conflitos:
+            mensagem = (
+                f"{len(conflitos)} CodSAP aparecem com CodServico diferentes.\n"
+                f"Será usada a primeira linha de cada um:\n\n"
+            )
+            for idx, (codsap, codservicos) in enumerate(conflitos.items(), 1):
+                mensagem += f"• {codsap} → {', '.join(codservicos)}\n"
+                if idx >= 10:
+                    if len(conflitos) > 10:
+                        mensagem += f"\n... e mais {len(conflitos) - 10} CodSAP"
+                    break
+            messagebox.showwarning("Mapeamentos Conflitantes", mensagem)
+        
+        return analise['mapeamento']
     
     def _selecionar_pasta_arquivos(self):
         """Seleciona a pasta com os arquivos Word"""
@@ -339,6 +376,7 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
         
         if pasta:
             self.pasta_arquivos = pasta
+            self._previa = None
             # Contar arquivos .docx
             arquivos_docx = list(Path(pasta).glob("*.docx"))
             nome_pasta = Path(pasta).name
@@ -352,114 +390,198 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
         planilha_ok = self.arquivo_planilha is not None and len(self.dados_planilha) > 0
         pasta_arquivos_ok = self.pasta_arquivos is not None
         
-        if planilha_ok and pasta_arquivos_ok:
-            self.btn_processar.configure(state="normal")
-        else:
-            self.btn_processar.configure(state="disabled")
+        estado = "normal" if planilha_ok and pasta_arquivos_ok else "disabled"
+        self.btn_processar.configure(state=estado)
+        self.btn_previa.configure(state=estado)
+        
+        tem_diario = pasta_arquivos_ok and bool(listar_diarios(self.pasta_arquivos))
+        self.btn_desfazer.configure(state="normal" if tem_diario else "disabled")
     
     def _processar_lote(self):
         """Inicia o processamento em lote"""
-        if not DOCX_DISPONIVEL:
-            messagebox.showerror(
-                "Erro",
-                "Biblioteca python-docx não está instalada"
-            )
+        self.btn_processar.configure(text="⏳ Processando...")
+        self._iniciar_thread('processar')
+    
+    def _previsualizar_lote(self):
+        """Inicia a prévia: localiza as ocorrências sem alterar nenhum arquivo"""
+        self.btn_previa.configure(text="⏳ Analisando...")
+        self._iniciar_thread('previa')
+    
+    def _desfazer_ultimo_lote(self):
+        """Restaura os arquivos alterados pelo último lote processado nesta pasta"""
+        diarios = listar_diarios(self.pasta_arquivos)
+        if not diarios:
+            messagebox.showinfo("Desfazer", "Nenhum lote para desfazer nesta pasta")
             return
         
-        # Iniciar processamento em thread
+        data_lote = datetime.strptime(diarios[0].name[:15], "%Y%m%d_%H%M%S")
+        confirmar = messagebox.askyesno(
+            "Desfazer Último Lote",
+            f"Restaurar os arquivos alterados pelo lote de "
+            f"{data_lote.strftime('%d/%m/%Y às %H:%M:%S')}?\n\n"
+            f"Arquivos editados depois do lote serão preservados."
+        )
+        if confirmar:
+            self.btn_desfazer.configure(text="⏳ Desfazendo...")
+            self._iniciar_thread('desfazer')
+    
+    def _iniciar_thread(self, modo):
+        """Inicia o processamento, a prévia ou o desfazer ('processar', 'previa', 'desfazer') em thread"""
         self.processamento_ativo = True
-        self.btn_processar.configure(state="disabled", text="⏳ Processando...")
+        self.btn_processar.configure(state="disabled")
+        self.btn_previa.configure(state="disabled")
+        self.btn_desfazer.configure(state="disabled")
+        self._usar_indice = self.indice_var.get()
+        
+        # A thread de processamento só publica eventos na fila; a interface
+        # consome em lote a cada INTERVALO_ATUALIZACAO_MS
+        self._fila_processamento = queue.Queue(maxsize=TAMANHO_FILA_PROCESSAMENTO)
         
         thread = threading.Thread(
             target=self._executar_processamento_lote,
+            args=(self._fila_processamento, modo),
             daemon=True
         )
         thread.start()
+        self.after(INTERVALO_ATUALIZACAO_MS, self._processar_fila_processamento)
     
-    def _executar_processamento_lote(self):
-        """Executa o processamento de todos os arquivos"""
+    def _executar_processamento_lote(self, fila, modo='processar'):
+        """Executa o processamento (ou a prévia/o desfazer) de todos os arquivos"""
         try:
+            if modo == 'desfazer':
+                def progresso_desfazer(atual, total):
+                    try:
+                        fila.put_nowait(('progresso', (atual, total, 0)))
+                    except queue.Full:
+                        pass
+                
+                diario = listar_diarios(self.pasta_arquivos)[0]
+                fila.put(('desfeito', desfazer_diario(diario, callback_progresso=progresso_desfazer)))
+                return
+            
             # Obter lista de arquivos
             arquivos = sorted(Path(self.pasta_arquivos).glob("*.docx"))
             total_arquivos = len(arquivos)
             
             if total_arquivos == 0:
-                self.after(0, lambda: messagebox.showwarning(
-                    "Aviso",
-                    "Nenhum arquivo .docx encontrado na pasta selecionada"
-                ))
-                self.after(0, self._procesamento_erro)
+                fila.put(('vazio', None))
                 return
             
-            arquivos_processados = 0
-            arquivos_desconsiderados = []
-            erros = []
-            
-            # Processar cada arquivo
-            for idx, arquivo in enumerate(arquivos):
+            def atualizar_progresso(atual, total, total_erros):
+                # Progresso é descartável: se a fila está cheia, a interface
+                # ainda vai receber um evento mais recente
                 try:
-                    # Carregar documento
-                    doc = Document(str(arquivo))
-                    
-                    # Rastrear se foi feita alguma substituição neste arquivo
-                    arquivo_teve_substituicao = False
-                    
-                    # OTIMIZAÇÃO: Fazer um único pass percorrendo cada run/célula
-                    # e aplicar TODAS as substituições nesse run, em vez de fazer
-                    # um pass para cada número (que seria 5000x mais lento)
-                    
-                    WNS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t'
-
-                    def substituir_em_run(run):
-                        """Substitui nos <w:t> sem destruir imagens ou outros elementos do run"""
-                        alterou = False
-                        for elem in run._r.iter(WNS):
-                            if elem.text:
-                                for numero_busca, numero_substituir in self.dados_planilha:
-                                    if numero_busca in elem.text:
-                                        elem.text = elem.text.replace(numero_busca, numero_substituir)
-                                        alterou = True
-                        return alterou
-
-                    # Em parágrafos
-                    for paragrafo in doc.paragraphs:
-                        for run in paragrafo.runs:
-                            if substituir_em_run(run):
-                                arquivo_teve_substituicao = True
-                    
-                    # Em tabelas
-                    for tabela in doc.tables:
-                        for linha in tabela.rows:
-                            for celula in linha.cells:
-                                for paragrafo in celula.paragraphs:
-                                    for run in paragrafo.runs:
-                                        if substituir_em_run(run):
-                                            arquivo_teve_substituicao = True
-                    
-                    # Salvar arquivo apenas se houve substituição
-                    if arquivo_teve_substituicao:
-                        doc.save(str(arquivo))
-                        arquivos_processados += 1
-                    else:
-                        # Arquivo desconsiderado (nenhum número encontrado)
-                        arquivos_desconsiderados.append(arquivo.name)
-                
-                except Exception as e:
-                    erros.append(f"{arquivo.name}: {str(e)}")
-                
-                # Atualizar progresso
-                progresso = (idx + 1) / total_arquivos
-                self.after(0, self._atualizar_progresso, progresso, idx + 1, total_arquivos, len(erros))
+                    fila.put_nowait(('progresso', (atual, total, total_erros)))
+                except queue.Full:
+                    pass
+            
+            workers = WORKERS_SUBSTITUICAO if total_arquivos >= MINIMO_ARQUIVOS_PARALELO else 1
+            if modo == 'previa':
+                resultado = previsualizar_pasta(
+                    self.pasta_arquivos, self.dados_planilha, atualizar_progresso,
+                    workers=workers, usar_indice=self._usar_indice
+                )
+                fila.put(('previa', resultado))
+                return
             
-            # Processamento concluído
-            self.after(0, self._procesamento_concluido, arquivos_processados, total_arquivos, arquivos_desconsiderados, erros)
+            # O índice de números (se marcado) evita reabrir arquivos que não
+            # contêm nenhum número da planilha em execuções seguintes; a
+            # prévia (se houver) dispensa nova busca nos arquivos inalterados
+            diario = self._criar_diario()
+            relatorio = self._criar_relatorio()
+            try:
+                resultado = processar_pasta(
+                    self.pasta_arquivos, self.dados_planilha, atualizar_progresso,
+                    workers=workers, usar_indice=self._usar_indice, previa=self._previa, diario=diario,
+                    relatorio=relatorio
+                )
+            finally:
+                if relatorio is not None:
+                    relatorio.fechar()
+                if diario is not None and not any(diario.iterdir()):
+                    # Nenhum arquivo alterado (ou falha antes da primeira
+                    # alteração): nada a desfazer
+                    diario.rmdir()
+            fila.put(('concluido', (resultado, total_arquivos, relatorio)))
         
         except Exception as e:
-            self.after(0, lambda: messagebox.showerror(
+            fila.put(('erro', (e, traceback.format_exc())))
+    
+    def _criar_diario(self):
+        """Cria o diário do lote (None se a pasta não permite, ex: somente leitura)"""
+        try:
+            return criar_diario(self.pasta_arquivos)
+        except OSError as e:
+            logger.warning(f"Lote sem diário (não poderá ser desfeito): {str(e)}")
+            return None
+    
+    def _criar_relatorio(self):
+        """
+        Abre o relatório CSV/JSON Lines do lote na pasta dos arquivos
+
+        As linhas são gravadas durante o processamento; None se a pasta não
+        permite (ex: somente leitura).
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        caminho_base = Path(self.pasta_arquivos) / f"relatorio_processamento_{timestamp}"
+        try:
+            return BatchReport(caminho_base)
+        except OSError as e:
+            logger.warning(f"Lote sem relatório: {str(e)}")
+            return None
+    
+    def _processar_fila_processamento(self):
+        """Consome os eventos do processamento (chamado periodicamente via after)"""
+        ultimo_progresso = None
+        evento_final = None
+        
+        while True:
+            try:
+                tipo, dados = self._fila_processamento.get_nowait()
+            except queue.Empty:
+                break
+            
+            if tipo == 'progresso':
+                ultimo_progresso = dados
+            else:
+                evento_final = (tipo, dados)
+                break
+        
+        # Atualizar a interface uma única vez por ciclo
+        if ultimo_progresso:
+            atual, total, total_erros = ultimo_progresso
+            self._atualizar_progresso(atual / total, atual, total, total_erros)
+        
+        if evento_final is None:
+            self.after(INTERVALO_ATUALIZACAO_MS, self._processar_fila_processamento)
+            return
+        
+        tipo, dados = evento_final
+        if tipo == 'previa':
+            self._previa_concluida(dados)
+        elif tipo == 'desfeito':
+            self._desfazer_concluido(dados)
+        elif tipo == 'concluido':
+            # Os arquivos foram alterados: a prévia não vale mais
+            self._previa = None
+            resultado, total_arquivos, relatorio = dados
+            self._procesamento_concluido(
+                resultado['processados'], total_arquivos, resultado['desconsiderados'], resultado['erros'],
+                relatorio
+            )
+        elif tipo == 'vazio':
+            messagebox.showwarning(
+                "Aviso",
+                "Nenhum arquivo .docx encontrado na pasta selecionada"
+            )
+            self._procesamento_erro()
+        else:
+            erro, detalhes = dados
+            messagebox.showerror(
                 "Erro no Processamento",
-                f"Erro ao processar lote:\n{str(e)}\n\n{traceback.format_exc()}"
-            ))
-            self.after(0, self._procesamento_erro)
+                f"Erro ao processar lote:\n{str(erro)}\n\n{detalhes}"
+            )
+            self._procesamento_erro()
     
     def _atualizar_progresso(self, progresso, atual, total, erros):
         """Atualiza a barra de progresso"""
@@ -469,10 +591,87 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
             msg += f" ({erros} erro(s))"
         self.label_progresso.configure(text=msg)
     
-    def _procesamento_concluido(self, arquivos_processados, total, arquivos_desconsiderados, erros):
-        """Atualiza interface após sucesso"""
+    def _previa_concluida(self, previa):
+        """Exibe o mapa de ocorrências da prévia"""
+        self._previa = previa
+        self._restaurar_botoes()
+        
+        nomes_locais = {
+            'corpo': 'Corpo', 'tabela': 'Tabelas', 'caixa_texto': 'Caixas de texto',
+            'cabecalho': 'Cabeçalhos', 'rodape': 'Rodapés', 'notas': 'Notas'
+        }
+        por_local = {}
+        for locais in previa['ocorrencias'].values():
+            for local, quantidade in locais.items():
+                por_local[local] = por_local.get(local, 0) + quantidade
+        
+        com_ocorrencias = previa['com_ocorrencias']
+        mensagem = f"Prévia concluída (nenhum arquivo foi alterado)\n\n{'='*25}\n"
+        mensagem += f"✓ ARQUIVOS COM OCORRÊNCIAS: {len(com_ocorrencias)}\n"
+        mensagem += f"⊘ ARQUIVOS DESCONSIDERADOS: {len(previa['desconsiderados'])}\n"
+        mensagem += f"Números distintos encontrados: {len(previa['ocorrencias'])}\n\n"
+        
+        mensagem += "Ocorrências por local:\n"
+        for local, nome in nomes_locais.items():
+            if por_local.get(local):
+                mensagem += f"• {nome}: {por_local[local]}\n"
+        
+        if com_ocorrencias:
+            mensagem += "\nArquivos que serão alterados:\n"
+            for idx, nome_arquivo in enumerate(com_ocorrencias[:20], 1):
+                ocorrencias = previa['arquivos'][nome_arquivo]['ocorrencias']
+                numeros = ", ".join(
+                    f"{numero} ({sum(locais.values())}x)" for numero, locais in ocorrencias.items()
+                )
+                mensagem += f"{idx}. {nome_arquivo}: {numeros}\n"
+            if len(com_ocorrencias) > 20:
+                mensagem += f"\n... e mais {len(com_ocorrencias) - 20} arquivo(s)"
+        
+        if previa['erros']:
+            mensagem += f"\n\n❌ ERROS ENCONTRADOS ({len(previa['erros'])}):\n"
+            for erro in previa['erros'][:10]:
+                mensagem += f"• {erro}\n"
+        
+        messagebox.showinfo("Pré-visualização", mensagem)
+        
+        self.label_progresso.configure(
+            text=f"👁 Prévia: {len(com_ocorrencias)} arquivos serão alterados",
+            text_color=COLORS['primary']
+        )
+    
+    def _desfazer_concluido(self, resultado):
+        """Exibe o resultado do desfazer"""
+        self._previa = None
+        self._restaurar_botoes()
+        
+        mensagem = f"✓ ARQUIVOS RESTAURADOS: {resultado['restaurados']}\n"
+        if resultado['ignorados']:
+            mensagem += f"\n⊘ PRESERVADOS (editados depois do lote): {len(resultado['ignorados'])}\n"
+            for item in resultado['ignorados'][:10]:
+                mensagem += f"• {item}\n"
+        if resultado['erros']:
+            mensagem += f"\n❌ ERROS ENCONTRADOS ({len(resultado['erros'])}):\n"
+            for erro in resultado['erros'][:10]:
+                mensagem += f"• {erro}\n"
+        
+        messagebox.showinfo("Lote Desfeito", mensagem)
+        self.label_progresso.configure(
+            text=f"↩ {resultado['restaurados']} arquivos restaurados",
+            text_color=COLORS['success']
+        )
+    
+    def _restaurar_botoes(self):
+        """Reabilita os botões após o processamento, a prévia ou o desfazer"""
         self.processamento_ativo = False
         self.btn_processar.configure(state="normal", text="🔄 Processar Lote")
+        self.btn_previa.configure(state="normal", text="👁 Pré-visualizar")
+        self.btn_desfazer.configure(text="↩ Desfazer Último Lote")
+        self._validar_entrada()
+    
+    def _procesamento_concluido(self, arquivos_processados, total, arquivos_desconsiderados, erros,
+                                relatorio=None):
+        """Atualiza interface após sucesso"""
+        self._restaurar_botoes()
         
         # Montar mensagem de resultado
         mensagem = f"Processamento concluído!\n\n" \
@@ -506,11 +705,14 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
             if len(erros) > 10:
                 mensagem += f"\n... e mais {len(erros) - 10} erro(s)"
         
-        messagebox.showinfo("Sucesso", mensagem)
+        # O relatório completo (uma linha por arquivo) já foi gravado
+        # durante o processamento
+        if relatorio is not None:
+            mensagem += f"\n\nRelatório por arquivo:\n"
+            for caminho in relatorio.caminhos.values():
+                mensagem += f"• {caminho.name}\n"
         
-        # Gerar arquivo de relatório
-        if self.pasta_arquivos:
-            self._gerar_relatorio(arquivos_processados, total, arquivos_desconsiderados, erros)
+        messagebox.showinfo("Sucesso", mensagem)
         
         # Atualizar label de progresso
         status_text = f"✓ {arquivos_processados} arquivos processados"
@@ -522,76 +724,9 @@ class AlterarNumeroLoteFrame(ctk.CTkScrollableFrame):
             text_color=COLORS['success']
         )
     
-    def _gerar_relatorio(self, arquivos_processados, total, arquivos_desconsiderados, erros):
-        """Gera arquivo de relatório em .txt"""
-        try:
-            # Montar conteúdo do relatório
-            relatorio = f"RELATÓRIO DE PROCESSAMENTO - ALTERAR NÚMEROS EM LOTE\n"
-            relatorio += f"{'='*60}\n\n"
-            
-            # Data e hora
-            data_hora = datetime.now().strftime("%d/%m/%Y às %H:%M:%S")
-            relatorio += f"Data/Hora: {data_hora}\n\n"
-            
-            # Resumo
-            relatorio += f"{'='*60}\n"
-            relatorio += f"RESUMO\n"
-            relatorio += f"{'='*60}\n"
-            relatorio += f"✓ ARQUIVOS PROCESSADOS: {arquivos_processados}\n"
-            relatorio += f"⊘ ARQUIVOS DESCONSIDERADOS: {len(arquivos_desconsiderados)}\n"
-            relatorio += f"Total de arquivos analisados: {total}\n\n"
-            
-            # Detalhes dos desconsiderados
-            if len(arquivos_desconsiderados) > 0:
-                relatorio += f"{'='*60}\n"
-                relatorio += f"ARQUIVOS DESCONSIDERADOS\n"
-                relatorio += f"{'='*60}\n"
-                relatorio += f"Arquivos sem nenhum número da planilha:\n\n"
-                for idx, arquivo in enumerate(arquivos_desconsiderados, 1):
-                    relatorio += f"{idx}. {arquivo}\n"
-                relatorio += f"\n"
-            
-            # Erros
-            if erros:
-                relatorio += f"{'='*60}\n"
-                relatorio += f"ERROS ENCONTRADOS ({len(erros)})\n"
-                relatorio += f"{'='*60}\n"
-                for erro in erros:
-                    relatorio += f"• {erro}\n"
-                relatorio += f"\n"
-            
-            # Informações adicionais
-            relatorio += f"{'='*60}\n"
-            relatorio += f"INFORMAÇÕES\n"
-            relatorio += f"{'='*60}\n"
-            relatorio += f"Pasta com arquivos: {self.pasta_arquivos}\n"
-            relatorio += f"Planilha utilizada: {Path(self.arquivo_planilha).name}\n"
-            relatorio += f"Total de mapeamentos (CodSAP - CodServico): {len(self.dados_planilha)}\n"
-            
-            # Salvar arquivo na pasta de origem
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            nome_relatorio = f"relatorio_processamento_{timestamp}.txt"
-            caminho_relatorio = Path(self.pasta_arquivos) / nome_relatorio
-            
-            with open(str(caminho_relatorio), 'w', encoding='utf-8') as f:
-                f.write(relatorio)
-            
-            # Mensagem de confirmação
-            messagebox.showinfo(
-                "Relatório Gerado",
-                f"Arquivo de relatório criado com sucesso:\n\n{nome_relatorio}"
-            )
-        
-        except Exception as e:
-            messagebox.showerror(
-                "Erro ao Gerar Relatório",
-                f"Erro ao criar arquivo de relatório:\n{str(e)}"
-            )
-    
     def _procesamento_erro(self):
         """Atualiza interface após erro"""
-        self.processamento_ativo = False
-        self.btn_processar.configure(state="normal", text="🔄 Processar Lote")
+        self._restaurar_botoes()
         self.label_progresso.configure(
             text="✗ Erro no processamento",
             text_color=COLORS['error']
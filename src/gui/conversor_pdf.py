@@ -7,47 +7,11 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import threading
 from pathlib import Path
-import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
-import os
-import ctypes
 
 from src.gui.styles import COLORS, FONTS, SPACING
 
-# Importar bibliotecas de conversão
-try:
-    from docx import Document
-    import win32com.client
-    WORD_COM_DISPONIVEL = True
-except ImportError:
-    WORD_COM_DISPONIVEL = False
-
-try:
-    import aspose.words as aw
-    ASPOSE_WORDS_DISPONIVEL = True
-except ImportError:
-    ASPOSE_WORDS_DISPONIVEL = False
-
-try:
-    import subprocess
-    # Verificar se LibreOffice está realmente disponível no sistema
-    libreoffice_path = None
-    possible_paths = [
-        r"C:\Program Files\LibreOffice\program\soffice.exe",
-        r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-        r"C:\Users\{}\AppData\Local\Programs\LibreOffice\program\soffice.exe".format(
-            __import__('os').environ.get('USERNAME', '')
-        )
-    ]
-    for path in possible_paths:
-        if __import__('os').path.exists(path):
-            libreoffice_path = path
-            break
-    
-    LIBREOFFICE_DISPONIVEL = libreoffice_path is not None
-except ImportError:
-    LIBREOFFICE_DISPONIVEL = False
+from src.core.pdf_converter import DocxToPdfConverter
 
 
 class ConversorPdfFrame(ctk.CTkScrollableFrame):
@@ -72,8 +36,9 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
         self.modo_selecao = "pasta"  # "pasta" ou "arquivos"
         self.conversao_ativa = False
         
-        # Detectar métodos disponíveis
-        self.metodos_disponiveis = self._detectar_metodos()
+        # Motor de conversão e métodos disponíveis
+        self.conversor = DocxToPdfConverter()
+        self.metodos_disponiveis = self.conversor.metodos_disponiveis
         
         self._criar_interface()
     
@@ -142,18 +107,6 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
         if event and event.keysym == "Return":
             self.focus()
     
-    def _detectar_metodos(self):
-        """Detecta métodos de conversão disponíveis"""
-        metodos = []
-        
-        if WORD_COM_DISPONIVEL:
-            metodos.append("word_com")
-        
-        if ASPOSE_WORDS_DISPONIVEL:
-            metodos.append("aspose")
-        
-        return metodos
-    
     def _criar_interface(self):
         """Cria a interface do conversor"""
         
@@ -204,7 +157,17 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
             command=self._atualizar_modo,
             font=FONTS['small']
         )
-        rb_arquivos.pack(anchor="w", padx=20, pady=(2, 10))
+        rb_arquivos.pack(anchor="w", padx=20, pady=(2, 5))
+        
+        # Incremental (modo pasta): pula DOCX inalterados desde a última conversão
+        self.incremental_var = ctk.BooleanVar(value=False)
+        self.check_incremental = ctk.CTkCheckBox(
+            frame_modo,
+            text="⚡ Converter apenas DOCX novos ou alterados (modo pasta)",
+            variable=self.incremental_var,
+            font=FONTS['small']
+        )
+        self.check_incremental.pack(anchor="w", padx=20, pady=(5, 10))
         
         # ===== PASTA/ARQUIVOS DE ENTRADA =====
         frame_entrada = ctk.CTkFrame(self)
@@ -455,369 +418,28 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
         self.label_progresso.configure(text=texto)
         self.update()
     
-    def _criar_word_instance(self):
-        """Cria uma instância NOVA do Word forçando novo processo (DispatchEx)"""
-        try:
-            # DispatchEx FORÇA criação de novo processo separado
-            # Não reutiliza instâncias existentes que podem estar em estado inválido
-            word = win32com.client.DispatchEx("Word.Application")
-        except Exception:
-            # Fallback: Dispatch normal
-            word = win32com.client.Dispatch("Word.Application")
-
-        # Configurar a instância - cada propriedade em try-except separado
-        try:
-            word.Visible = False
-        except Exception:
-            pass
-        try:
-            word.DisplayAlerts = 0  # wdAlertsNone
-        except Exception:
-            pass
-        try:
-            word.ScreenUpdating = False
-        except Exception:
-            pass
-
-        # CRÍTICO para fidelidade de bordas/linhas:
-        # O Word computa o layout (espessura de bordas, espaçamentos) com base nos
-        # DPI da impressora ativa. Se a impressora padrão for uma HP/etc. a 1200 DPI,
-        # as bordas ficam desproporcionais no PDF. Definir "Microsoft Print to PDF"
-        # garante que o layout use as métricas corretas para saída em PDF.
-        try:
-            word.ActivePrinter = "Microsoft Print to PDF"
-        except Exception:
-            pass
-
-        return word
-
-    def _converter_com_word_com(self, arquivo_docx, arquivo_pdf, word_instance=None):
-        """Converte usando Word COM - reutiliza instância se fornecida (muito mais rápido)"""
-        doc = None
-        word = word_instance
-        criou_instancia = False
-
-        try:
-            # Criar instância apenas se não foi fornecida (modo avulso)
-            if word is None:
-                word = self._criar_word_instance()
-                criou_instancia = True
-
-            arquivo_docx_path = Path(arquivo_docx).absolute()
-            arquivo_pdf_path = Path(arquivo_pdf).absolute()
-            arquivo_docx_abs = str(arquivo_docx_path)
-            arquivo_pdf_abs = str(arquivo_pdf_path)
-
-            if not arquivo_docx_path.exists():
-                raise Exception(f"Arquivo não encontrado: {arquivo_docx_abs}")
-
-            # Remover PDF anterior se existir
-            if arquivo_pdf_path.exists():
-                try:
-                    arquivo_pdf_path.unlink()
-                except Exception:
-                    pass
-
-            # Abrir em modo EDIÇÃO (ReadOnly=False) — garante layout completo
-            try:
-                doc = word.Documents.Open(
-                    arquivo_docx_abs,  # FileName
-                    False,             # ConfirmConversions
-                    False,             # ReadOnly = False
-                    False              # AddToRecentFiles
-                )
-            except Exception as e:
-                raise Exception(f"Erro ao abrir documento: {str(e)}")
-
-            # Forçar recálculo completo do layout com as métricas da impressora PDF
-            # Necessário para garantir que as bordas usem os DPI corretos
-            try:
-                doc.Repaginate()
-            except Exception:
-                pass
-
-            # Exportar para PDF com máxima fidelidade
-            # ExportAsFixedFormat com parâmetros explícitos dá mais controle que SaveAs2
-            try:
-                doc.ExportAsFixedFormat(
-                    OutputFileName=arquivo_pdf_abs,
-                    ExportFormat=17,          # wdExportFormatPDF
-                    OpenAfterExport=False,
-                    OptimizeFor=0,            # wdExportOptimizeForPrint
-                    Item=0,                   # wdExportDocumentContent
-                    IncludeDocProps=False,
-                    KeepIRM=True,
-                    CreateBookmarks=0,        # wdExportCreateNoBookmarks
-                    DocStructureTags=False,
-                    BitmapMissingFonts=False, # Manter vetorial — evita rasterização que duplica bordas
-                    UseISO19005_1=False       # Não PDF/A — mais fidelidade visual
-                )
-            except Exception as e:
-                raise Exception(f"Erro ao exportar PDF: {str(e)}")
-
-            # Validar resultado
-            if not arquivo_pdf_path.exists() or arquivo_pdf_path.stat().st_size == 0:
-                raise Exception("PDF não foi criado ou está vazio")
-
-            return True
-
-        except Exception as e:
-            raise Exception(f"Erro no Word COM: {str(e)}")
-
-        finally:
-            # Sempre fechar o documento
-            if doc is not None:
-                try:
-                    doc.Close(SaveChanges=False)
-                except Exception:
-                    pass
-            # Fechar Word apenas se criamos a instância aqui (modo avulso)
-            if criou_instancia and word is not None:
-                try:
-                    word.Quit()
-                except Exception:
-                    pass
-    
-    def _converter_com_aspose_fallback(self, arquivo_docx, arquivo_pdf):
-        """Fallback para Aspose quando Word COM falha"""
-        try:
-            doc = aw.Document(str(arquivo_docx))
-            
-            # Configurar opções de salvamento para máxima qualidade
-            save_options = aw.saving.PdfSaveOptions()
-            save_options.compliance = aw.saving.PdfCompliance.PDF17
-            save_options.optimize_output = True
-            save_options.preserve_form_fields = True
-            save_options.jpeg_quality = 100
-            
-            doc.save(str(arquivo_pdf), save_options)
-            return True
-        except Exception as e:
-            raise Exception(f"Erro no Aspose Fallback: {str(e)}")
-    
-    def _converter_com_aspose(self, arquivo_docx, arquivo_pdf):
-        """Converte usando Aspose com MÁXIMA FIDELIDADE ao documento original"""
-        try:
-            doc = aw.Document(str(arquivo_docx))
-            
-            # Configurações para MÁXIMA FIDELIDADE
-            save_options = aw.saving.PdfSaveOptions()
-            
-            # Renderização nativa (não convertida)
-            save_options.dml_rendering_mode = aw.saving.DmlRenderingMode.NATIVE
-            
-            # Preservar estrutura e layout exato
-            save_options.preserve_form_fields = True
-            save_options.export_document_structure = True
-            
-            # Qualidade máxima de imagem
-            save_options.jpeg_quality = 100
-            save_options.color_mode = aw.saving.ColorMode.RGB
-            
-            # PDF17 padrão (não PDF/A que comprime mais)
-            save_options.compliance = aw.saving.PdfCompliance.PDF17
-            
-            # Usar fontes nativas para precisão máxima
-            save_options.use_core_fonts = False
-            save_options.embed_full_fonts = True
-            
-            # Configurações avançadas para máxima fidelidade
-            save_options.export_page_set = aw.saving.ExportPageSet("0")  # Todas as páginas
-            
-            # Desabilitar otimizações que podem afetar fidelidade
-            save_options.optimize_output = False
-            
-            # Salvar com máxima fidelidade
-            doc.save(str(arquivo_pdf), save_options)
-            return True
-            
-        except Exception as e:
-            raise Exception(f"Erro no Aspose: {str(e)}")
-    
-    def _converter_com_libreoffice(self, arquivo_docx, arquivo_pdf):
-        """Converte usando LibreOffice via CLI - MELHOR fidelidade para documentos complexos"""
-        try:
-            # Tentar encontrar LibreOffice
-            libreoffice_path = None
-            
-            # Caminhos comuns do LibreOffice no Windows
-            possible_paths = [
-                r"C:\Program Files\LibreOffice\program\soffice.exe",
-                r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-                r"C:\Users\{}\AppData\Local\Programs\LibreOffice\program\soffice.exe".format(
-                    os.environ.get('USERNAME', '')
-                )
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    libreoffice_path = path
-                    break
-            
-            if not libreoffice_path:
-                raise Exception("LibreOffice não encontrado no sistema")
-            
-            # Caminho absoluto
-            arquivo_docx_abs = str(Path(arquivo_docx).absolute())
-            pasta_saida_abs = str(Path(arquivo_pdf).parent.absolute())
-            
-            # Comando LibreOffice: melhor fidelidade com opções específicas
-            comando = [
-                libreoffice_path,
-                "--headless",
-                "--convert-to", "pdf:writer_pdf_Export:{'FilterOptions':''}",
-                "--outdir", pasta_saida_abs,
-                arquivo_docx_abs
-            ]
-            
-            # Executar conversão
-            resultado = subprocess.run(
-                comando,
-                capture_output=True,
-                timeout=60,
-                text=True
+    def _converter_lista(self, arquivos_docx, pasta_saida):
+        """
+        Converte a lista escolhendo o modo: blocos em processos LibreOffice
+        paralelos quando disponível, senão pool de instâncias do Word; um
+        único arquivo vai pelo modo sequencial
+        """
+        if "libreoffice" in self.metodos_disponiveis and len(arquivos_docx) > 1:
+            self._adicionar_log("📝 Modo em blocos com processos LibreOffice...\n", "info")
+            return self.conversor.conversao_em_lote(
+                arquivos_docx, pasta_saida, self._adicionar_log, self._atualizar_progresso
             )
-            
-            if resultado.returncode != 0:
-                raise Exception(f"LibreOffice falhou: {resultado.stderr}")
-            
-            # Validar se PDF foi criado
-            if not Path(arquivo_pdf).exists():
-                raise Exception("PDF não foi criado pelo LibreOffice")
-            
-            return True
-            
-        except Exception as e:
-            raise Exception(f"Erro no LibreOffice: {str(e)}")
-    
-    def _validar_pdf_fidelidade(self, arquivo_pdf):
-        """Valida se o PDF foi criado com fidelidade mínima"""
-        try:
-            if not Path(arquivo_pdf).exists():
-                return False, "PDF não existe"
-            
-            tamanho = Path(arquivo_pdf).stat().st_size
-            if tamanho == 0:
-                return False, "PDF vazio"
-            
-            if tamanho < 1000:  # Menos de 1KB é suspeito
-                return False, "PDF muito pequeno (possível corrupção)"
-            
-            return True, "OK"
-        except Exception as e:
-            return False, str(e)
-    
-
-    def _converter_arquivo_com_fallback(self, arquivo_docx, arquivo_pdf, word_instance=None, usar_libreoffice=True):
-        """Converte com fallback automático entre métodos - ordem: LibreOffice > Aspose > Word COM"""
-        erros_metodos = []
         
-        # PRIMEIRA TENTATIVA: LibreOffice (MELHOR fidelidade para bordas e linhas)
-        # NOTA: Apenas usar LibreOffice se explicitamente autorizado (não em modo paralelo)
-        if usar_libreoffice and LIBREOFFICE_DISPONIVEL:
-            try:
-                sucesso = self._converter_com_libreoffice(arquivo_docx, arquivo_pdf)
-                if sucesso:
-                    return True, "LibreOffice"
-            except Exception as e:
-                erro_msg = str(e)
-                erros_metodos.append(f"LibreOffice: {erro_msg}")
-        
-        # SEGUNDA TENTATIVA: Aspose (boa fidelidade, funciona sem instalação)
-        if ASPOSE_WORDS_DISPONIVEL:
-            try:
-                sucesso = self._converter_com_aspose(arquivo_docx, arquivo_pdf)
-                if sucesso:
-                    return True, "Aspose.Words"
-            except Exception as e:
-                erro_msg = str(e)
-                erros_metodos.append(f"Aspose.Words: {erro_msg}")
-                
-                # Se Aspose falhar, tentar reparar o documento DOCX
-                try:
-                    doc_reparado = aw.Document(str(arquivo_docx))
-                    # Força re-parse do documento
-                    doc_reparado.save(str(arquivo_docx), aw.SaveFormat.DOCX)
-                    # Tenta converter novamente
-                    doc_reparado = aw.Document(str(arquivo_docx))
-                    doc_reparado.save(str(arquivo_pdf), aw.SaveFormat.PDF)
-                    return True, "Aspose.Words (reparado)"
-                except Exception as e_repair:
-                    erros_metodos.append(f"Aspose Reparação: {str(e_repair)}")
-        
-        # TERCEIRA TENTATIVA: Word COM com instância passada
-        if word_instance is not None:
-            try:
-                sucesso = self._converter_com_word_com(arquivo_docx, arquivo_pdf, word_instance)
-                if sucesso:
-                    return True, "Microsoft Word COM"
-            except Exception as e:
-                erro_msg = str(e)
-                erros_metodos.append(f"Microsoft Word COM: {erro_msg}")
-        
-        # QUARTA TENTATIVA: Word COM nova instância
-        if WORD_COM_DISPONIVEL:
-            try:
-                sucesso = self._converter_com_word_com(arquivo_docx, arquivo_pdf, None)
-                if sucesso:
-                    return True, "Microsoft Word COM"
-            except Exception as e:
-                erro_msg = str(e)
-                erros_metodos.append(f"Microsoft Word COM (nova instância): {erro_msg}")
-        
-        if not erros_metodos:
-            raise Exception("Nenhum método de conversão disponível!")
-        
-        erros_completos = "\n      ".join(erros_metodos)
-        raise Exception(f"Todos os métodos falharam:\n      {erros_completos}")
-    
-    def _converter_arquivo_worker(self, args):
-        """Worker para conversão paralela com COM inicializado"""
-        idx, total, arquivo_docx, pasta_saida = args
-        
-        # CRÍTICO: Inicializar COM em cada thread
-        try:
-            ctypes.windll.ole32.CoInitializeEx(None, 0)
-        except:
-            try:
-                import pythoncom
-                pythoncom.CoInitialize()
-            except:
-                pass
-        
-        try:
-            arquivo_pdf = pasta_saida / f"{arquivo_docx.stem}.pdf"
-            # Em modo paralelo, desabilitar LibreOffice (não funciona bem em threads)
-            sucesso, metodo_usado = self._converter_arquivo_com_fallback(
-                arquivo_docx, arquivo_pdf, None, usar_libreoffice=False
+        if "word_com" in self.metodos_disponiveis and len(arquivos_docx) > 1:
+            self._adicionar_log("📝 Modo paralelo com pool de instâncias do Word...\n", "info")
+            return self.conversor.conversao_paralela(
+                arquivos_docx, pasta_saida, self._adicionar_log, self._atualizar_progresso
             )
-            
-            return {
-                'sucesso': True,
-                'arquivo': arquivo_docx.name,
-                'metodo': metodo_usado,
-                'idx': idx,
-                'total': total
-            }
-        except Exception as e:
-            return {
-                'sucesso': False,
-                'arquivo': arquivo_docx.name,
-                'erro': str(e),
-                'idx': idx,
-                'total': total
-            }
-        finally:
-            # Limpar COM
-            try:
-                ctypes.windll.ole32.CoUninitialize()
-            except:
-                try:
-                    import pythoncom
-                    pythoncom.CoUninitialize()
-                except:
-                    pass
-    
+        
+        self._adicionar_log("📝 Modo sequencial com instância compartilhada do Word...\n", "info")
+        return self.conversor.conversao_sequencial(
+            arquivos_docx, pasta_saida, self._adicionar_log, self._atualizar_progresso
+        )
     
     def _executar_conversao(self):
         """Executa a conversão"""
@@ -899,10 +521,14 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
 
             inicio_conversao = time.time()
 
-            self._adicionar_log("📝 Modo sequencial com instância compartilhada do Word...\n", "info")
-            convertidos, erros, metodos_usados, lista_erros = self._conversao_sequencial(
-                arquivos_docx, pasta_saida, total_arquivos
-            )
+            ignorados = None
+            if self.incremental_var.get():
+                convertidos, erros, metodos_usados, lista_erros, ignorados = self.conversor.conversao_incremental(
+                    arquivos_docx, pasta_saida, self._adicionar_log, self._atualizar_progresso,
+                    converter_lista=lambda pendentes, saida, *_: self._converter_lista(pendentes, saida)
+                )
+            else:
+                convertidos, erros, metodos_usados, lista_erros = self._converter_lista(arquivos_docx, pasta_saida)
             
             tempo_total = time.time() - inicio_conversao
             
@@ -912,6 +538,8 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
             self._adicionar_log("\n📊 RESUMO DA CONVERSÃO\n", "sucesso")
             self._adicionar_log("=" * 80, "info")
             self._adicionar_log(f"\n✅ Convertidos: {convertidos}", "sucesso")
+            if ignorados is not None:
+                self._adicionar_log(f"⏭️ Ignorados (já atualizados): {ignorados}", "info")
             self._adicionar_log(f"⏱️ Tempo total: {tempo_total:.1f}s ({tempo_total/max(convertidos, 1):.1f}s por arquivo)", "info")
             
             if metodos_usados:
@@ -925,6 +553,8 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
             self._adicionar_log("\n✨ CONVERSÃO CONCLUÍDA!", "sucesso")
             
             resumo = f"Conversão concluída em {tempo_total:.1f}s!\n\nConvertidos: {convertidos}\nErros: {erros}"
+            if ignorados is not None:
+                resumo += f"\nIgnorados (já atualizados): {ignorados}"
             messagebox.showinfo("Conversão Concluída", resumo)
             
         except Exception as e:
@@ -935,140 +565,6 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
             self.btn_converter.configure(state="normal", text="🚀 CONVERTER")
             self.conversao_ativa = False
     
-    def _conversao_sequencial(self, arquivos_docx, pasta_saida, total_arquivos, word_instance=None):
-        """Conversão sequencial com instância única do Word (muito mais rápido)"""
-        # Inicializar COM na thread de conversão
-        try:
-            ctypes.windll.ole32.CoInitializeEx(None, 0)
-        except Exception:
-            try:
-                import pythoncom
-                pythoncom.CoInitialize()
-            except Exception:
-                pass
-
-        convertidos = 0
-        erros = 0
-        lista_erros = []
-        metodos_usados = {}
-
-        # Criar UMA ÚNICA instância do Word e reutilizar para todos os arquivos
-        # Isso elimina o overhead de ~3-5s de inicialização por arquivo
-        word = word_instance
-        criou_word = False
-        if WORD_COM_DISPONIVEL and word is None:
-            try:
-                word = self._criar_word_instance()
-                criou_word = True
-                self._adicionar_log("✅ Word COM iniciado (instância compartilhada)", "info")
-            except Exception as e:
-                self._adicionar_log(f"⚠️ Não foi possível iniciar Word COM: {e}", "info")
-                word = None
-
-        try:
-            for idx, arquivo_docx in enumerate(arquivos_docx, 1):
-                try:
-                    progresso = f"[{idx}/{total_arquivos}] Convertendo: {arquivo_docx.name}"
-                    self._atualizar_progresso(progresso)
-                    self._adicionar_log(f"[{idx}/{total_arquivos}] 📄 {arquivo_docx.name}", "info")
-
-                    arquivo_pdf = pasta_saida / f"{arquivo_docx.stem}.pdf"
-
-                    sucesso, metodo_usado = self._converter_arquivo_com_fallback(
-                        arquivo_docx, arquivo_pdf, word
-                    )
-
-                    if sucesso:
-                        self._adicionar_log(f"    ✅ Convertido com {metodo_usado}", "sucesso")
-                        convertidos += 1
-                        metodos_usados[metodo_usado] = metodos_usados.get(metodo_usado, 0) + 1
-
-                except Exception as e:
-                    erro_msg = str(e)
-                    self._adicionar_log(f"    ❌ ERRO: {erro_msg}", "erro")
-                    erros += 1
-                    lista_erros.append(f"{arquivo_docx.name}: {erro_msg}")
-
-                    # Verificar se o Word ainda está vivo após um erro
-                    # Se travou, recriar a instância para os próximos arquivos
-                    if criou_word and word is not None:
-                        try:
-                            _ = word.Version  # Testa se Word ainda responde
-                        except Exception:
-                            self._adicionar_log("⚠️ Word COM reiniciando...", "info")
-                            try:
-                                word.Quit()
-                            except Exception:
-                                pass
-                            word = None
-                            try:
-                                word = self._criar_word_instance()
-                                self._adicionar_log("✅ Word COM reiniciado com sucesso", "info")
-                            except Exception as e_restart:
-                                self._adicionar_log(f"❌ Falha ao reiniciar Word: {e_restart}", "info")
-                                word = None
-
-        finally:
-            # Fechar Word apenas se criamos a instância aqui
-            if criou_word and word is not None:
-                try:
-                    word.Quit()
-                except Exception:
-                    pass
-
-            # Limpar COM
-            try:
-                ctypes.windll.ole32.CoUninitialize()
-            except Exception:
-                try:
-                    import pythoncom
-                    pythoncom.CoUninitialize()
-                except Exception:
-                    pass
-
-        return convertidos, erros, metodos_usados, lista_erros
-    
-    def _conversao_paralela(self, arquivos_docx, pasta_saida, total_arquivos):
-        """Conversão paralela (múltiplos simultaneamente) com Aspose"""
-        convertidos = 0
-        erros = 0
-        lista_erros = []
-        metodos_usados = {}
-        
-        # Usar até 3 threads paralelas (não mais para não sobrecarregar)
-        max_workers = min(3, total_arquivos)
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Preparar tarefas
-            tarefas = []
-            for idx, arquivo_docx in enumerate(arquivos_docx, 1):
-                args = (idx, total_arquivos, arquivo_docx, pasta_saida)
-                future = executor.submit(self._converter_arquivo_worker, args)
-                tarefas.append(future)
-            
-            # Processar resultados conforme completam
-            for future in as_completed(tarefas):
-                resultado = future.result()
-                
-                progresso = f"[{resultado['idx']}/{resultado['total']}] {resultado['arquivo']}"
-                self._atualizar_progresso(progresso)
-                self._adicionar_log(f"[{resultado['idx']}/{resultado['total']}] 📄 {resultado['arquivo']}", "info")
-                
-                if resultado['sucesso']:
-                    self._adicionar_log(f"    ✅ Convertido com {resultado['metodo']}", "sucesso")
-                    convertidos += 1
-                    
-                    metodo = resultado['metodo']
-                    if metodo not in metodos_usados:
-                        metodos_usados[metodo] = 0
-                    metodos_usados[metodo] += 1
-                else:
-                    self._adicionar_log(f"    ❌ ERRO: {resultado['erro']}", "erro")
-                    erros += 1
-                    lista_erros.append(f"{resultado['arquivo']}: {resultado['erro']}")
-        
-        return convertidos, erros, metodos_usados, lista_erros
-    
     def _thread_conversao_arquivos(self, arquivos_docx, pasta_saida):
         """Thread para conversão de arquivos selecionados"""
         self.conversao_ativa = True
@@ -1091,12 +587,7 @@ class ConversorPdfFrame(ctk.CTkScrollableFrame):
 
             inicio_conversao = time.time()
 
-            self._adicionar_log("📝 Modo sequencial com instância compartilhada do Word...\n", "info")
-
-            # Reutilizar _conversao_sequencial para evitar duplicação de lógica
-            convertidos, erros, metodos_usados, lista_erros = self._conversao_sequencial(
-                arquivos_docx, pasta_saida, total_arquivos
-            )
+            convertidos, erros, metodos_usados, lista_erros = self._converter_lista(arquivos_docx, pasta_saida)
             
             tempo_total = time.time() - inicio_conversao
             
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import Optional
 import sys
 import logging
+import queue
+import threading
 import pyperclip
 
 from src.gui.styles import COLORS, FONTS, SPACING, WINDOW, CTK_THEME
@@ -25,6 +27,10 @@ from src.models.documento_rpcm import DocumentoRPCM
 # Configurar logger
 logger = setup_logger()
 
+# Geração em lote em segundo plano
+INTERVALO_ATUALIZACAO_MS = 250  # ~4 atualizações da interface por segundo
+TAMANHO_FILA_GERACAO = 100
+
 
 class MainWindow(ctk.CTk):
     """Janela principal da aplicação - Automações RPCMS"""
@@ -47,6 +53,8 @@ class MainWindow(ctk.CTk):
         self.aba_atual = "rpcm"  # Aba ativa (rpcm, lotes, conversor, alterar_numero, alterar_numero_lote)
         self.pasta_destino_rpcm = None  # Caminho da pasta para salvar RPCMs
         self.pasta_templates = None  # Caminho padrão da pasta de templates
+        self._fila_geracao = None  # Eventos da geração em lote (thread → interface)
+        self._cancelar_geracao = None  # Evento de cancelamento da geração em lote
         
         # Inicializar geradores
         self.generator = None
@@ -670,6 +678,20 @@ class MainWindow(ctk.CTk):
         )
         self.btn_gerar.pack(side="left", padx=5, expand=True, fill="x")
         
+        # Botão Cancelar geração (habilitado apenas durante a geração)
+        self.btn_cancelar_geracao = ctk.CTkButton(
+            botoes_line1,
+            text="⏹ Cancelar",
+            command=self._on_cancelar_geracao,
+            font=FONTS['button'],
+            height=40,
+            width=140,
+            fg_color=COLORS['error'],
+            hover_color="#c82333",
+            state="disabled"
+        )
+        self.btn_cancelar_geracao.pack(side="left", padx=5)
+        
         # Desabilitar se template não existe
         if not self.template_valido:
             self.btn_gerar.configure(state="disabled")
@@ -1045,10 +1067,6 @@ class MainWindow(ctk.CTk):
         
         pasta = self.pasta_destino_rpcm
         
-        # Gerar documentos REALMENTE
-        total = len(self.lista_documentos)
-        self.btn_gerar.configure(state="disabled")
-        
         # Limpar lista do batch generator e adicionar todos os documentos
         self.batch_generator.limpar_lista()
         
@@ -1061,43 +1079,127 @@ class MainWindow(ctk.CTk):
                     numero_preco=doc_dict['numero_preco']
                 )
                 self.batch_generator.adicionar_documento(documento)
+        except Exception as e:
+            logger.error(f"Erro ao preparar lista: {e}", exc_info=True)
+            messagebox.showerror("Erro", f"Erro ao gerar documentos:\n{e}")
+            self.update_status("✗ Erro na geração em lote", "error")
+            return
+        
+        # Gerar em segundo plano; a interface lê os eventos da fila via after()
+        self.btn_gerar.configure(state="disabled")
+        self.btn_cancelar_geracao.configure(state="normal")
+        self._fila_geracao = queue.Queue(maxsize=TAMANHO_FILA_GERACAO)
+        self._cancelar_geracao = threading.Event()
+        self.update_status(f"⏳ Gerando {len(self.lista_documentos)} documentos...", "info")
+        
+        thread = threading.Thread(
+            target=self._thread_geracao_lote,
+            args=(pasta, self._fila_geracao, self._cancelar_geracao),
+            daemon=True
+        )
+        thread.start()
+        self.after(INTERVALO_ATUALIZACAO_MS, self._processar_fila_geracao)
+    
+    def _thread_geracao_lote(self, pasta: str, fila: queue.Queue, cancelar: threading.Event):
+        """Executa a geração em lote fora da thread da interface"""
+        def atualizar_progresso(atual, total_docs, nome_arquivo):
+            # Progresso é descartável: se a fila está cheia, a interface
+            # ainda vai receber um evento mais recente
+            try:
+                fila.put_nowait(('progresso', (atual, total_docs, nome_arquivo)))
+            except queue.Full:
+                pass
+        
+        try:
+            resultados = self.batch_generator.gerar_todos(
+                pasta, atualizar_progresso, cancelar=cancelar
+            )
+            fila.put(('concluido', resultados))
+        except Exception as e:
+            fila.put(('erro', e))
+    
+    def _processar_fila_geracao(self):
+        """Consome os eventos da geração em lote (chamado periodicamente via after)"""
+        ultimo_progresso = None
+        evento_final = None
+        
+        while True:
+            try:
+                tipo, dados = self._fila_geracao.get_nowait()
+            except queue.Empty:
+                break
             
-            # Callback de progresso
-            def atualizar_progresso(atual, total_docs, nome_arquivo):
+            if tipo == 'progresso':
+                ultimo_progresso = dados
+            else:
+                evento_final = (tipo, dados)
+                break
+        
+        # Atualizar a interface uma única vez por ciclo
+        if ultimo_progresso and evento_final is None:
+            atual, total_docs, nome_arquivo = ultimo_progresso
+            if self._cancelar_geracao.is_set():
+                self.update_status(f"⏳ Cancelando... ({atual}/{total_docs})", "warning")
+            else:
                 self.update_status(f"⏳ Gerando {nome_arquivo} ({atual}/{total_docs})...", "info")
-                self.update()  # Forçar atualização da interface
-            
-            # Gerar todos os documentos
-            resultados = self.batch_generator.gerar_todos(pasta, atualizar_progresso)
-            
-            # Montar mensagem de resultado
+        
+        if evento_final is None:
+            self.after(INTERVALO_ATUALIZACAO_MS, self._processar_fila_geracao)
+            return
+        
+        self.btn_gerar.configure(state="normal")
+        self.btn_cancelar_geracao.configure(state="disabled")
+        
+        tipo, dados = evento_final
+        if tipo == 'concluido':
+            self._geracao_concluida(dados)
+        elif isinstance(dados, DocumentGenerationError):
+            logger.error(f"Erro na geração em lote: {dados}")
+            messagebox.showerror("Erro na Geração", f"Erro ao gerar documentos:\n\n{str(dados)}")
+            self.update_status("✗ Erro na geração em lote", "error")
+        else:
+            logger.error(f"Erro inesperado: {dados}", exc_info=dados)
+            messagebox.showerror("Erro", f"Erro ao gerar documentos:\n{dados}")
+            self.update_status("✗ Erro na geração em lote", "error")
+    
+    def _on_cancelar_geracao(self):
+        """Solicita o cancelamento da geração em lote (entre documentos)"""
+        if self._cancelar_geracao is not None:
+            self._cancelar_geracao.set()
+            self.btn_cancelar_geracao.configure(state="disabled")
+            self.update_status("⏳ Cancelando geração...", "warning")
+    
+    def _geracao_concluida(self, resultados: dict):
+        """Exibe o resultado da geração em lote (completa ou parcial)"""
+        processados = resultados['sucesso'] + resultados['erro']
+        
+        # Montar mensagem de resultado
+        if resultados['cancelado']:
+            mensagem = f"Geração cancelada!\n\n"
+            mensagem += f"Processados: {processados} de {resultados['total']}\n"
+        else:
             mensagem = f"Geração em lote concluída!\n\n"
-            mensagem += f"✓ Sucesso: {resultados['sucesso']}\n"
-            
-            if resultados['erro'] > 0:
-                mensagem += f"✗ Erros: {resultados['erro']}\n\n"
-                mensagem += "Documentos com erro:\n"
-                for erro in resultados['erros'][:5]:  # Mostrar até 5
-                    mensagem += f"  • {erro['numero_preco']}: {erro['erro']}\n"
-            
-            messagebox.showinfo("Geração Concluída", mensagem)
-            
+        mensagem += f"✓ Sucesso: {resultados['sucesso']}\n"
+        
+        if resultados['erro'] > 0:
+            mensagem += f"✗ Erros: {resultados['erro']}\n\n"
+            mensagem += "Documentos com erro:\n"
+            for erro in resultados['erros'][:5]:  # Mostrar até 5
+                mensagem += f"  • {erro['numero_preco']}: {erro['erro']}\n"
+        
+        titulo = "Geração Cancelada" if resultados['cancelado'] else "Geração Concluída"
+        messagebox.showinfo(titulo, mensagem)
+        
+        if resultados['cancelado']:
+            self.update_status(
+                f"⚠ Geração cancelada: {resultados['sucesso']} de {resultados['total']} documentos gerados",
+                "warning"
+            )
+        else:
             self.update_status(
                 f"✓ {resultados['sucesso']} documentos gerados com sucesso",
                 "success" if resultados['erro'] == 0 else "warning"
             )
-        
-        except DocumentGenerationError as e:
-            logger.error(f"Erro na geração em lote: {e}")
-            messagebox.showerror("Erro na Geração", f"Erro ao gerar documentos:\n\n{str(e)}")
-            self.update_status("✗ Erro na geração em lote", "error")
-        except Exception as e:
-            logger.error(f"Erro inesperado: {e}", exc_info=True)
-            messagebox.showerror("Erro", f"Erro ao gerar documentos:\n{e}")
-            self.update_status("✗ Erro na geração em lote", "error")
-        
-        finally:
-            self.btn_gerar.configure(state="normal")
     
     def _on_limpar_tudo(self):
         """Handler para limpar tudo"""
@@ -7,10 +7,14 @@ import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import threading
 from pathlib import Path
-import shutil
-import re
 
 from src.gui.styles import COLORS, FONTS, SPACING
+from src.core.lot_organizer import (
+    parse_lista_numeros,
+    extrair_numero_arquivo,
+    verificar_lote,
+    copiar_lote
+)
 
 
 class OrganizadorLotesFrame(ctk.CTkScrollableFrame):
@@ -321,23 +325,12 @@ class OrganizadorLotesFrame(ctk.CTkScrollableFrame):
         if not texto_numeros.strip():
             return None
 
-        lista_numeros = []
-        # Separar por qualquer combinação de vírgula, ponto-e-vírgula,
-        # nova linha (\n ou \r), tab ou espaços múltiplos
-        for item in re.split(r'[,;\s]+', texto_numeros):
-            item = item.strip()
-            # Aceitar apenas sequências numéricas puras
-            if item and re.match(r'^\d+$', item):
-                lista_numeros.append(item)
-
+        lista_numeros = parse_lista_numeros(texto_numeros)
         return lista_numeros if lista_numeros else None
     
     def _extrair_numero_arquivo(self, nome_arquivo):
         """Extrai o número do início do nome do arquivo usando regex"""
-        # re.match é mais robusto: lida com espaços iniciais, BOM e outros
-        # caracteres invisíveis que travam o laço caractere-por-caractere
-        match = re.match(r'^\s*(\d+)', nome_arquivo)
-        return match.group(1) if match else ""
+        return extrair_numero_arquivo(nome_arquivo)
     
     def _limpar_historico(self):
         """Limpa apenas o histórico"""
@@ -399,34 +392,16 @@ class OrganizadorLotesFrame(ctk.CTkScrollableFrame):
                 self._adicionar_log("❌ Pasta de destino não existe!\n", "erro")
                 return
             
-            # Obter todos os PDFs — iterdir + suffix.lower() é mais confiável
-            # que glob com character classes no Windows
-            arquivos_encontrados = [
-                f for f in pasta_destino.iterdir()
-                if f.is_file() and f.suffix.lower() == '.pdf'
-            ]
-            numeros_encontrados = set()
-            mapa_numeros_arquivos = {}
-            
-            for arquivo in arquivos_encontrados:
-                numero = self._extrair_numero_arquivo(arquivo.stem)
-                if numero:
-                    numeros_encontrados.add(numero)
-                    if numero not in mapa_numeros_arquivos:
-                        mapa_numeros_arquivos[numero] = []
-                    mapa_numeros_arquivos[numero].append(arquivo.name)
-            
-            # Converter lista para conjunto
-            lista_numeros_str = {str(num).strip() for num in lista_numeros}
-            
-            # Calcular categorias
-            conformes = sorted(lista_numeros_str & numeros_encontrados)
-            ausentes = sorted(lista_numeros_str - numeros_encontrados)
-            excedentes = sorted(numeros_encontrados - lista_numeros_str)
+            verificacao = verificar_lote(pasta_destino, lista_numeros)
+            numeros_encontrados = verificacao['numeros_encontrados']
+            lista_numeros_str = verificacao['solicitados']
+            conformes = verificacao['conformes']
+            ausentes = verificacao['ausentes']
+            excedentes = verificacao['excedentes']
             
             # Exibir resultado no log
             self._adicionar_log(f"📊 RESULTADO DA VERIFICAÇÃO:\n", "info")
-            self._adicionar_log(f"\n1️⃣  Total de arquivos na pasta de Destino (Lote): {len(arquivos_encontrados)}", "sucesso")
+            self._adicionar_log(f"\n1️⃣  Total de arquivos na pasta de Destino (Lote): {verificacao['total_arquivos']}", "sucesso")
             self._adicionar_log(f"2️⃣  Números ÚNICOS encontrados no Destino (Lote): {len(numeros_encontrados)}", "sucesso")
             self._adicionar_log(f"3️⃣  Total de números solicitados: {len(lista_numeros_str)}", "info")
             self._adicionar_log(f"4️⃣  Conformes (solicitados encontrados): {len(conformes)}", "sucesso")
@@ -444,7 +419,7 @@ class OrganizadorLotesFrame(ctk.CTkScrollableFrame):
                 self._adicionar_log(f"\n6️⃣  ✅ Excedentes (não solicitados): 0", "sucesso")
             
             # Verificar repetidos
-            numeros_repetidos = {num: arqs for num, arqs in mapa_numeros_arquivos.items() if len(arqs) > 1}
+            numeros_repetidos = verificacao['repetidos']
             
             if numeros_repetidos:
                 self._adicionar_log(f"\n7️⃣  🔄 NÚMEROS REPETIDOS DETECTADOS: {len(numeros_repetidos)}", "aviso")
@@ -459,7 +434,7 @@ class OrganizadorLotesFrame(ctk.CTkScrollableFrame):
             
             # Mensagem resumida
             resumo = f"VERIFICAÇÃO CONCLUÍDA\n\n"
-            resumo += f"1️⃣  Total de arquivos na pasta de Destino (Lote): {len(arquivos_encontrados)}\n"
+            resumo += f"1️⃣  Total de arquivos na pasta de Destino (Lote): {verificacao['total_arquivos']}\n"
             resumo += f"2️⃣  Números ÚNICOS encontrados no Destino (Lote): {len(numeros_encontrados)}\n"
             resumo += f"3️⃣  Total de números solicitados: {len(lista_numeros_str)}\n"
             resumo += f"4️⃣  Conformes: {len(conformes)}\n"
@@ -541,39 +516,21 @@ class OrganizadorLotesFrame(ctk.CTkScrollableFrame):
                 pasta_destino.mkdir(parents=True, exist_ok=True)
                 self._adicionar_log(f"✅ Pasta de destino criada\n", "sucesso")
             
-            # Converter lista
-            lista_numeros_str = {str(num).strip() for num in lista_numeros}
+            self._adicionar_log(f"Números buscados: {sorted(set(lista_numeros))}\n", "info")
             
-            # Contadores
-            arquivos_copiados = 0
-            numeros_copiados = set()
-            erros = 0
+            def registrar_copia(nome_arquivo, erro):
+                if erro is None:
+                    self._adicionar_log(f"✅ Copiado: {nome_arquivo}", "sucesso")
+                else:
+                    self._adicionar_log(f"❌ Erro ao copiar {nome_arquivo}: {erro}", "erro")
             
-            # Processar PDFs — iterdir + suffix.lower() é mais confiável no Windows
-            arquivos_encontrados = [
-                f for f in pasta_origem.iterdir()
-                if f.is_file() and f.suffix.lower() == '.pdf'
-            ]
-            
-            self._adicionar_log(f"Total de arquivos na origem: {len(arquivos_encontrados)}", "info")
-            self._adicionar_log(f"Números buscados: {sorted(lista_numeros_str)}\n", "info")
-
-            for arquivo in arquivos_encontrados:
-                numero = self._extrair_numero_arquivo(arquivo.stem)
-
-                if numero in lista_numeros_str:
-                    try:
-                        caminho_destino = pasta_destino / arquivo.name
-                        shutil.copy2(str(arquivo), str(caminho_destino))
-                        self._adicionar_log(f"✅ Copiado: {arquivo.name}", "sucesso")
-                        arquivos_copiados += 1
-                        numeros_copiados.add(numero)
-                    except Exception as e:
-                        self._adicionar_log(f"❌ Erro ao copiar {arquivo.name}: {str(e)}", "erro")
-                        erros += 1
+            resultado = copiar_lote(pasta_origem, pasta_destino, lista_numeros, registrar_copia)
             
-            # Números faltando
-            numeros_nao_encontrados = sorted(lista_numeros_str - numeros_copiados)
+            arquivos_copiados = resultado['copiados']
+            numeros_copiados = resultado['numeros_copiados']
+            numeros_nao_encontrados = resultado['nao_encontrados']
+            erros = len(resultado['erros'])
+            self._adicionar_log(f"\nTotal de arquivos na origem: {resultado['total_origem']}", "info")
             
             # Resumo
             self._adicionar_log("\n" + "-" * 80, "info")
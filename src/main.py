@@ -2,6 +2,7 @@
 Ponto de entrada da aplicação Automação RPCM
 """
 
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -12,4 +13,6 @@ sys.path.insert(0, str(ROOT_DIR))
 from src.gui.main_window import main
 
 if __name__ == "__main__":
+    # Necessário para a geração paralela (ProcessPoolExecutor) no executável
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,72 @@
+"""
+Testes dos motores de renderização e do manifesto de geração (document_generator)
+"""
+
+from pathlib import Path
+import re
+import zipfile
+
+from docxtpl import DocxTemplate
+
+from src.core.document_generator import (
+    MOTOR_DOCXTPL,
+    MOTOR_RAPIDO,
+    BatchDocumentGenerator,
+    DocumentoRPCM,
+    FastTemplate
+)
+
+TEMPLATE = Path(__file__).parent.parent / 'templates' / 'template_rpcm.docx'
+
+
+def _elementos_texto(arquivo: Path) -> list:
+    """<w:t> não vazios, <w:br/> e <w:tab/> do corpo, na ordem"""
+    xml = zipfile.ZipFile(arquivo).read('word/document.xml').decode('utf-8')
+    xml = xml[xml.index('<w:body>'):]
+    return [
+        elemento for elemento in re.findall(r'<w:t[^>]*>[^<]*</w:t>|<w:br/>|<w:tab/>', xml)
+        if not re.fullmatch(r'<w:t[^>]*></w:t>', elemento)
+    ]
+
+
+def _renderizar_docxtpl(contexto: dict, destino: Path):
+    template = DocxTemplate(str(TEMPLATE))
+    template.render(contexto)
+    template.save(str(destino))
+
+
+def test_motor_rapido_converte_quebras_de_linha_como_o_docxtpl(tmp_path):
+    contexto = DocumentoRPCM('Tubo PEAD\nDN 110\tPN 10', 'm', '400726').to_dict()
+
+    FastTemplate(TEMPLATE).renderizar(contexto, tmp_path / 'rapido.docx')
+    _renderizar_docxtpl(contexto, tmp_path / 'docxtpl.docx')
+
+    rapido = _elementos_texto(tmp_path / 'rapido.docx')
+    assert rapido == _elementos_texto(tmp_path / 'docxtpl.docx')
+    assert '<w:br/>' in rapido and '<w:tab/>' in rapido
+    assert not any('\n' in elemento for elemento in rapido)
+
+
+def test_motor_rapido_sem_quebras_igual_ao_docxtpl(tmp_path):
+    contexto = DocumentoRPCM('Tubo PEAD DN 110', 'm', '400726').to_dict()
+
+    FastTemplate(TEMPLATE).renderizar(contexto, tmp_path / 'rapido.docx')
+    _renderizar_docxtpl(contexto, tmp_path / 'docxtpl.docx')
+
+    assert _elementos_texto(tmp_path / 'rapido.docx') == _elementos_texto(tmp_path / 'docxtpl.docx')
+
+
+def test_geracao_incremental_refaz_documentos_ao_trocar_de_motor(tmp_path):
+    def gerar(motor):
+        lote = BatchDocumentGenerator(str(TEMPLATE), motor=motor)
+        for numero in ('400001', '400002'):
+            lote.adicionar_documento(DocumentoRPCM('Tubo & conexão', 'm', numero))
+        return lote.gerar_todos(str(tmp_path), incremental=True)
+
+    assert gerar(MOTOR_DOCXTPL)['sucesso'] == 2
+
+    trocado = gerar(MOTOR_RAPIDO)
+    assert trocado['ignorados'] == 0
+    assert trocado['sucesso'] == 2
+
+    assert gerar(MOTOR_RAPIDO)['ignorados'] == 2
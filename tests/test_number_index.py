@@ -0,0 +1,51 @@
+"""
+Testes do índice persistente de números (number_index)
+"""
+
+import sqlite3
+
+from src.core.number_index import VERSAO_ESQUEMA, NumberIndex
+from src.core.number_replacer import MultiPatternReplacer
+
+from test_number_replacer import PARAGRAFO_COM_EXCLUSAO, _criar_docx
+
+
+def test_numero_dividido_por_exclusao_continua_candidato(tmp_path):
+    pasta = tmp_path / 'docs'
+    pasta.mkdir()
+    _criar_docx(pasta / 'revisado.docx', PARAGRAFO_COM_EXCLUSAO)
+    _criar_docx(pasta / 'outro.docx', '<w:p><w:r><w:t>Item 123</w:t></w:r></w:p>')
+
+    with NumberIndex.da_pasta(pasta, tmp_path / 'indices') as indice:
+        indice.atualizar(pasta)
+        candidatos = indice.arquivos_candidatos(MultiPatternReplacer([('400726', '500800')]))
+
+    assert candidatos == {'revisado.docx'}
+
+
+def test_indice_fica_fora_da_pasta_de_documentos(tmp_path):
+    pasta = tmp_path / 'docs'
+    pasta.mkdir()
+    _criar_docx(pasta / 'a.docx', '<w:p><w:r><w:t>400726</w:t></w:r></w:p>')
+
+    with NumberIndex.da_pasta(pasta, tmp_path / 'indices') as indice:
+        indice.atualizar(pasta)
+
+    assert [arquivo.name for arquivo in pasta.iterdir()] == ['a.docx']
+    assert NumberIndex.caminho_da_pasta(pasta, tmp_path / 'indices').exists()
+
+
+def test_banco_de_outra_versao_e_refeito(tmp_path):
+    caminho_db = tmp_path / 'antigo.sqlite'
+    conexao = sqlite3.connect(str(caminho_db))
+    conexao.execute("CREATE TABLE arquivos (id INTEGER PRIMARY KEY, nome TEXT)")
+    conexao.execute("INSERT INTO arquivos (nome) VALUES ('revisado.docx')")
+    conexao.commit()
+    conexao.close()
+
+    with NumberIndex(caminho_db) as indice:
+        assert indice.arquivos_indexados() == set()
+
+    conexao = sqlite3.connect(str(caminho_db))
+    assert conexao.execute("PRAGMA user_version").fetchone()[0] == VERSAO_ESQUEMA
+    conexao.close()
@@ -0,0 +1,130 @@
+"""
+Testes da substituição de números direto no pacote DOCX (number_replacer)
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from src.core import number_replacer
+from src.core.number_replacer import (
+    MultiPatternReplacer,
+    extrair_texto_bruto,
+    localizar_numeros_docx,
+    possui_candidatos,
+    substituir_numeros_docx
+)
+
+WNS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+TIPOS_CONTEUDO = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+
+def _documento(corpo: str) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{WNS}"><w:body>{corpo}</w:body></w:document>'
+    ).encode('utf-8')
+
+
+# Número dividido por uma exclusão controlada (revisão): o texto visível é
+# "Codigo 400726 fim", mas o XML tem um "9" excluído no meio
+PARAGRAFO_COM_EXCLUSAO = (
+    '<w:p>'
+    '<w:r><w:t xml:space="preserve">Codigo 400</w:t></w:r>'
+    '<w:del w:id="1" w:author="Revisor"><w:r><w:delText>9</w:delText></w:r></w:del>'
+    '<w:r><w:t xml:space="preserve">726 fim</w:t></w:r>'
+    '</w:p>'
+)
+
+
+def _criar_docx(caminho, corpo: str, membros_extras: dict = None):
+    with zipfile.ZipFile(caminho, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        pacote.writestr('[Content_Types].xml', TIPOS_CONTEUDO)
+        pacote.writestr('word/document.xml', _documento(corpo))
+        for nome, (dados, compressao) in (membros_extras or {}).items():
+            pacote.writestr(nome, dados, compress_type=compressao)
+    return caminho
+
+
+def test_texto_bruto_ignora_texto_excluido_e_codigos_de_campo():
+    dados = _documento(
+        PARAGRAFO_COM_EXCLUSAO
+        + '<w:p><w:r><w:instrText> PAGE 12 </w:instrText></w:r><w:r><w:t>A &amp; B</w:t></w:r></w:p>'
+    )
+    assert extrair_texto_bruto(dados) == 'Codigo 400726 fimA & B'
+
+
+def test_pre_filtro_encontra_numero_dividido_por_exclusao():
+    dados = _documento(PARAGRAFO_COM_EXCLUSAO)
+    assert possui_candidatos(dados, MultiPatternReplacer([('400726', '500800')]))
+
+
+def test_localiza_e_substitui_numero_dividido_por_exclusao(tmp_path):
+    arquivo = _criar_docx(tmp_path / 'revisado.docx', PARAGRAFO_COM_EXCLUSAO)
+    mapeamento = [('400726', '500800')]
+
+    localizacao = localizar_numeros_docx(arquivo, mapeamento)
+    assert localizacao['ocorrencias'] == {'400726': {'corpo': 1}}
+
+    assert substituir_numeros_docx(arquivo, mapeamento) == {'400726': 1}
+    with zipfile.ZipFile(arquivo) as pacote:
+        texto = extrair_texto_bruto(pacote.read('word/document.xml'))
+    assert texto == 'Codigo 500800 fim'
+
+
+def test_mapeamento_lido_da_primeira_planilha_mesmo_com_outra_ativa(tmp_path):
+    from openpyxl import Workbook
+    from src.core.number_replacer import carregar_mapeamento_planilha
+
+    pasta_trabalho = Workbook()
+    dados = pasta_trabalho.active
+    dados.append(['CodSAP', 'CodServico'])
+    dados.append(['400001', '500001'])
+    notas = pasta_trabalho.create_sheet('Notas')
+    notas.append(['CodSAP', 'CodServico'])
+    notas.append(['999999', '111111'])
+    pasta_trabalho.active = 1
+    pasta_trabalho.save(tmp_path / 'mapeamento.xlsx')
+
+    assert carregar_mapeamento_planilha(str(tmp_path / 'mapeamento.xlsx')) == [('400001', '500001')]
+
+
+@pytest.mark.parametrize('copia_bruta', [True, False], ids=['copia_bruta', 'api_publica'])
+def test_reescrita_preserva_imagens_e_demais_membros(tmp_path, monkeypatch, copia_bruta):
+    if not copia_bruta:
+        monkeypatch.setattr(number_replacer, '_copia_bruta_suportada', lambda zip_destino: False)
+
+    imagem = b'\x89PNG\r\n\x1a\n' + os.urandom(64 * 1024)
+    arquivo = _criar_docx(
+        tmp_path / 'com_imagem.docx',
+        '<w:p><w:r><w:t>Preço 400726</w:t></w:r></w:p>',
+        {
+            'word/media/image1.png': (imagem, zipfile.ZIP_STORED),
+            'word/media/image2.png': (imagem[::-1] * 2, zipfile.ZIP_DEFLATED),
+            'word/styles.xml': (b'<w:styles/>' * 500, zipfile.ZIP_DEFLATED)
+        }
+    )
+    with zipfile.ZipFile(arquivo) as pacote:
+        originais = {info.filename: (info.CRC, pacote.read(info)) for info in pacote.infolist()}
+
+    assert substituir_numeros_docx(arquivo, [('400726', '500800')]) == {'400726': 1}
+
+    with zipfile.ZipFile(arquivo) as pacote:
+        assert pacote.testzip() is None
+        assert [info.filename for info in pacote.infolist()] == list(originais)
+        for info in pacote.infolist():
+            if info.filename == 'word/document.xml':
+                continue
+            crc, dados = originais[info.filename]
+            assert info.CRC == crc
+            assert pacote.read(info) == dados
+        assert 'Preço 500800' in extrair_texto_bruto(pacote.read('word/document.xml'))
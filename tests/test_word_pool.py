@@ -0,0 +1,214 @@
+"""
+Testes do agendamento do WordPool com um backend COM falso (roda fora do Windows)
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.core.word_pool import WordPool
+
+TIMEOUT = 10
+
+
+class WordFalso:
+    """Imita a instância do Word: Version (sondagem) e Quit()"""
+
+    def __init__(self):
+        self.thread = threading.current_thread().name
+        self.threads_de_uso = set()
+        self.responde = True
+        self.encerrada = False
+
+    @property
+    def Version(self):
+        if not self.responde:
+            raise RuntimeError("O servidor RPC não está disponível")
+        return "16.0"
+
+    def Quit(self):
+        self.encerrada = True
+
+
+class BackendFalso:
+    """criar_instancia / converter_documento / inicializar_com / finalizar_com"""
+
+    def __init__(self, espera: float = 0.0):
+        self.espera = espera
+        self.instancias = []
+        self.inicializacoes = []
+        self.finalizacoes = []
+        self._trava = threading.Lock()
+
+    def criar_instancia(self):
+        instancia = WordFalso()
+        with self._trava:
+            self.instancias.append(instancia)
+        return instancia
+
+    def converter_documento(self, instancia, arquivo_docx, arquivo_pdf):
+        instancia.threads_de_uso.add(threading.current_thread().name)
+        if self.espera:
+            time.sleep(self.espera)
+        if arquivo_docx == 'corrompido.docx':
+            raise ValueError("Documento corrompido")
+        if arquivo_docx == 'trava_word.docx':
+            instancia.responde = False
+            raise RuntimeError("Chamada rejeitada pelo receptor")
+
+    def inicializar_com(self):
+        with self._trava:
+            self.inicializacoes.append(threading.current_thread().name)
+
+    def finalizar_com(self):
+        with self._trava:
+            self.finalizacoes.append(threading.current_thread().name)
+
+    def criar_pool(self, **opcoes) -> WordPool:
+        return WordPool(
+            self.criar_instancia,
+            self.converter_documento,
+            inicializar_com=self.inicializar_com,
+            finalizar_com=self.finalizar_com,
+            **opcoes
+        )
+
+
+def _fechar_com_limite(pool: WordPool):
+    """fechar() em outra thread, para um travamento falhar o teste em vez de pendurá-lo"""
+    thread = threading.Thread(target=pool.fechar, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive(), "fechar() não retornou"
+
+
+def test_instancia_criada_e_usada_apenas_na_sua_thread():
+    backend = BackendFalso(espera=0.005)
+    pool = backend.criar_pool(instancias=3)
+    futuros = [pool.submeter(f"doc{i}.docx", f"doc{i}.pdf") for i in range(30)]
+    for futuro in futuros:
+        assert futuro.result(TIMEOUT) is True
+    _fechar_com_limite(pool)
+
+    assert 1 <= len(backend.instancias) <= 3
+    for instancia in backend.instancias:
+        assert instancia.thread.startswith("word_sta_")
+        assert instancia.threads_de_uso == {instancia.thread}
+    assert len({instancia.thread for instancia in backend.instancias}) == len(backend.instancias)
+    assert sorted(backend.inicializacoes) == ["word_sta_0", "word_sta_1", "word_sta_2"]
+
+
+def test_recicla_apos_documentos_por_instancia():
+    backend = BackendFalso()
+    pool = backend.criar_pool(instancias=1, documentos_por_instancia=3)
+    for i in range(7):
+        assert pool.converter(f"doc{i}.docx", f"doc{i}.pdf") is True
+    _fechar_com_limite(pool)
+
+    assert len(backend.instancias) == 3
+    assert pool.estatisticas['instancias_criadas'] == 3
+    assert pool.estatisticas['reciclagens'] == 2
+    assert pool.estatisticas['documentos'] == 7
+    assert all(instancia.encerrada for instancia in backend.instancias)
+
+
+def test_recicla_quando_sondagem_de_version_falha():
+    backend = BackendFalso()
+    pool = backend.criar_pool(instancias=1)
+    pool.converter("doc1.docx", "doc1.pdf")
+
+    # Word travou entre duas tarefas: a sondagem antes da próxima descarta a instância
+    backend.instancias[0].responde = False
+    pool.converter("doc2.docx", "doc2.pdf")
+    _fechar_com_limite(pool)
+
+    assert len(backend.instancias) == 2
+    assert backend.instancias[0].encerrada
+    assert pool.estatisticas['reciclagens'] == 1
+
+
+def test_falha_que_derruba_o_word_recria_a_instancia():
+    backend = BackendFalso()
+    pool = backend.criar_pool(instancias=1)
+    with pytest.raises(RuntimeError):
+        pool.converter("trava_word.docx", "trava_word.pdf")
+    assert pool.converter("doc.docx", "doc.pdf") is True
+    _fechar_com_limite(pool)
+
+    assert len(backend.instancias) == 2
+    assert pool.estatisticas['falhas'] == 1
+    assert pool.estatisticas['reciclagens'] == 1
+
+
+def test_excecao_da_conversao_chega_pelo_future():
+    backend = BackendFalso()
+    pool = backend.criar_pool(instancias=2)
+    futuro_erro = pool.submeter("corrompido.docx", "corrompido.pdf")
+    futuro_ok = pool.submeter("doc.docx", "doc.pdf")
+
+    with pytest.raises(ValueError, match="Documento corrompido"):
+        futuro_erro.result(TIMEOUT)
+    assert futuro_ok.result(TIMEOUT) is True
+    _fechar_com_limite(pool)
+
+    assert pool.estatisticas['falhas'] == 1
+    # Erro do documento não afeta a instância, que continua respondendo
+    assert pool.estatisticas['reciclagens'] == 0
+
+
+def test_fechar_conclui_a_fila_e_encerra_instancias_e_com():
+    backend = BackendFalso(espera=0.01)
+    pool = backend.criar_pool(instancias=2)
+    futuros = [pool.submeter(f"doc{i}.docx", f"doc{i}.pdf") for i in range(20)]
+    _fechar_com_limite(pool)
+
+    assert all(futuro.done() and futuro.result() is True for futuro in futuros)
+    assert pool.estatisticas['documentos'] == 20
+    assert all(instancia.encerrada for instancia in backend.instancias)
+    assert sorted(backend.finalizacoes) == sorted(backend.inicializacoes) == ["word_sta_0", "word_sta_1"]
+
+
+def test_falha_ao_inicializar_com_em_uma_thread_deixa_as_tarefas_para_as_outras():
+    backend = BackendFalso()
+    falhou = []
+
+    def inicializar_com():
+        with backend._trava:
+            if not falhou:
+                falhou.append(threading.current_thread().name)
+                raise OSError("CoInitialize falhou")
+        backend.inicializar_com()
+
+    pool = WordPool(
+        backend.criar_instancia, backend.converter_documento, instancias=3,
+        inicializar_com=inicializar_com, finalizar_com=backend.finalizar_com
+    )
+    futuros = [pool.submeter(f"doc{i}.docx", f"doc{i}.pdf") for i in range(12)]
+    for futuro in futuros:
+        assert futuro.result(TIMEOUT) is True
+    _fechar_com_limite(pool)
+
+    assert falhou[0] not in {instancia.thread for instancia in backend.instancias}
+    # Thread sem COM não o finaliza
+    assert falhou[0] not in backend.finalizacoes
+
+
+def test_falha_ao_inicializar_com_em_todas_as_threads_falha_as_tarefas():
+    def inicializar_com():
+        raise OSError("CoInitialize falhou")
+
+    backend = BackendFalso()
+    pool = WordPool(
+        backend.criar_instancia, backend.converter_documento, instancias=2,
+        inicializar_com=inicializar_com, finalizar_com=backend.finalizar_com
+    )
+    futuros = [pool.submeter(f"doc{i}.docx", f"doc{i}.pdf") for i in range(5)]
+    for futuro in futuros:
+        with pytest.raises(Exception, match="COM não inicializado"):
+            futuro.result(TIMEOUT)
+    _fechar_com_limite(pool)
+
+    assert backend.instancias == []
+    assert backend.finalizacoes == []
+    assert pool.estatisticas['falhas'] == 5